@@ -0,0 +1,6 @@
+"""Batch transcription of recorded audio files (--transcribe)."""
+
+from .files import BatchOutput, FileResult, collect_audio_files
+from .runner import BatchReport, transcribe_batch
+
+__all__ = ["BatchOutput", "FileResult", "collect_audio_files", "BatchReport", "transcribe_batch"]
@@ -0,0 +1,209 @@
+"""Input discovery and resumable output for batch transcription.
+
+Inputs may be files, directories (searched recursively for audio files) or
+glob patterns. Results are either appended to one JSONL file, one record per
+audio file, or written as <name>.<ext>.txt per file. Each result is flushed as
+soon as its file is done, and files that already have a result are skipped on
+the next run, so an interrupted batch resumes where it stopped.
+
+Text files keep the audio file's extension and, in an output directory, its
+path below the input it was found in, so 2024/01.wav and 2025/01.wav (or
+memo.wav and memo.m4a) never share a transcript.
+"""
+
+import glob
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# File types picked up from directories (explicit files are always accepted)
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".oga", ".opus", ".flac", ".webm", ".aac", ".wma"}
+
+DEFAULT_JSONL_OUTPUT = "transcripts.jsonl"
+
+FORMATS = ("jsonl", "text")
+
+
+@dataclass
+class FileResult:
+    """Transcript of one audio file (one JSONL record)."""
+    path: str  # Absolute path of the audio file
+    size: int  # File size when transcribed (a changed file is transcribed again)
+    text: str
+    audio_sec: float
+    decode_sec: float
+
+
+def _pattern_root(pattern: str) -> Path:
+    """Directory part of a glob pattern before the first wildcard."""
+    parts = []
+    for part in Path(pattern).parts:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return Path(*parts) if parts else Path(".")
+
+
+def collect_audio_files(inputs: Iterable[str]) -> Dict[Path, Path]:
+    """
+    Expand files, directories and glob patterns into a list of audio files.
+
+    Args:
+        inputs: Paths or patterns from the command line
+
+    Returns:
+        Absolute path -> path relative to the input it was found in
+        (just the name for files given directly), sorted by path
+
+    Raises:
+        FileNotFoundError: If an input matches nothing
+    """
+    found: Dict[Path, Path] = {}
+    for item in inputs:
+        expanded = os.path.expanduser(item)
+        if glob.has_magic(expanded):
+            matches = [Path(match) for match in glob.glob(expanded, recursive=True)]
+            root = _pattern_root(expanded)
+        else:
+            matches = [Path(expanded)]
+            root = None
+
+        added = 0
+        for path in matches:
+            if path.is_dir():
+                for child in path.rglob("*"):
+                    if child.suffix.lower() in AUDIO_EXTENSIONS and child.is_file():
+                        found.setdefault(child.resolve(), child.relative_to(path if root is None else root))
+                        added += 1
+            elif path.is_file() and (path.suffix.lower() in AUDIO_EXTENSIONS or matches == [path]):
+                found.setdefault(path.resolve(), Path(path.name) if root is None else path.relative_to(root))
+                added += 1
+
+        if added == 0:
+            raise FileNotFoundError(f"No audio files found for '{item}'")
+
+    return dict(sorted(found.items()))
+
+
+class BatchOutput:
+    """
+    Where results go, and which files already have one.
+
+    Example:
+        >>> output = BatchOutput("jsonl", "memos.jsonl")
+        >>> output.assign(files)  # from collect_audio_files()
+        >>> todo = [path for path in files if not output.is_done(path)]
+        >>> output.write(result)  # flushed immediately
+    """
+
+    def __init__(self, fmt: str = "jsonl", output: Optional[str] = None):
+        """
+        Initialize output.
+
+        Args:
+            fmt: "jsonl" or "text"
+            output: JSONL file (jsonl) or directory (text); empty for the default
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown batch output format '{fmt}' (expected {' or '.join(FORMATS)})")
+        self.format = fmt
+        self.path: Optional[Path] = None
+        if fmt == "jsonl":
+            self.path = Path(output or DEFAULT_JSONL_OUTPUT).expanduser()
+        elif output:
+            self.path = Path(output).expanduser()
+
+        self._targets: Dict[Path, Path] = {}  # Audio file -> transcript file (text)
+        self._done: dict = {}
+        if fmt == "jsonl":
+            self._done = self._load_jsonl()
+
+    def _load_jsonl(self) -> dict:
+        """Read path -> size of the files already in the JSONL output."""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    done[record["path"]] = record["size"]
+                except (ValueError, KeyError, TypeError):
+                    # Usually the last line of a run that was killed mid-write
+                    logger.warning(f"{self.path}:{number}: skipping unreadable record")
+        logger.info(f"{len(done)} files already transcribed in {self.path}")
+        return done
+
+    def assign(self, files: Dict[Path, Path]):
+        """
+        Choose the transcript file of each audio file (text format).
+
+        Args:
+            files: Absolute path -> path relative to its input, as returned
+                by collect_audio_files()
+
+        Raises:
+            ValueError: If two audio files would share a transcript file
+        """
+        if self.format != "text":
+            return
+        owners: Dict[Path, Path] = {}
+        for audio, relative in files.items():
+            if self.path is not None:
+                text = self.path / relative.with_name(relative.name + ".txt")
+            else:
+                text = audio.with_name(audio.name + ".txt")
+            if text in owners:
+                raise ValueError(
+                    f"{owners[text]} and {audio} would both be transcribed to {text}; "
+                    f"pass their common parent directory instead"
+                )
+            owners[text] = audio
+            self._targets[audio] = text
+
+    def text_path(self, audio: Path) -> Path:
+        """Transcript file of an audio file (text format)."""
+        target = self._targets.get(audio)
+        if target is not None:
+            return target
+        directory = self.path if self.path is not None else audio.parent
+        return directory / f"{audio.name}.txt"
+
+    def is_done(self, audio: Path) -> bool:
+        """Check if a file already has an up-to-date result."""
+        if self.format == "jsonl":
+            return self._done.get(str(audio)) == audio.stat().st_size
+        text = self.text_path(audio)
+        return text.exists() and text.stat().st_mtime >= audio.stat().st_mtime
+
+    def write(self, result: FileResult):
+        """Store one result."""
+        if self.format == "jsonl":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+            self._done[result.path] = result.size
+            return
+
+        text = self.text_path(Path(result.path))
+        text.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so an interrupted write never looks finished
+        partial = text.with_name(text.name + ".part")
+        partial.write_text(result.text + "\n", encoding="utf-8")
+        partial.replace(text)
+
+    def describe(self) -> str:
+        """Where results are written (for the report)."""
+        if self.path is not None:
+            return str(self.path)
+        return "<name>.<ext>.txt next to each file"
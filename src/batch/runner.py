@@ -0,0 +1,230 @@
+"""Batch transcription of recorded audio files with a worker pool.
+
+Two ways to use more than one core:
+
+- processes > 1: a pool of worker processes, each holding one loaded
+  Transcriber with its own CTranslate2 thread count. Costs one model in RAM
+  per process but scales best on many-core machines.
+- processes = 1, num_workers > 1: one model loaded with CTranslate2
+  num_workers, decoding several files in parallel from threads of this
+  process (one model in RAM).
+
+Results are written as files finish, in completion order. Throughput is
+reported as audio-hours per wall-hour.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .files import BatchOutput, FileResult, collect_audio_files
+from ..config import Config
+from ..core.transcriber import Transcriber
+
+logger = logging.getLogger(__name__)
+
+# Files submitted per worker ahead of time (keeps every worker busy)
+QUEUE_AHEAD_PER_WORKER = 2
+
+# The Transcriber of this worker process (or shared by the threads of this process)
+_worker_transcriber: Optional[Transcriber] = None
+
+
+def _init_worker(options: dict):
+    """Load the model once per worker."""
+    global _worker_transcriber
+    _worker_transcriber = Transcriber(**options)
+    _worker_transcriber.load_model()
+
+
+def _transcribe_file(path: str) -> FileResult:
+    """
+    Transcribe one file with this worker's model.
+
+    Raises:
+        Exception: Whatever stopped the file from being decoded
+    """
+    timing: Dict[str, float] = {}
+    started = time.perf_counter()
+    # Segments directly rather than transcribe(), which logs errors and returns ""
+    text = " ".join(text for _, _, text in _worker_transcriber.transcribe_segments(path, timing=timing))
+    return FileResult(
+        path=path,
+        size=os.path.getsize(path),
+        text=text,
+        audio_sec=round(timing["audio_sec"], 3),
+        decode_sec=round(time.perf_counter() - started, 3),
+    )
+
+
+@dataclass
+class BatchReport:
+    """Outcome of a batch run."""
+    files: int = 0  # Audio files found
+    skipped: int = 0  # Already transcribed (resumed)
+    done: int = 0
+    failed: List[str] = field(default_factory=list)
+    audio_sec: float = 0.0  # Audio transcribed in this run
+    wall_sec: float = 0.0
+    workers: str = ""
+    output: str = ""
+
+    @property
+    def audio_hours_per_hour(self) -> float:
+        """Throughput: hours of audio transcribed per hour of wall time."""
+        return self.audio_sec / self.wall_sec if self.wall_sec > 0 else 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Check if every file has a transcript."""
+        return not self.failed
+
+    def format(self) -> str:
+        """Render the report."""
+        lines = [
+            f"Batch transcription: {self.files} files with {self.workers}",
+            f"  Transcribed: {self.done}, already done: {self.skipped}, failed: {len(self.failed)}",
+            f"  Audio: {self.audio_sec / 3600:.2f} h in {self.wall_sec / 3600:.2f} h wall time "
+            f"({self.audio_hours_per_hour:.1f} audio-hours per wall-hour)",
+            f"  Output: {self.output}",
+        ]
+        for path in self.failed:
+            lines.append(f"  FAILED: {path}")
+        return "\n".join(lines)
+
+
+def _worker_options(config: Config, cpu_threads: int, num_workers: int) -> dict:
+    """Transcriber arguments for the workers."""
+    language = config.whisper.language
+    return dict(
+        model=config.whisper.model,
+        local_model_path=config.whisper.local_model_path or None,
+        download_if_missing=config.whisper.download_if_missing,
+        device=config.whisper.device,
+        compute_type=config.whisper.compute_type,
+        # Memos are in whatever language they were recorded in: auto-detect per file
+        language=language if language not in ("", "auto") else None,
+        beam_size=config.whisper.beam_size,
+        vad_filter=config.whisper.vad_filter,
+        initial_prompt=config.whisper.initial_prompt or "",
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+def _default_cpu_threads(parallel: int) -> int:
+    """CTranslate2 threads per decode when [batch] cpu_threads is 0: the cores, shared out."""
+    return max(1, (os.cpu_count() or 1) // parallel)
+
+
+def _create_executor(config: Config, processes: int) -> "tuple[Executor, int, str]":
+    """
+    Create the worker pool.
+
+    Returns:
+        (executor, parallel decodes, description)
+    """
+    batch = config.batch
+    if processes > 1:
+        cpu_threads = batch.cpu_threads or _default_cpu_threads(processes)
+        # Workers are started fresh (not forked) so no model threads are inherited
+        executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(_worker_options(config, cpu_threads, 1),),
+        )
+        return executor, processes, f"{processes} processes x {cpu_threads} threads"
+
+    num_workers = max(1, batch.num_workers)
+    cpu_threads = batch.cpu_threads or _default_cpu_threads(num_workers)
+    _init_worker(_worker_options(config, cpu_threads, num_workers))
+    executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="batch")
+    return executor, num_workers, f"1 process, {num_workers} parallel decode(s) x {cpu_threads} threads"
+
+
+def transcribe_batch(
+    config: Config,
+    inputs: List[str],
+    processes: Optional[int] = None,
+    fmt: Optional[str] = None,
+    output: Optional[str] = None,
+) -> BatchReport:
+    """
+    Transcribe audio files, skipping those that already have a result.
+
+    Args:
+        config: Configuration (model settings and [batch] defaults)
+        inputs: Files, directories or glob patterns
+        processes: Worker processes (None = config.batch.processes)
+        fmt: "jsonl" or "text" (None = config.batch.format)
+        output: JSONL file or text directory (None = config.batch.output)
+
+    Returns:
+        BatchReport
+
+    Raises:
+        FileNotFoundError: If an input matches no audio files
+        ValueError: If the output format is unknown, or two files would
+            share a transcript file
+    """
+    started = time.perf_counter()
+    files = collect_audio_files(inputs)
+    sink = BatchOutput(fmt or config.batch.format, output if output is not None else config.batch.output)
+    sink.assign(files)
+    todo = [path for path in files if not sink.is_done(path)]
+
+    report = BatchReport(files=len(files), skipped=len(files) - len(todo), output=sink.describe())
+    if report.skipped:
+        logger.info(f"Resuming: {report.skipped} of {len(files)} files already transcribed")
+    if not todo:
+        report.wall_sec = time.perf_counter() - started
+        report.workers = "no workers (nothing to do)"
+        return report
+
+    executor, parallel, report.workers = _create_executor(config, processes or config.batch.processes)
+    logger.info(f"Transcribing {len(todo)} files with {report.workers}")
+
+    pending: Dict[Future, Path] = {}
+    queue = list(reversed(todo))
+    try:
+        while queue or pending:
+            while queue and len(pending) < parallel * QUEUE_AHEAD_PER_WORKER:
+                path = queue.pop()
+                pending[executor.submit(_transcribe_file, str(path))] = path
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    raise RuntimeError("A batch worker died (model failed to load or ran out of memory)")
+                except Exception as e:
+                    logger.error(f"{path}: {e}")
+                    report.failed.append(str(path))
+                    continue
+
+                sink.write(result)
+                report.done += 1
+                report.audio_sec += result.audio_sec
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[{report.done + len(report.failed)}/{len(todo)}] {path.name}: "
+                    f"{result.audio_sec:.1f} s audio in {result.decode_sec:.1f} s "
+                    f"({report.audio_sec / elapsed:.1f} audio-hours per wall-hour so far)",
+                    flush=True,
+                )
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+        report.wall_sec = time.perf_counter() - started
+
+    return report
@@ -0,0 +1,15 @@
+"""Offline benchmarking: replay recorded utterances through the service."""
+
+from .fakes import FakeMicrophone, MemoryUInput, ScriptedHotkeyListener, StubTranscriber, load_clips
+from .replay import ReplayReport, replay, replay_directory
+
+__all__ = [
+    "FakeMicrophone",
+    "MemoryUInput",
+    "ScriptedHotkeyListener",
+    "StubTranscriber",
+    "load_clips",
+    "ReplayReport",
+    "replay",
+    "replay_directory",
+]
@@ -0,0 +1,424 @@
+"""Stand-ins for the microphone, hotkey device, virtual keyboard and model.
+
+The replay harness drives the real service with these:
+
+- FakeMicrophone: the "room" the recorder listens to. Clips played into it
+  are heard by every PCM source it hands out, in real time.
+- ScriptedInput: replaces the evdev InputReader; events sent through it go
+  through the listener's intent dispatcher exactly like device events.
+- MemoryUInput: an in-memory uinput sink that records the key events the
+  virtual keyboard writes and decodes them back to text.
+- StubTranscriber: returns the reference transcript after a simulated
+  decode time, for runs without a model.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import numpy as np
+from evdev import ecodes
+
+from ..core.pcm_source import PCMSource
+from ..daemon.input_reader import DeviceInfo
+from ..daemon.multi_hotkey_listener import MultiHotkeyListener
+from ..utils.keyboard_layout import get_keyboard_mapper
+
+logger = logging.getLogger(__name__)
+
+MODIFIER_KEYS = frozenset({
+    ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT,
+    ecodes.KEY_LEFTCTRL, ecodes.KEY_RIGHTCTRL,
+    ecodes.KEY_LEFTALT, ecodes.KEY_RIGHTALT,
+})
+
+# Decoded in place of key combinations the layout table has no character for
+UNKNOWN_CHAR = "\ufffd"
+
+
+@dataclass
+class ReplayClip:
+    """One recorded utterance and what it should type."""
+    name: str
+    samples: np.ndarray  # int16, mono, at the capture sample rate
+    sample_rate: int
+    reference: Optional[str] = None  # Expected text (from <name>.txt)
+
+    @property
+    def duration_sec(self) -> float:
+        """Clip length in seconds."""
+        return len(self.samples) / self.sample_rate
+
+
+def read_wav(path: Path, sample_rate: int) -> np.ndarray:
+    """
+    Read a 16-bit PCM WAV file as mono int16 samples at sample_rate.
+
+    Stereo is downmixed and other rates are resampled (linear interpolation,
+    good enough for speech recognition benchmarks).
+
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {wav.getsampwidth() * 8}-bit")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate and len(samples):
+        positions = np.arange(int(len(samples) * sample_rate / rate)) * (rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return np.clip(np.round(samples), -32768, 32767).astype(np.int16)
+
+
+def load_clips(directory: Path, sample_rate: int = 16000) -> List[ReplayClip]:
+    """
+    Load every *.wav in a directory, with <name>.txt as its reference transcript.
+
+    Returns:
+        Clips sorted by file name
+    """
+    directory = Path(directory).expanduser()
+    clips = []
+    for path in sorted(directory.glob("*.wav")):
+        reference_path = path.with_suffix(".txt")
+        reference = reference_path.read_text().strip() if reference_path.exists() else None
+        clips.append(ReplayClip(path.stem, read_wav(path, sample_rate), sample_rate, reference))
+    return clips
+
+
+class FakeMicrophone:
+    """
+    Shared audio scene captured by the fake PCM sources.
+
+    Example:
+        >>> mic = FakeMicrophone(sample_rate=16000)
+        >>> recorder = AudioRecorder(capture_mode="memory", pcm_source_factory=mic.source)
+        >>> mic.play(clip.samples, delay_sec=0.1)  # heard 100 ms from now
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        period_ms: float = 20.0,
+        open_delay_ms: float = 0.0,
+        noise_level: float = 30.0,
+    ):
+        """
+        Initialize microphone.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            channels: Number of channels (clips are duplicated across them)
+            period_ms: Interval between chunks, like ALSA periods
+            open_delay_ms: Simulated device open time of each source
+            noise_level: Standard deviation of the background noise (int16 units)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.period_ms = period_ms
+        self.open_delay_ms = open_delay_ms
+        self.noise_level = noise_level
+        self._clip: Optional[np.ndarray] = None
+        self._clip_start = 0.0  # monotonic() time the clip's first sample is "spoken"
+        self._rng = np.random.default_rng(0)
+
+    def play(self, samples: np.ndarray, delay_sec: float = 0.0):
+        """Start playing a clip (int16 mono) into the room after delay_sec."""
+        self._clip = np.asarray(samples, dtype=np.int16)
+        self._clip_start = time.monotonic() + delay_sec
+
+    def render(self, start: float, frames: int) -> bytes:
+        """Audio heard from monotonic() time start for the given number of frames."""
+        chunk = self._rng.normal(0, self.noise_level, frames)
+        clip = self._clip
+        if clip is not None:
+            offset = int(round((start - self._clip_start) * self.sample_rate))
+            begin, end = max(0, offset), min(len(clip), offset + frames)
+            if begin < end:
+                chunk[begin - offset:end - offset] += clip[begin:end]
+        chunk = np.clip(chunk, -32768, 32767).astype("<i2")
+        if self.channels > 1:
+            chunk = np.repeat(chunk, self.channels)
+        return chunk.tobytes()
+
+    def source(self) -> "MicrophoneSource":
+        """New PCM source listening to this microphone (recorder factory)."""
+        return MicrophoneSource(self)
+
+
+class MicrophoneSource(PCMSource):
+    """PCM source delivering a FakeMicrophone's audio at real-time pace."""
+
+    def __init__(self, microphone: FakeMicrophone):
+        """
+        Initialize source.
+
+        Args:
+            microphone: Microphone to capture from
+        """
+        self.microphone = microphone
+        self._period_sec = microphone.period_ms / 1000.0
+        self._period_frames = max(1, int(microphone.sample_rate * self._period_sec))
+        self._next_chunk: Optional[float] = None
+        self._closed = False
+
+    async def start(self):
+        """Simulate opening the device."""
+        if self.microphone.open_delay_ms > 0:
+            await asyncio.sleep(self.microphone.open_delay_ms / 1000.0)
+        self._next_chunk = time.monotonic() + self._period_sec
+        self._closed = False
+
+    async def read(self, max_bytes: int) -> bytes:
+        """Return the next period once it has been 'captured'."""
+        if self._closed or self._next_chunk is None:
+            return b""
+
+        delay = self._next_chunk - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._closed:
+            return b""
+        captured_from = self._next_chunk - self._period_sec
+        self._next_chunk += self._period_sec
+
+        frame_bytes = 2 * self.microphone.channels
+        frames = min(self._period_frames, max(1, max_bytes // frame_bytes))
+        return self.microphone.render(captured_from, frames)
+
+    async def close(self):
+        """Stop capturing."""
+        self._closed = True
+
+
+class ScriptedInput:
+    """
+    InputReader stand-in: one fake device whose events are sent by the caller.
+
+    Events pass through the same on_event callback as device events, so
+    double-tap detection and intent queueing behave as in the daemon.
+    """
+
+    def __init__(self, key_codes, on_event):
+        """
+        Initialize scripted input.
+
+        Args:
+            key_codes: Trigger key codes the fake device reports
+            on_event: Callback receiving (code, value, timestamp)
+        """
+        self.codes = frozenset(key_codes)
+        self.on_event = on_event
+        self._stopped = asyncio.Event()
+
+    @property
+    def device_paths(self) -> List[str]:
+        """Paths of the devices being read."""
+        return ["replay"]
+
+    def scan(self) -> List[DeviceInfo]:
+        """Report the fake device."""
+        return [("replay", "Replay hotkey device", sorted(self.codes))]
+
+    def send(self, key_code: int, value: int, timestamp: Optional[float] = None):
+        """Deliver one EV_KEY event (1 = down, 0 = up, 2 = repeat)."""
+        if key_code in self.codes:
+            self.on_event(key_code, value, time.time() if timestamp is None else timestamp)
+
+    async def run(self):
+        """Wait until stop() is called."""
+        await self._stopped.wait()
+
+    def stop(self):
+        """Stop run()."""
+        self._stopped.set()
+
+
+class ScriptedHotkeyListener(MultiHotkeyListener):
+    """Hotkey listener whose events come from a ScriptedInput instead of evdev."""
+
+    def _get_reader(self) -> ScriptedInput:
+        """Create the scripted reader on first use."""
+        if self._reader is None:
+            self._reader = ScriptedInput(self.key_codes, self._on_key_event)
+        return self._reader
+
+    @property
+    def input(self) -> ScriptedInput:
+        """The scripted device to send events through."""
+        return self._get_reader()
+
+    async def press(self, key_code: int):
+        """Send a key down event (with a double tap first if the key needs one)."""
+        if key_code in self.double_tap_codes:
+            self.input.send(key_code, 1)
+            await asyncio.sleep(0.05)
+            self.input.send(key_code, 0)
+            await asyncio.sleep(0.05)
+        self.input.send(key_code, 1)
+
+    def release(self, key_code: int):
+        """Send a key up event."""
+        self.input.send(key_code, 0)
+
+
+class MemoryUInput:
+    """
+    In-memory uinput sink: records every event the virtual keyboard writes.
+
+    Events are written from the typing thread; reads take a lock.
+    """
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self.events: List[Tuple[float, int, int, int]] = []  # (perf_counter, type, code, value)
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def write(self, ev_type: int, code: int, value: int):
+        """Record one event."""
+        with self._lock:
+            self.events.append((time.perf_counter(), ev_type, code, value))
+
+    def syn(self):
+        """Record a SYN_REPORT."""
+        self.write(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+    def close(self):
+        """Mark the device closed (events are kept)."""
+        self.closed = True
+
+    def mark(self) -> int:
+        """Position to decode from later (see text())."""
+        with self._lock:
+            return len(self.events)
+
+    def key_events(self, since: int = 0) -> List[Tuple[float, int, int]]:
+        """EV_KEY events recorded after a mark, as (perf_counter, code, value)."""
+        with self._lock:
+            events = self.events[since:]
+        return [(at, code, value) for at, ev_type, code, value in events if ev_type == ecodes.EV_KEY]
+
+    def text(self, since: int = 0, layout: Optional[str] = None) -> str:
+        """
+        Decode the key presses recorded after a mark back into text.
+
+        Args:
+            since: Mark returned by mark()
+            layout: Layout the text was typed with (default: current layout)
+
+        Returns:
+            The characters a focused window would have received
+        """
+        mapper = get_keyboard_mapper()
+        table = mapper.layout_table(layout or mapper.get_layout())
+        reverse: Dict[Tuple[int, FrozenSet[int]], str] = {}
+        for char, (keycode, modifiers) in table.items():
+            reverse.setdefault((keycode, frozenset(modifiers)), char)
+
+        held: set = set()
+        chars = []
+        for _, code, value in self.key_events(since):
+            if code in MODIFIER_KEYS:
+                if value:
+                    held.add(code)
+                else:
+                    held.discard(code)
+            elif value == 1:
+                chars.append(reverse.get((code, frozenset(held)), UNKNOWN_CHAR))
+        return "".join(chars)
+
+
+class StubTranscriber:
+    """
+    Transcriber stand-in that returns the expected text.
+
+    The harness sets the transcript of the clip being replayed; decoding
+    takes real_time_factor x the audio length (in the worker thread, like
+    the model would). Each sentence is a segment, produced after its share
+    of the decode time.
+    """
+
+    def __init__(self, real_time_factor: float = 0.05, sample_rate: int = 16000):
+        """
+        Initialize stub.
+
+        Args:
+            real_time_factor: Simulated decode time per second of audio
+            sample_rate: Sample rate of in-memory audio
+        """
+        self.real_time_factor = real_time_factor
+        self.sample_rate = sample_rate
+        self.transcript = ""
+        self.calls = 0
+
+    def load_model(self):
+        """Nothing to load."""
+        return None
+
+    def warmup(self, runs: int = 2) -> List[float]:
+        """Nothing to warm up."""
+        return []
+
+    def _segments(self, audio_sec: float, timing: Optional[Dict[str, float]]) -> Iterator[Tuple[float, float, str]]:
+        """Yield the transcript sentence by sentence, each after its share of the decode time."""
+        started = time.perf_counter()
+        self.calls += 1
+        sentences = [part for part in re.split(r"(?<=[.!?…])\s+", self.transcript.strip()) if part]
+        total_chars = sum(len(sentence) for sentence in sentences) or 1
+        if timing is not None:
+            timing["model_prepare_ms"] = 0.0
+
+        position = 0.0
+        for sentence in sentences:
+            share = len(sentence) / total_chars
+            time.sleep(audio_sec * self.real_time_factor * share)
+            if timing is not None and "first_segment_ms" not in timing:
+                timing["first_segment_ms"] = (time.perf_counter() - started) * 1000
+            yield position, position + audio_sec * share, sentence
+            position += audio_sec * share
+
+        if not sentences:
+            time.sleep(audio_sec * self.real_time_factor)
+        if timing is not None:
+            timing["model_decode_ms"] = (time.perf_counter() - started) * 1000
+            timing["audio_sec"] = audio_sec
+            timing["speech_sec"] = audio_sec
+
+    def _audio_sec(self, audio_file) -> float:
+        """Length of a WAV file or float32 samples in seconds."""
+        if isinstance(audio_file, np.ndarray):
+            return len(audio_file) / self.sample_rate
+        with wave.open(str(audio_file), "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+
+    def transcribe_array_segments(self, samples, sample_rate: int = 16000, channels: int = 1, timing=None, **kwargs):
+        """Yield the transcript segments for in-memory audio."""
+        frames = len(samples) // channels if isinstance(samples, np.ndarray) else len(samples) // (2 * channels)
+        return self._segments(frames / sample_rate, timing)
+
+    def transcribe_segments(self, audio_file, timing=None, **kwargs):
+        """Yield the transcript segments for a WAV file or float32 samples."""
+        return self._segments(self._audio_sec(audio_file), timing)
+
+    def transcribe_array(self, samples, sample_rate: int = 16000, channels: int = 1, timing=None, **kwargs) -> str:
+        """Return the transcript for in-memory audio."""
+        segments = self.transcribe_array_segments(samples, sample_rate, channels, timing)
+        return " ".join(text for _, _, text in segments)
+
+    def transcribe(self, audio_file, timing=None, **kwargs) -> str:
+        """Return the transcript for a WAV file or float32 samples."""
+        return " ".join(text for _, _, text in self.transcribe_segments(audio_file, timing))
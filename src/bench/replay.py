@@ -0,0 +1,388 @@
+"""Offline replay harness for end-to-end latency benchmarking.
+
+Replays a directory of WAV files through the real SpeechToTextService:
+each clip is "spoken" into a fake microphone while a scripted hotkey is
+held, and the text the service types lands in an in-memory uinput sink.
+No microphone, keyboard or /dev/uinput is needed.
+
+The report has the per-stage latency distributions the daemon records
+(press -> first frame, transcription, typing, release -> typed, ...) and
+compares the typed text of each clip with its reference transcript
+(<name>.txt next to <name>.wav). Runs use the configured model, or a stub
+transcriber that returns the reference text after a simulated decode time.
+
+Example:
+    python -m src.main --replay samples/ --stub-transcriber
+    python -m src.main --replay samples/ --model tiny
+"""
+
+import asyncio
+import copy
+import logging
+import tempfile
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from evdev import ecodes
+
+from .fakes import (
+    FakeMicrophone,
+    MemoryUInput,
+    ReplayClip,
+    ScriptedHotkeyListener,
+    StubTranscriber,
+    load_clips,
+)
+from ..config import Config
+from ..core.recorder import AudioRecorder
+from ..core.text_input import TextInput
+from ..daemon.service import FAKE_OPEN_DELAY_MS, FAKE_PERIOD_MS, SpeechToTextService
+from ..utils.metrics import UtteranceTiming, format_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Script of each clip: speech starts LEAD after the press, the key is
+# released TAIL after the speech ends, and the next press waits GAP
+DEFAULT_LEAD_MS = 150
+DEFAULT_TAIL_MS = 300
+DEFAULT_GAP_MS = 500
+
+# Simulated decode time of the stub transcriber per second of audio
+DEFAULT_STUB_RTF = 0.05
+
+# Give up on an utterance that has not finished this long after the release
+UTTERANCE_TIMEOUT_SEC = 120.0
+STARTUP_TIMEOUT_SEC = 600.0  # Includes loading (and possibly downloading) the model
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words with punctuation removed (for transcript comparison)."""
+    kept = [
+        " " if unicodedata.category(char).startswith("P") else char
+        for char in text.casefold()
+    ]
+    return "".join(kept).split()
+
+
+def word_errors(reference: List[str], hypothesis: List[str]) -> int:
+    """Word-level edit distance (substitutions + insertions + deletions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1]
+
+
+@dataclass
+class ClipResult:
+    """Outcome of replaying one clip."""
+    name: str
+    duration_sec: float
+    reference: Optional[str]
+    expected: Optional[str]  # Reference as typed (voice commands become keys)
+    typed: str
+    outcome: str  # typed, no_speech, discarded, error, timeout
+    stages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def reference_words(self) -> int:
+        """Number of words in the expected output."""
+        return len(normalize_words(self.expected)) if self.expected is not None else 0
+
+    @property
+    def word_errors(self) -> Optional[int]:
+        """Word errors of the typed text (None without a reference)."""
+        if self.expected is None:
+            return None
+        return word_errors(normalize_words(self.expected), normalize_words(self.typed))
+
+    @property
+    def correct(self) -> Optional[bool]:
+        """Check if the typed text matches the reference (ignoring case and punctuation)."""
+        errors = self.word_errors
+        return None if errors is None else errors == 0
+
+
+@dataclass
+class ReplayReport:
+    """Results of a replay run."""
+    transcriber: str
+    results: List[ClipResult]
+    metrics: dict  # MetricsRegistry snapshot
+    wall_sec: float = 0.0
+
+    @property
+    def checked(self) -> List[ClipResult]:
+        """Results that have a reference transcript."""
+        return [r for r in self.results if r.reference is not None]
+
+    @property
+    def word_error_rate(self) -> Optional[float]:
+        """Word errors over reference words, across all checked clips."""
+        words = sum(r.reference_words for r in self.checked)
+        if not words:
+            return None
+        return sum(r.word_errors for r in self.checked) / words
+
+    @property
+    def ok(self) -> bool:
+        """Check if every clip was typed and matched its reference (where there is one)."""
+        return all(r.outcome == "typed" and r.correct is not False for r in self.results)
+
+    def format(self) -> str:
+        """Render the report as text."""
+        lines = [f"Replayed {len(self.results)} clips with {self.transcriber} in {self.wall_sec:.1f} s", ""]
+        lines.append(
+            f"{'Clip':<24} {'audio s':>7} {'outcome':<10} {'->first char':>12} {'->typed':>9}  {'match':<5} typed"
+        )
+        lines.append("-" * 100)
+        for r in self.results:
+            first, end_to_end = (r.stages.get(stage) for stage in ("release_to_first_typed_ms", "release_to_typed_ms"))
+            first = f"{first:.0f} ms" if first is not None else "-"
+            latency = f"{end_to_end:.0f} ms" if end_to_end is not None else "-"
+            match = "-" if r.correct is None else ("yes" if r.correct else "NO")
+            lines.append(
+                f"{r.name[:24]:<24} {r.duration_sec:>7.1f} {r.outcome:<10} {first:>12} {latency:>9}  "
+                f"{match:<5} {r.typed[:40]!r}"
+            )
+
+        checked = self.checked
+        if checked:
+            exact = sum(1 for r in checked if r.correct)
+            lines.append("")
+            lines.append(
+                f"Typed output: {exact}/{len(checked)} exact, "
+                f"word error rate {self.word_error_rate * 100:.1f}%"
+            )
+
+        lines.append("")
+        lines.append(format_snapshot(self.metrics))
+        return "\n".join(lines)
+
+
+class ReplayService(SpeechToTextService):
+    """
+    The daemon service wired to the replay fakes.
+
+    Capture is in-memory from the fake microphone, hotkey events come from
+    a ScriptedHotkeyListener and typing goes to a MemoryUInput. Everything
+    between (intent queue, pipeline stages, metrics) is the daemon's own.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        microphone: FakeMicrophone,
+        sink: MemoryUInput,
+        transcriber=None,
+    ):
+        """
+        Initialize service.
+
+        Args:
+            config: Configuration (metrics must be enabled)
+            microphone: Fake microphone the recorder captures from
+            sink: In-memory uinput sink receiving the typed key events
+            transcriber: Transcriber replacement (None: the configured model)
+        """
+        super().__init__(config)
+        self.recorder = AudioRecorder(
+            sample_rate=config.audio.sample_rate,
+            channels=config.audio.channels,
+            capture_mode="memory",
+            max_duration=config.audio.max_duration,
+            pcm_source_factory=microphone.source,
+            warm_capture=config.audio.warm_capture,
+            pre_roll_ms=config.audio.pre_roll_ms,
+            post_roll_ms=config.audio.post_roll_ms,
+        )
+        if transcriber is not None:
+            self.transcriber = transcriber
+            self.scheduler.transcriber = transcriber
+        self.text_input = TextInput(
+            key_delay_ms=config.text_input.key_delay_ms,
+            typing_burst_size=config.text_input.typing_burst_size,
+            mode="uinput",
+            defer_setup=True,
+            uinput_device=sink,
+        )
+        # (timing, outcome) of every finished utterance, in completion order
+        self.finished: "asyncio.Queue[Tuple[UtteranceTiming, str]]" = asyncio.Queue()
+
+    def _create_listener(self) -> ScriptedHotkeyListener:
+        """Create the scripted hotkey listener."""
+        return ScriptedHotkeyListener(
+            trigger_keys=self.config.hotkey.trigger_keys,
+            double_tap_keys=self.config.hotkey.double_tap_key_list,
+            on_press=self._on_key_press,
+            on_release=self._on_key_release,
+            double_tap_timeout_ms=self.config.hotkey.double_tap_timeout_ms,
+        )
+
+    def _record_timing(self, utterance, outcome: str):
+        """Record the timing and report the utterance as finished."""
+        first = utterance.timing.outcome == "pending"
+        super()._record_timing(utterance, outcome)
+        if first:
+            self.finished.put_nowait((utterance.timing, outcome))
+
+    async def wait_ready(self, run_task: asyncio.Task, timeout: float = STARTUP_TIMEOUT_SEC):
+        """
+        Wait until the listener runs and the model is loaded.
+
+        Raises:
+            RuntimeError: If the service stopped or did not start in time
+        """
+        deadline = time.monotonic() + timeout
+        while not (
+            self._model_ready.is_set()
+            and self.listener is not None
+            and self.listener.is_running
+        ):
+            if run_task.done() or self._model_failed:
+                raise RuntimeError("Service failed to start (see log)")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Service not ready after {timeout:.0f} s")
+            await asyncio.sleep(0.01)
+
+    async def replay_clip(
+        self,
+        clip: ReplayClip,
+        microphone: FakeMicrophone,
+        sink: MemoryUInput,
+        lead_ms: float = DEFAULT_LEAD_MS,
+        tail_ms: float = DEFAULT_TAIL_MS,
+    ) -> ClipResult:
+        """Hold the hotkey while a clip plays and collect what gets typed."""
+        while not self.finished.empty():
+            self.finished.get_nowait()
+        if isinstance(self.transcriber, StubTranscriber):
+            # Without a reference the stub types the clip name, so typing is still timed
+            self.transcriber.transcript = clip.reference or clip.name
+
+        key_code = self.config.hotkey.key_code
+        mark = sink.mark()
+        await self.listener.press(key_code)
+        microphone.play(clip.samples, delay_sec=lead_ms / 1000.0)
+        await asyncio.sleep((lead_ms + tail_ms) / 1000.0 + clip.duration_sec)
+        self.listener.release(key_code)
+
+        try:
+            timing, outcome = await asyncio.wait_for(self.finished.get(), UTTERANCE_TIMEOUT_SEC)
+            stages = dict(timing.stages)
+        except asyncio.TimeoutError:
+            logger.warning(f"Clip {clip.name}: no result after {UTTERANCE_TIMEOUT_SEC:.0f} s")
+            outcome, stages = "timeout", {}
+
+        typed = sink.text(mark)
+        logger.info(f"Clip {clip.name}: {outcome}, typed {typed!r}")
+        expected = self.expected_output(clip.reference) if clip.reference is not None else None
+        return ClipResult(clip.name, clip.duration_sec, clip.reference, expected, typed, outcome, stages)
+
+    def expected_output(self, text: str) -> str:
+        """Text a transcript should type: voice commands replaced by their keys."""
+        parts = []
+        for kind, content in self.text_input._parse_special_commands(text):
+            if kind == "text":
+                parts.append(content)
+            elif self.text_input._special_commands.get(content) == ecodes.KEY_ENTER:
+                parts.append("\n")
+        return "".join(parts)
+
+
+async def replay(
+    config: Config,
+    clips: List[ReplayClip],
+    stub_transcriber: bool = False,
+    stub_rtf: float = DEFAULT_STUB_RTF,
+    lead_ms: float = DEFAULT_LEAD_MS,
+    tail_ms: float = DEFAULT_TAIL_MS,
+    gap_ms: float = DEFAULT_GAP_MS,
+    metrics_dir: Optional[Path] = None,
+) -> ReplayReport:
+    """
+    Replay clips through the service, one utterance at a time.
+
+    Args:
+        config: Configuration (model, capture and typing settings are used;
+            sounds are disabled, capture is in memory, hotkeys are held, typing is uinput)
+        clips: Clips to replay, in order
+        stub_transcriber: Return the reference text instead of running the model
+        stub_rtf: Stub decode time per second of audio
+        lead_ms: Press -> speech start
+        tail_ms: Speech end -> release
+        gap_ms: Pause after each utterance finished
+        metrics_dir: Where to export metrics (default: a temporary directory)
+
+    Returns:
+        ReplayReport with per-clip results and the metrics snapshot
+    """
+    config = copy.deepcopy(config)
+    config.feedback.enabled = False
+    config.audio.capture_mode = "memory"
+    config.hotkey.mode = "hold"  # One press/release per clip
+    config.text_input.mode = "uinput"
+    config.metrics.enabled = True
+    config.metrics.textfile = ""
+    if stub_transcriber:
+        # Streaming decodes partial windows, which the stub cannot answer
+        config.whisper.streaming = False
+        config.whisper.warmup = False
+
+    with tempfile.TemporaryDirectory(prefix="stt-replay-") as tmp:
+        config.metrics.directory = str(metrics_dir or tmp)
+
+        microphone = FakeMicrophone(
+            sample_rate=config.audio.sample_rate,
+            channels=config.audio.channels,
+            period_ms=FAKE_PERIOD_MS,
+            open_delay_ms=FAKE_OPEN_DELAY_MS,
+        )
+        sink = MemoryUInput()
+        transcriber = None
+        description = f"model '{config.whisper.model}'"
+        if stub_transcriber:
+            transcriber = StubTranscriber(real_time_factor=stub_rtf, sample_rate=config.audio.sample_rate)
+            description = f"stub transcriber (RTF {stub_rtf:g})"
+
+        service = ReplayService(config, microphone, sink, transcriber=transcriber)
+        run_task = asyncio.create_task(service.run())
+        results: List[ClipResult] = []
+        started = time.perf_counter()
+        try:
+            await service.wait_ready(run_task)
+            for clip in clips:
+                results.append(await service.replay_clip(clip, microphone, sink, lead_ms, tail_ms))
+                await asyncio.sleep(gap_ms / 1000.0)
+        finally:
+            await service.shutdown()
+            await asyncio.gather(run_task, return_exceptions=True)
+
+        return ReplayReport(
+            transcriber=description,
+            results=results,
+            metrics=service.metrics.snapshot(),
+            wall_sec=time.perf_counter() - started,
+        )
+
+
+def replay_directory(config: Config, directory: Path, **kwargs) -> ReplayReport:
+    """
+    Replay every WAV file in a directory (blocking).
+
+    Raises:
+        FileNotFoundError: If the directory has no WAV files
+    """
+    clips = load_clips(directory, sample_rate=config.audio.sample_rate)
+    if not clips:
+        raise FileNotFoundError(f"No .wav files in {directory}")
+    return asyncio.run(replay(config, clips, **kwargs))
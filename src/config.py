@@ -22,6 +22,13 @@ class WhisperConfig:
     beam_size: int = 5
     vad_filter: bool = True
     initial_prompt: str = ""  # Optional prompt to guide transcription
+    streaming: bool = False  # Decode while the hotkey is held (requires audio.capture_mode = "memory")
+    streaming_interval_sec: float = 2.0  # How often a streaming window is decoded
+    streaming_max_window_sec: float = 15.0  # Force-commit text once the open window exceeds this
+    warmup: bool = True  # Decode a synthetic utterance at daemon startup
+    warmup_runs: int = 2  # Warm-up decodes (first one is the cold path)
+    cpu_threads: int = 0  # CTranslate2 threads per decode (0 = library default)
+    decode_workers: int = 1  # Decodes that can run at the same time (streaming windows vs final decode)
 
     @property
     def language_or_none(self) -> Optional[str]:
@@ -102,6 +109,18 @@ class AudioConfig:
     format: str = "S16_LE"
     min_duration: float = 0.5
     max_duration: int = 60
+    capture_mode: str = "file"  # "file" (temp WAV) or "memory" (in-memory ring buffer)
+    warm_capture: bool = False  # Keep capturing between utterances (requires "memory" mode)
+    pre_roll_ms: int = 500  # Audio kept from before the hotkey press (warm capture)
+    post_roll_ms: int = 200  # Audio kept after the hotkey release (warm capture)
+    max_pending_utterances: int = 3  # Utterances recorded/transcribed/typed at once before presses are ignored
+    press_latency_target_ms: int = 100  # Key press to first audio frame budget (0 = no check)
+    trim_silence: bool = True  # Trim leading/trailing silence (energy VAD); silent clips skip the model
+    vad_threshold_db: float = -45.0  # Minimum frame energy (dBFS) that can count as speech
+    vad_min_speech_ms: int = 100  # Shortest voiced run that counts as speech
+    vad_padding_ms: int = 250  # Audio kept around the detected speech
+    pause_ms: int = 700  # Hands-free mode: silence that ends an utterance
+    max_segment_sec: int = 30  # Hands-free mode: utterances are cut here even without a pause
 
 
 @dataclass
@@ -112,6 +131,7 @@ class HotkeyConfig:
     enable_double_tap: bool = False  # Require double-tap to activate (prevents conflicts with Ctrl combinations)
     double_tap_keys: str = ""  # Comma-separated list of keys that require double-tap (empty = use enable_double_tap for all)
     double_tap_timeout_ms: int = 300  # Max time between taps in milliseconds
+    mode: str = "hold"  # "hold" (push-to-talk) or "toggle" (press to start/stop hands-free dictation)
 
     @property
     def trigger_keys(self) -> list:
@@ -174,10 +194,33 @@ class DisplayConfig:
 @dataclass
 class TextInputConfig:
     """Text input configuration."""
-    mode: str = "uinput"  # Input mode: "uinput" or "clipboard"
+    mode: str = "uinput"  # Input mode: "uinput", "clipboard" or "hybrid"
     paste_key_combination: str = "shift+insert"  # Paste key for clipboard mode
-    key_delay_ms: int = 10  # Delay between key events in milliseconds (uinput mode)
+    key_delay_ms: int = 10  # Delay between key event bursts in milliseconds (uinput mode)
+    typing_burst_size: int = 8  # Key transitions written per burst (1 = one event per delay)
     pre_paste_delay_ms: int = 0  # Delay before pasting (gives time to restore window focus)
+    restore_selection_after_ms: int = 500  # Restore previous selection after pasting (0 = off)
+
+
+@dataclass
+class MetricsConfig:
+    """Latency metrics configuration."""
+    enabled: bool = True  # Record per-utterance stage timings
+    directory: str = ""  # metrics.json/metrics.prom location (empty = $XDG_STATE_HOME/speech-to-text)
+    textfile: str = ""  # Extra Prometheus textfile path (e.g. node_exporter textfile collector)
+    loop_lag_interval_ms: int = 100  # Event loop lag sampling interval (0 = disabled)
+    loop_stall_threshold_ms: int = 50  # Loop lag counted and logged as a stall
+    loop_stall_debug: bool = False  # Name the blocking callsite of each stall (samples stacks)
+
+
+@dataclass
+class BatchConfig:
+    """Batch transcription (--transcribe) configuration."""
+    processes: int = 1  # Worker processes, each with its own loaded model
+    cpu_threads: int = 0  # CTranslate2 threads per decode (0 = CPU cores / parallel decodes)
+    num_workers: int = 1  # Parallel decodes on one model (used when processes = 1)
+    format: str = "jsonl"  # "jsonl" (one record per file) or "text" (<name>.<ext>.txt per file)
+    output: str = ""  # JSONL file or text directory (empty = transcripts.jsonl / next to each file)
 
 
 @dataclass
@@ -190,6 +233,8 @@ class Config:
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     display: DisplayConfig = field(default_factory=DisplayConfig)
     text_input: TextInputConfig = field(default_factory=TextInputConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    batch: BatchConfig = field(default_factory=BatchConfig)
 
     @classmethod
     def load(cls, path: Optional[Path] = None) -> "Config":
@@ -239,6 +284,13 @@ class Config:
                 beam_size=w.get("beam_size", config.whisper.beam_size),
                 vad_filter=w.get("vad_filter", config.whisper.vad_filter),
                 initial_prompt=w.get("initial_prompt", config.whisper.initial_prompt),
+                streaming=w.get("streaming", config.whisper.streaming),
+                streaming_interval_sec=w.get("streaming_interval_sec", config.whisper.streaming_interval_sec),
+                streaming_max_window_sec=w.get("streaming_max_window_sec", config.whisper.streaming_max_window_sec),
+                warmup=w.get("warmup", config.whisper.warmup),
+                warmup_runs=w.get("warmup_runs", config.whisper.warmup_runs),
+                cpu_threads=w.get("cpu_threads", config.whisper.cpu_threads),
+                decode_workers=w.get("decode_workers", config.whisper.decode_workers),
             )
 
         if "audio" in data:
@@ -249,6 +301,18 @@ class Config:
                 format=a.get("format", config.audio.format),
                 min_duration=a.get("min_duration", config.audio.min_duration),
                 max_duration=a.get("max_duration", config.audio.max_duration),
+                capture_mode=a.get("capture_mode", config.audio.capture_mode),
+                warm_capture=a.get("warm_capture", config.audio.warm_capture),
+                pre_roll_ms=a.get("pre_roll_ms", config.audio.pre_roll_ms),
+                post_roll_ms=a.get("post_roll_ms", config.audio.post_roll_ms),
+                max_pending_utterances=a.get("max_pending_utterances", config.audio.max_pending_utterances),
+                press_latency_target_ms=a.get("press_latency_target_ms", config.audio.press_latency_target_ms),
+                trim_silence=a.get("trim_silence", config.audio.trim_silence),
+                vad_threshold_db=a.get("vad_threshold_db", config.audio.vad_threshold_db),
+                vad_min_speech_ms=a.get("vad_min_speech_ms", config.audio.vad_min_speech_ms),
+                vad_padding_ms=a.get("vad_padding_ms", config.audio.vad_padding_ms),
+                pause_ms=a.get("pause_ms", config.audio.pause_ms),
+                max_segment_sec=a.get("max_segment_sec", config.audio.max_segment_sec),
             )
 
         if "hotkey" in data:
@@ -259,6 +323,7 @@ class Config:
                 enable_double_tap=h.get("enable_double_tap", config.hotkey.enable_double_tap),
                 double_tap_keys=h.get("double_tap_keys", config.hotkey.double_tap_keys),
                 double_tap_timeout_ms=h.get("double_tap_timeout_ms", config.hotkey.double_tap_timeout_ms),
+                mode=h.get("mode", config.hotkey.mode),
             )
 
         if "feedback" in data:
@@ -289,7 +354,32 @@ class Config:
                 mode=ti.get("mode", config.text_input.mode),
                 paste_key_combination=ti.get("paste_key_combination", config.text_input.paste_key_combination),
                 key_delay_ms=ti.get("key_delay_ms", config.text_input.key_delay_ms),
+                typing_burst_size=ti.get("typing_burst_size", config.text_input.typing_burst_size),
                 pre_paste_delay_ms=ti.get("pre_paste_delay_ms", config.text_input.pre_paste_delay_ms),
+                restore_selection_after_ms=ti.get(
+                    "restore_selection_after_ms", config.text_input.restore_selection_after_ms
+                ),
+            )
+
+        if "metrics" in data:
+            m = data["metrics"]
+            config.metrics = MetricsConfig(
+                enabled=m.get("enabled", config.metrics.enabled),
+                directory=m.get("directory", config.metrics.directory),
+                textfile=m.get("textfile", config.metrics.textfile),
+                loop_lag_interval_ms=m.get("loop_lag_interval_ms", config.metrics.loop_lag_interval_ms),
+                loop_stall_threshold_ms=m.get("loop_stall_threshold_ms", config.metrics.loop_stall_threshold_ms),
+                loop_stall_debug=m.get("loop_stall_debug", config.metrics.loop_stall_debug),
+            )
+
+        if "batch" in data:
+            b = data["batch"]
+            config.batch = BatchConfig(
+                processes=b.get("processes", config.batch.processes),
+                cpu_threads=b.get("cpu_threads", config.batch.cpu_threads),
+                num_workers=b.get("num_workers", config.batch.num_workers),
+                format=b.get("format", config.batch.format),
+                output=b.get("output", config.batch.output),
             )
 
         return config
@@ -302,12 +392,26 @@ class Config:
         print(f"Whisper Device:    {self.whisper.device}")
         print(f"Compute Type:      {self.whisper.compute_type}")
         print(f"Language:          {self.whisper.language or 'auto-detect'}")
+        print(f"Streaming:         {'enabled' if self.whisper.streaming else 'disabled'}")
+        if self.whisper.decode_workers > 1:
+            print(f"Decode Workers:    {self.whisper.decode_workers}")
+        print(f"Warm-up:           {'enabled' if self.whisper.warmup else 'disabled'}")
         print()
         print(f"Audio Rate:        {self.audio.sample_rate} Hz")
         print(f"Audio Channels:    {self.audio.channels}")
+        print(f"Capture Mode:      {self.audio.capture_mode}")
+        if self.audio.warm_capture:
+            print(f"Warm Capture:      pre-roll {self.audio.pre_roll_ms} ms, post-roll {self.audio.post_roll_ms} ms")
+        if self.audio.press_latency_target_ms > 0:
+            print(f"Press Latency:     target {self.audio.press_latency_target_ms} ms to first frame")
+        if self.audio.trim_silence:
+            print(f"Silence Trimming:  above {self.audio.vad_threshold_db:g} dBFS, {self.audio.vad_padding_ms} ms padding")
         print()
         print(f"Hotkey:            {self.hotkey.trigger_key}")
         print(f"Device Path:       {self.hotkey.device_path or 'auto-detect'}")
+        print(f"Hotkey Mode:       {self.hotkey.mode}")
+        if self.hotkey.mode == "toggle":
+            print(f"Hands-Free:        utterance ends after {self.audio.pause_ms} ms pause (max {self.audio.max_segment_sec} s)")
         print(f"Double-Tap Mode:   {'enabled' if self.hotkey.enable_double_tap else 'disabled'}")
         if self.hotkey.enable_double_tap:
             print(f"Double-Tap Timeout: {self.hotkey.double_tap_timeout_ms} ms")
@@ -318,7 +422,19 @@ class Config:
         print()
         print(f"Text Input Mode:   {self.text_input.mode}")
         print(f"Paste Key Combo:   {self.text_input.paste_key_combination}")
+        print(f"Restore Selection: {self.text_input.restore_selection_after_ms} ms after paste")
         print(f"Key Delay:         {self.text_input.key_delay_ms} ms")
+        print(f"Typing Burst Size: {self.text_input.typing_burst_size}")
+        print()
+        print(f"Latency Metrics:   {'enabled' if self.metrics.enabled else 'disabled'}")
+        if self.metrics.loop_lag_interval_ms > 0:
+            debug = ", callsite debug" if self.metrics.loop_stall_debug else ""
+            print(f"Loop Lag Monitor:  every {self.metrics.loop_lag_interval_ms} ms, "
+                  f"stalls over {self.metrics.loop_stall_threshold_ms} ms{debug}")
+        print()
+        print(f"Batch Workers:     {self.batch.processes} process(es), "
+              f"{self.batch.cpu_threads or 'auto'} threads each, {self.batch.num_workers} decode(s) per model")
+        print(f"Batch Output:      {self.batch.format}")
         print("=" * 60)
 
 
@@ -0,0 +1,227 @@
+"""In-memory PCM buffering for audio capture.
+
+Captured S16_LE audio is written into a preallocated NumPy ring buffer so
+recordings never touch the disk. The buffer keeps an absolute frame counter,
+which lets callers address audio by frame index even after it wraps.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper models expect 16 kHz mono float32 input
+WHISPER_SAMPLE_RATE = 16000
+
+
+class PCMRingBuffer:
+    """Fixed-size ring buffer of interleaved 16-bit PCM frames.
+
+    Example:
+        >>> buffer = PCMRingBuffer(capacity_frames=16000 * 60)
+        >>> buffer.write(chunk)  # raw S16_LE bytes from arecord
+        >>> samples = buffer.read()
+    """
+
+    def __init__(self, capacity_frames: int, channels: int = 1):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity_frames: Maximum number of frames kept in memory
+            channels: Number of interleaved channels per frame
+        """
+        if capacity_frames <= 0:
+            raise ValueError(f"capacity_frames must be positive, got {capacity_frames}")
+
+        self.capacity = capacity_frames
+        self.channels = channels
+        self._data = np.zeros((capacity_frames, channels), dtype=np.int16)
+        self._frames_written = 0
+        self._pending = bytearray()  # Trailing bytes that don't form a whole frame
+        self._overflow_logged = False
+
+    @property
+    def frame_bytes(self) -> int:
+        """Size of one interleaved frame in bytes."""
+        return 2 * self.channels
+
+    @property
+    def frames_written(self) -> int:
+        """Total number of frames written since creation or last clear()."""
+        return self._frames_written
+
+    @property
+    def oldest_frame(self) -> int:
+        """Absolute index of the oldest frame still held in the buffer."""
+        return max(0, self._frames_written - self.capacity)
+
+    def clear(self):
+        """Discard all buffered audio and reset the frame counter."""
+        self._frames_written = 0
+        self._pending.clear()
+        self._overflow_logged = False
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        """
+        Append raw S16_LE bytes to the buffer.
+
+        Partial frames are held back until the rest of the frame arrives.
+        When the buffer is full the oldest frames are overwritten.
+
+        Args:
+            data: Raw interleaved little-endian 16-bit PCM
+
+        Returns:
+            Number of whole frames written
+        """
+        if self._pending:
+            self._pending.extend(data)
+            data = bytes(self._pending)
+            self._pending.clear()
+
+        usable = len(data) - len(data) % self.frame_bytes
+        if usable < len(data):
+            self._pending.extend(memoryview(data)[usable:])
+        if usable == 0:
+            return 0
+
+        frames = np.frombuffer(data, dtype="<i2", count=usable // 2).reshape(-1, self.channels)
+        return self.write_frames(frames)
+
+    def write_frames(self, frames: np.ndarray) -> int:
+        """
+        Append already-decoded int16 frames to the buffer.
+
+        Args:
+            frames: Array of shape (n, channels) or (n,) for mono
+
+        Returns:
+            Number of frames written
+        """
+        frames = frames.reshape(-1, self.channels)
+        count = len(frames)
+        if count == 0:
+            return 0
+
+        if count > self.capacity:
+            # Only the newest `capacity` frames can survive anyway
+            skipped = count - self.capacity
+            frames = frames[skipped:]
+            self._frames_written += skipped
+            count = self.capacity
+
+        start = self._frames_written % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = frames[:first]
+        if first < count:
+            self._data[:count - first] = frames[first:]
+
+        self._frames_written += count
+
+        if self._frames_written > self.capacity and not self._overflow_logged:
+            logger.warning(
+                f"Audio buffer full ({self.capacity} frames), discarding oldest audio"
+            )
+            self._overflow_logged = True
+
+        return count
+
+    def read(self, start_frame: Optional[int] = None, end_frame: Optional[int] = None) -> np.ndarray:
+        """
+        Copy a range of frames out of the buffer.
+
+        Args:
+            start_frame: Absolute index of first frame (oldest available if None)
+            end_frame: Absolute index one past the last frame (newest if None)
+
+        Returns:
+            int16 array of shape (n, channels); frames that have already been
+            overwritten or not yet written are clipped from the range
+        """
+        oldest = self.oldest_frame
+        start = oldest if start_frame is None else max(start_frame, oldest)
+        end = self._frames_written if end_frame is None else min(end_frame, self._frames_written)
+
+        if end <= start:
+            return np.empty((0, self.channels), dtype=np.int16)
+
+        count = end - start
+        offset = start % self.capacity
+        if offset + count <= self.capacity:
+            return self._data[offset:offset + count].copy()
+
+        first = self.capacity - offset
+        return np.concatenate((self._data[offset:], self._data[:count - first]))
+
+
+def pcm_to_float32(frames: np.ndarray) -> np.ndarray:
+    """
+    Convert interleaved int16 frames to the mono float32 array Whisper expects.
+
+    Args:
+        frames: int16 array of shape (n, channels) or (n,)
+
+    Returns:
+        float32 array of shape (n,) scaled to [-1.0, 1.0)
+    """
+    if frames.ndim == 2 and frames.shape[1] > 1:
+        return frames.mean(axis=1, dtype=np.float32) / np.float32(32768.0)
+    return np.multiply(frames.reshape(-1), 1.0 / 32768.0, dtype=np.float32)
+
+
+def to_whisper_input(
+    samples: "np.ndarray | memoryview | bytes | bytearray",
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    channels: int = 1,
+) -> np.ndarray:
+    """
+    Convert a PCM buffer to 16 kHz mono float32 in one vectorized pass.
+
+    float32 mono input at 16 kHz is returned as a view without copying.
+    Raw bytes are interpreted as S16_LE; memoryviews keep their own format
+    ('h' for int16, 'f' for float32).
+
+    Args:
+        samples: int16 or float32 audio (ndarray, memoryview, or raw bytes)
+        sample_rate: Sample rate of the input in Hz
+        channels: Number of interleaved channels in flat input (ignored
+            for arrays shaped (n, channels))
+
+    Returns:
+        float32 array of shape (n,) at 16 kHz
+    """
+    if isinstance(samples, memoryview):
+        if samples.format == "f":
+            audio = np.frombuffer(samples, dtype=np.float32)
+        else:
+            audio = np.frombuffer(samples.cast("B"), dtype="<i2")
+    elif isinstance(samples, (bytes, bytearray)):
+        audio = np.frombuffer(samples, dtype="<i2")
+    else:
+        audio = np.asarray(samples)
+        if audio.ndim == 2:
+            # (n, channels) frames carry their own layout
+            channels = audio.shape[1]
+
+    if audio.dtype == np.int16:
+        audio = pcm_to_float32(audio.reshape(-1, channels))
+    else:
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        if channels > 1:
+            audio = audio.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+    audio = audio.reshape(-1)
+
+    if sample_rate != WHISPER_SAMPLE_RATE and len(audio) > 0:
+        # Linear interpolation is adequate for speech and stays vectorized
+        duration = len(audio) / sample_rate
+        target = np.arange(int(duration * WHISPER_SAMPLE_RATE), dtype=np.float64) * (
+            sample_rate / WHISPER_SAMPLE_RATE
+        )
+        audio = np.interp(target, np.arange(len(audio)), audio).astype(np.float32)
+
+    return audio
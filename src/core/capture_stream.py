@@ -0,0 +1,337 @@
+"""Persistent audio capture worker with wall-clock frame addressing.
+
+The worker keeps a PCM source (normally one arecord process) open for the
+lifetime of the daemon and writes every frame into a ring buffer. Recordings
+only gate which frames belong to the current utterance, so starting one costs
+no process spawn and no ALSA device open.
+
+Each frame's capture time is estimated from the stream's frame counter, so
+callers can cut an utterance at the exact timestamps of the hotkey events
+(plus pre-roll/post-roll) instead of at the moment the event loop got around
+to handling them.
+
+The worker runs its own event loop in a background thread. This keeps chunk
+timestamps accurate when the main loop is busy, and lets synchronous callers
+(e.g. the CLI's record_sync) use the same stream. If the source dies, the
+worker restarts it with exponential backoff.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from .audio_buffer import PCMRingBuffer
+from .pcm_source import PCMSource
+
+logger = logging.getLogger(__name__)
+
+# Size of each read from the PCM source (~64 ms of 16 kHz mono audio)
+STREAM_READ_CHUNK_BYTES = 2048
+
+# How often the clock anchor estimate is refreshed (seconds of audio).
+# Refreshing lets the estimate follow drift between the sound card and system clocks.
+ANCHOR_WINDOW_SEC = 10.0
+
+# Restart backoff for a crashed source (seconds)
+RESTART_BACKOFF_MIN_SEC = 0.5
+RESTART_BACKOFF_MAX_SEC = 10.0
+
+
+class CaptureStream:
+    """
+    Continuously running PCM capture into a ring buffer.
+
+    Example:
+        >>> stream = CaptureStream(ArecordSource, sample_rate=16000, capacity_sec=61)
+        >>> stream.start()
+        >>> start = stream.frame_at(press_time)
+        >>> await stream.wait_for_frame_async(stream.frame_at(release_time))
+        >>> frames = stream.read(start, stream.frame_at(release_time))
+        >>> stream.close()
+    """
+
+    def __init__(
+        self,
+        source_factory: Callable[[], PCMSource],
+        sample_rate: int = 16000,
+        channels: int = 1,
+        capacity_sec: float = 60.0,
+    ):
+        """
+        Initialize capture stream.
+
+        Args:
+            source_factory: Callable returning the PCMSource to read from
+            sample_rate: Sample rate in Hz
+            channels: Number of channels
+            capacity_sec: Seconds of audio kept in the ring buffer
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.buffer = PCMRingBuffer(
+            capacity_frames=int(sample_rate * capacity_sec),
+            channels=channels,
+        )
+        self._source_factory = source_factory
+
+        # Guards the ring buffer and clock anchor; notified on every chunk
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._source: Optional[PCMSource] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._streaming = False
+
+        # Wall-clock time of frame 0, estimated as the minimum of
+        # (chunk arrival time - frames received / rate) over a sliding window
+        self._anchor: Optional[float] = None
+        self._window_anchor = float("inf")
+        self._window_end_frame = 0
+        self._segment_start_frame = 0
+
+        # Health statistics
+        self.restarts = 0
+        self.last_open_ms: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_streaming(self) -> bool:
+        """Check if the source is currently delivering audio."""
+        return self._streaming
+
+    @property
+    def frames_written(self) -> int:
+        """Absolute number of frames captured so far."""
+        with self._cond:
+            return self.buffer.frames_written
+
+    @property
+    def oldest_frame(self) -> int:
+        """Absolute index of the oldest frame still buffered."""
+        with self._cond:
+            return self.buffer.oldest_frame
+
+    def start(self):
+        """Start the capture worker thread (no-op if already running)."""
+        if self.is_running:
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._thread_main,
+            name="capture-worker",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info("Capture worker started")
+
+    def close(self, timeout: float = 3.0):
+        """Stop the PCM source and join the worker thread."""
+        if self._thread is None:
+            return
+
+        self._stopping = True
+        loop, source = self._loop, self._source
+        if loop is not None and loop.is_running():
+            if self._stop_event is not None:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            if source is not None:
+                # Closing the source ends the pending read() in the worker loop
+                future = asyncio.run_coroutine_threadsafe(source.close(), loop)
+                try:
+                    future.result(timeout=timeout)
+                except Exception as e:
+                    logger.debug(f"Error closing capture source: {e}")
+
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning("Capture worker did not stop in time")
+        self._thread = None
+
+        with self._cond:
+            self._cond.notify_all()
+        logger.info("Capture worker stopped")
+
+    async def close_async(self):
+        """Async wrapper for close()."""
+        await asyncio.to_thread(self.close)
+
+    def _thread_main(self):
+        """Worker thread entry point."""
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._supervise())
+        finally:
+            self._loop = None
+            loop.close()
+
+    async def _supervise(self):
+        """Run the source, restarting it with backoff if it fails."""
+        backoff = RESTART_BACKOFF_MIN_SEC
+        self._stop_event = asyncio.Event()
+
+        while not self._stopping:
+            started = time.perf_counter()
+            try:
+                self._source = self._source_factory()
+                await self._source.start()
+                self.last_open_ms = (time.perf_counter() - started) * 1000
+                logger.info(f"Capture source opened in {self.last_open_ms:.1f} ms")
+
+                with self._cond:
+                    # A restarted source has a new clock origin
+                    self._begin_clock_segment()
+                self._streaming = True
+
+                got_audio = await self._read_loop(self._source)
+                if got_audio:
+                    backoff = RESTART_BACKOFF_MIN_SEC
+            except Exception as e:
+                logger.error(f"Capture source error: {e}")
+            finally:
+                self._streaming = False
+                if self._source is not None:
+                    try:
+                        await self._source.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing capture source: {e}")
+                    self._source = None
+                with self._cond:
+                    self._cond.notify_all()
+
+            if self._stopping:
+                break
+
+            self.restarts += 1
+            logger.warning(
+                f"Capture source stopped unexpectedly, restarting in {backoff:.1f} s "
+                f"(restart #{self.restarts})"
+            )
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, RESTART_BACKOFF_MAX_SEC)
+
+    async def _read_loop(self, source: PCMSource) -> bool:
+        """
+        Copy PCM chunks into the ring buffer until the source ends.
+
+        Returns:
+            True if any audio was received
+        """
+        got_audio = False
+        while not self._stopping:
+            chunk = await source.read(STREAM_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+
+            arrival = time.time()
+            got_audio = True
+            with self._cond:
+                self.buffer.write(chunk)
+                self._update_anchor(arrival)
+                self._cond.notify_all()
+        return got_audio
+
+    def _begin_clock_segment(self):
+        """Reset the clock anchor after the source (re)starts."""
+        self._anchor = None
+        self._window_anchor = float("inf")
+        self._window_end_frame = 0
+        self._segment_start_frame = self.buffer.frames_written
+
+    def _update_anchor(self, arrival: float):
+        """Refine the wall-clock time of frame 0 from a chunk arrival."""
+        frames = self.buffer.frames_written
+        candidate = arrival - frames / self.sample_rate
+
+        if candidate < self._window_anchor:
+            self._window_anchor = candidate
+        if self._anchor is None or candidate < self._anchor:
+            self._anchor = candidate
+
+        if frames >= self._window_end_frame:
+            # Start a new window; adopt the last window's minimum so the
+            # anchor can move later as well as earlier
+            if self._window_anchor != float("inf"):
+                self._anchor = self._window_anchor
+            self._window_anchor = candidate
+            self._window_end_frame = frames + int(ANCHOR_WINDOW_SEC * self.sample_rate)
+
+    def frame_at(self, timestamp: Optional[float] = None) -> int:
+        """
+        Convert a wall-clock timestamp to an absolute frame index.
+
+        Args:
+            timestamp: time.time()-style timestamp (now if None)
+
+        Returns:
+            Absolute frame index (may be past the newest frame for future times)
+        """
+        with self._cond:
+            if self._anchor is None:
+                return self.buffer.frames_written
+
+            if timestamp is None:
+                timestamp = time.time()
+            frame = int(round((timestamp - self._anchor) * self.sample_rate))
+            # Never map into audio from before the current source started
+            return max(self._segment_start_frame, frame)
+
+    def time_at(self, frame: int) -> Optional[float]:
+        """
+        Convert an absolute frame index to a wall-clock timestamp.
+
+        Args:
+            frame: Absolute frame index
+
+        Returns:
+            time.time()-style timestamp, or None before the first chunk
+        """
+        with self._cond:
+            if self._anchor is None:
+                return None
+            return self._anchor + frame / self.sample_rate
+
+    def wait_for_frame(self, frame: int, timeout: float = 2.0) -> int:
+        """
+        Block until the buffer contains the given absolute frame.
+
+        Args:
+            frame: Absolute frame index to wait for
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Number of frames written when the wait ended
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.buffer.frames_written < frame and self.is_running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Timed out waiting for audio frame {frame}")
+                    break
+                self._cond.wait(remaining)
+            return self.buffer.frames_written
+
+    async def wait_for_frame_async(self, frame: int, timeout: float = 2.0) -> int:
+        """Async wrapper for wait_for_frame()."""
+        if self.frames_written >= frame:
+            return self.frames_written
+        return await asyncio.to_thread(self.wait_for_frame, frame, timeout)
+
+    def read(self, start_frame: int, end_frame: Optional[int] = None) -> np.ndarray:
+        """Copy frames [start_frame, end_frame) out of the ring buffer."""
+        with self._cond:
+            return self.buffer.read(start_frame, end_frame)
@@ -0,0 +1,222 @@
+"""Selection ownership for clipboard paste mode.
+
+wl-copy and xclip serve one fixed payload per process, so a single
+long-lived owner cannot be fed new content. Instead, SelectionOwner keeps a
+*standby* process spawned ahead of time, already started and blocked reading
+its stdin. Setting the selection just writes the text to the standby and
+closes the pipe; the tool then claims the selection and a fresh standby is
+spawned in the background for the next paste. Process start-up is therefore
+off the paste path.
+
+Owner processes run in the foreground (`wl-copy --foreground`, `xclip
+-quiet`), so the current owner is a tracked child that exits once another
+client takes the selection. Readiness is confirmed by polling the selection
+with a short backoff instead of sleeping for a fixed time. Where readback is
+unreliable (wl-paste on compositors without the data-control protocol), the
+first failed confirmation switches to a short fixed settle delay.
+"""
+
+import logging
+import subprocess
+import threading
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Readiness polling: first interval, growth factor and ceiling (seconds)
+POLL_INITIAL_SEC = 0.002
+POLL_FACTOR = 2.0
+POLL_MAX_SEC = 0.04
+
+# Default time to wait for the tool to claim the selection
+DEFAULT_CONFIRM_TIMEOUT_SEC = 0.5
+
+# Settle delay used when readback cannot confirm ownership (old Wayland behaviour)
+UNCONFIRMED_SETTLE_SEC = 0.05
+
+
+class SelectionOwner:
+    """
+    Hand text to a pre-spawned wl-copy/xclip and confirm it owns the selection.
+
+    Example:
+        >>> owner = SelectionOwner("x11", "primary")
+        >>> owner.prespawn()               # at startup
+        >>> owner.set("Він сказав hello".encode())
+        >>> owner.confirm(b"...")          # True once the selection reads back
+        >>> owner.close()
+    """
+
+    def __init__(self, display_server: str, selection: str = "primary"):
+        """
+        Initialize selection owner.
+
+        Args:
+            display_server: "wayland" or "x11"
+            selection: "primary" or "clipboard"
+        """
+        self.display_server = display_server
+        self.selection = selection
+        self._lock = threading.Lock()
+        self._standby: Optional[subprocess.Popen] = None
+        self._owner: Optional[subprocess.Popen] = None
+        self._retired: List[subprocess.Popen] = []
+        self._closed = False
+        # None until the first confirmation attempt tells us
+        self.readback_reliable: Optional[bool] = None
+
+    @property
+    def _is_wayland(self) -> bool:
+        return self.display_server == "wayland"
+
+    def _copy_command(self) -> List[str]:
+        """Command that reads stdin and owns the selection until replaced."""
+        if self._is_wayland:
+            cmd = ["wl-copy", "--foreground"]
+            if self.selection == "primary":
+                cmd.append("--primary")
+            return cmd
+        return ["xclip", "-quiet", "-selection", self.selection, "-i"]
+
+    def _paste_command(self) -> List[str]:
+        """Command that prints the current selection."""
+        if self._is_wayland:
+            cmd = ["wl-paste", "--no-newline"]
+            if self.selection == "primary":
+                cmd.append("--primary")
+            return cmd
+        return ["xclip", "-selection", self.selection, "-o"]
+
+    def _spawn(self) -> subprocess.Popen:
+        """Start a copy process that waits for its payload on stdin."""
+        return subprocess.Popen(
+            self._copy_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Keeps the selection alive if the daemon exits
+        )
+
+    def prespawn(self):
+        """Make sure a standby process is ready."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._standby is not None and self._standby.poll() is None:
+                return
+            try:
+                self._standby = self._spawn()
+                logger.debug(f"Standby {self._copy_command()[0]} for {self.selection} (PID: {self._standby.pid})")
+            except OSError as e:
+                self._standby = None
+                logger.warning(f"Failed to spawn standby {self._copy_command()[0]}: {e}")
+
+    def _reap(self):
+        """Collect owner processes that have exited (lost the selection)."""
+        self._retired = [proc for proc in self._retired if proc.poll() is None]
+
+    def set(self, data: bytes) -> bool:
+        """
+        Make the selection serve data.
+
+        Args:
+            data: Selection content
+
+        Returns:
+            True if the payload was handed to a copy process
+        """
+        with self._lock:
+            proc = self._standby
+            self._standby = None
+        if proc is None or proc.poll() is not None:
+            proc = self._spawn()
+
+        try:
+            proc.stdin.write(data)
+            proc.stdin.close()
+        except OSError as e:
+            logger.error(f"Failed to write to {self._copy_command()[0]} stdin: {e}")
+            proc.kill()
+            return False
+
+        with self._lock:
+            if self._owner is not None:
+                self._retired.append(self._owner)
+            self._owner = proc
+            self._reap()
+        logger.debug(f"{self._copy_command()[0]} owns {self.selection} selection (PID: {proc.pid})")
+
+        # Next paste gets a fresh standby without paying the start-up cost
+        threading.Thread(target=self.prespawn, name="selection-standby", daemon=True).start()
+        return True
+
+    def owns(self) -> bool:
+        """Check if our last owner process still holds the selection."""
+        return self._owner is not None and self._owner.poll() is None
+
+    def read(self, timeout: float = 1.0) -> bytes:
+        """Read the current selection (empty bytes if unavailable)."""
+        try:
+            result = subprocess.run(
+                self._paste_command(),
+                capture_output=True,
+                timeout=timeout,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"Could not read {self.selection} selection: {e}")
+            return b""
+        return result.stdout if result.returncode == 0 else b""
+
+    def confirm(self, data: bytes, timeout: float = DEFAULT_CONFIRM_TIMEOUT_SEC) -> bool:
+        """
+        Wait until the selection reads back as data.
+
+        Args:
+            data: Content that was set
+            timeout: Give up after this many seconds
+
+        Returns:
+            True if ownership was confirmed (or readback is known to be
+            unreliable and the settle delay passed)
+        """
+        if self.readback_reliable is False:
+            time.sleep(UNCONFIRMED_SETTLE_SEC)
+            return True
+
+        started = time.perf_counter()
+        deadline = started + timeout
+        interval = POLL_INITIAL_SEC
+        while True:
+            if self.read(timeout=max(0.05, deadline - time.perf_counter())) == data:
+                self.readback_reliable = True
+                logger.debug(
+                    f"{self.selection} selection confirmed in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+                return True
+            if self._owner is not None and self._owner.poll() is not None:
+                # Owner exited: the tool failed or someone else took the selection
+                break
+            if time.perf_counter() + interval > deadline:
+                break
+            time.sleep(interval)
+            interval = min(interval * POLL_FACTOR, POLL_MAX_SEC)
+
+        if self._is_wayland and self.readback_reliable is None:
+            # wl-paste cannot read the selection without data-control support;
+            # trust the owner process from now on
+            logger.info(f"{self.selection} readback unavailable on this compositor; using a fixed settle delay")
+            self.readback_reliable = False
+            return self.owns()
+        return False
+
+    def close(self):
+        """Stop the standby process (the current owner keeps serving the selection)."""
+        with self._lock:
+            self._closed = True
+            standby, self._standby = self._standby, None
+        if standby is not None and standby.poll() is None:
+            standby.kill()
+            standby.wait()
@@ -0,0 +1,155 @@
+"""Hands-free dictation: cut continuous capture into utterances at pauses.
+
+A HandsFreeSession follows the persistent capture stream while toggle mode
+is on. Every poll it reads the whole frames captured since the last one,
+feeds them to a SpeechSegmenter and hands each finished utterance to the
+service, which transcribes and types it while the user keeps talking.
+
+While the user is silent a poll costs one small energy computation per
+20 ms frame; the model only runs for audio the segmenter accepted.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from .vad import SpeechSegment, SpeechSegmenter
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .capture_stream import CaptureStream
+
+logger = logging.getLogger(__name__)
+
+# How often new audio is taken from the capture stream
+DEFAULT_POLL_INTERVAL_MS = 30
+
+
+class HandsFreeSession:
+    """
+    Continuous VAD-gated segmentation of a capture stream.
+
+    Example:
+        >>> session = HandsFreeSession(stream, segmenter, on_segment=queue_segment)
+        >>> session.start(from_frame=stream.frame_at(press_time))
+        >>> ...  # on_segment(samples, segment) runs once per utterance
+        >>> await session.stop()  # the utterance in progress is flushed
+    """
+
+    def __init__(
+        self,
+        stream: "CaptureStream",
+        segmenter: SpeechSegmenter,
+        on_segment: Callable[["np.ndarray", SpeechSegment], Awaitable[None]],
+        poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
+    ):
+        """
+        Initialize hands-free session.
+
+        Args:
+            stream: Running capture stream
+            segmenter: Segmenter that decides where utterances start and end
+            on_segment: Async callback receiving float32 samples and the
+                segment (absolute frame indices) of each finished utterance;
+                the next poll waits for it, which applies backpressure
+            poll_interval_ms: How often new audio is read
+        """
+        self.stream = stream
+        self.segmenter = segmenter
+        self.poll_interval = poll_interval_ms / 1000.0
+        self._on_segment = on_segment
+
+        self._position = 0  # Next frame to feed to the segmenter
+        self._active = False
+        self._task: Optional[asyncio.Task] = None
+        self.segments = 0
+
+    @property
+    def is_active(self) -> bool:
+        """Check if the session is following the stream."""
+        return self._active
+
+    def start(self, from_frame: Optional[int] = None):
+        """
+        Start following the stream in the background.
+
+        Args:
+            from_frame: First frame to consider (default: the newest frame)
+        """
+        if from_frame is None:
+            from_frame = self.stream.frames_written
+        self._position = max(from_frame, self.stream.oldest_frame)
+        self.segmenter.reset()
+        self._active = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop following the stream and emit the utterance in progress."""
+        self._active = False
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def cancel(self):
+        """Stop immediately without emitting anything else."""
+        self._active = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Poll the stream until stopped, then flush the open utterance."""
+        try:
+            while self._active:
+                await asyncio.sleep(self.poll_interval)
+                await self._poll()
+
+            await self._poll()
+            segment = self.segmenter.flush(self._position)
+            if segment is not None:
+                await self._emit(segment)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Hands-free segmentation failed: {e}")
+            self._active = False
+
+    async def _poll(self):
+        """Feed the whole frames captured since the last poll to the segmenter."""
+        from .audio_buffer import pcm_to_float32
+
+        oldest = self.stream.oldest_frame
+        if self._position < oldest:
+            # The session fell further behind than the ring buffer reaches
+            logger.warning(
+                f"Hands-free audio overrun, skipped {(oldest - self._position) / self.segmenter.sample_rate:.1f} s"
+            )
+            self.segmenter.reset()
+            self._position = oldest
+
+        frame_len = self.segmenter.frame_len
+        available = (self.stream.frames_written - self._position) // frame_len * frame_len
+        if available <= 0:
+            return
+
+        start = self._position
+        samples = pcm_to_float32(self.stream.read(start, start + available))
+        self._position += available
+        for segment in self.segmenter.push(samples, start):
+            await self._emit(segment)
+
+    async def _emit(self, segment: SpeechSegment):
+        """Cut a finished utterance out of the stream and hand it over."""
+        from .audio_buffer import pcm_to_float32
+
+        start = max(segment.start, self.stream.oldest_frame)
+        frames = self.stream.read(start, segment.end)
+        if len(frames) == 0:
+            return
+        self.segments += 1
+        await self._on_segment(pcm_to_float32(frames), segment)
@@ -0,0 +1,186 @@
+"""Cost model for hybrid text injection (uinput typing vs. clipboard paste).
+
+Typing through uinput costs time per character and is only correct when the
+text's script matches the active keyboard layout. Pasting costs a roughly
+fixed overhead (set the selection, confirm it, send the paste) but handles
+any text. The planner splits text with split_text_by_script(), marks the
+segments that cannot be typed correctly, and picks the cheapest path for each
+segment. Consecutive pasted segments share one paste, so a mixed sentence is
+usually pasted whole while a short single-script phrase is typed.
+
+Both costs are learned from measurements: the per-key cost from typing
+reports (weighted by characters, so long texts dominate) and the paste
+overhead from timed pastes.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.keyboard_layout import script_matches_layout, split_text_by_script
+
+logger = logging.getLogger(__name__)
+
+METHOD_UINPUT = "uinput"
+METHOD_CLIPBOARD = "clipboard"
+
+# Initial paste overhead estimate (ms): selection set + confirm + middle click
+DEFAULT_PASTE_OVERHEAD_MS = 60.0
+
+# Weight of the initial estimates, in characters (per-key) and pastes
+PRIOR_CHARS = 40.0
+PRIOR_PASTES = 3.0
+
+# Decay applied to past observations on every new one
+DECAY = 0.9
+
+
+@dataclass
+class PlannedRun:
+    """Consecutive text injected with one method."""
+    text: str
+    method: str
+    scripts: List[str]
+    estimate_ms: float
+    actual_ms: Optional[float] = None
+
+    def __str__(self) -> str:
+        actual = f"{self.actual_ms:.0f}" if self.actual_ms is not None else "?"
+        return (
+            f"{self.method}[{len(self.text)}ch {'+'.join(self.scripts)}] "
+            f"est {self.estimate_ms:.0f} / actual {actual} ms"
+        )
+
+
+class InjectionPlanner:
+    """
+    Choose uinput or clipboard per script segment by estimated cost.
+
+    Example:
+        >>> planner = InjectionPlanner(mapper, per_key_ms=2.5)
+        >>> runs = planner.plan("Він сказав hello world", layout="ua")
+        >>> [run.method for run in runs]
+        ['clipboard']
+    """
+
+    def __init__(
+        self,
+        mapper,
+        per_key_ms: float,
+        paste_overhead_ms: float = DEFAULT_PASTE_OVERHEAD_MS,
+    ):
+        """
+        Initialize planner.
+
+        Args:
+            mapper: KeyboardLayoutMapper (decides which text uinput can type)
+            per_key_ms: Initial per-character typing cost estimate
+            paste_overhead_ms: Initial cost estimate of one paste
+        """
+        self.mapper = mapper
+        self._typing_ms = per_key_ms * PRIOR_CHARS
+        self._typing_chars = PRIOR_CHARS
+        self._paste_ms = paste_overhead_ms * PRIOR_PASTES
+        self._pastes = PRIOR_PASTES
+
+    @property
+    def per_key_ms(self) -> float:
+        """Current per-character typing cost estimate."""
+        return self._typing_ms / self._typing_chars
+
+    @property
+    def paste_overhead_ms(self) -> float:
+        """Current paste cost estimate."""
+        return self._paste_ms / self._pastes
+
+    def observe_typing(self, chars: int, elapsed_ms: float):
+        """Fold a measured uinput typing run into the per-key estimate."""
+        if chars <= 0:
+            return
+        self._typing_ms = self._typing_ms * DECAY + elapsed_ms
+        self._typing_chars = self._typing_chars * DECAY + chars
+
+    def observe_paste(self, elapsed_ms: float):
+        """Fold a measured paste into the overhead estimate."""
+        self._paste_ms = self._paste_ms * DECAY + elapsed_ms
+        self._pastes = self._pastes * DECAY + 1
+
+    def _can_type(self, text: str, script: str, layout: str) -> bool:
+        """Check if uinput would type the segment correctly."""
+        return script_matches_layout(script, layout) and self.mapper.can_type(text, layout)
+
+    def plan(self, text: str, layout: Optional[str] = None) -> List[PlannedRun]:
+        """
+        Split text into runs and choose the cheapest correct method for each.
+
+        Args:
+            text: Text to inject
+            layout: Active keyboard layout (detected if None)
+
+        Returns:
+            Runs in text order; adjacent runs use different methods
+        """
+        if not text:
+            return []
+        if layout is None:
+            layout = self.mapper.get_layout()
+
+        segments = split_text_by_script(text)
+        per_key = self.per_key_ms
+        paste = self.paste_overhead_ms
+
+        # Dynamic programming over segments with the previous method as state:
+        # typing costs per character, a paste costs its overhead once per run
+        best: Dict[Optional[str], Tuple[float, List[str]]] = {None: (0.0, [])}
+        for segment, script in segments:
+            options = {METHOD_CLIPBOARD}
+            if self._can_type(segment, script, layout):
+                options.add(METHOD_UINPUT)
+
+            step: Dict[Optional[str], Tuple[float, List[str]]] = {}
+            for method in options:
+                candidates = []
+                for previous, (cost, path) in best.items():
+                    if method == METHOD_UINPUT:
+                        added = per_key * len(segment)
+                    else:
+                        added = 0.0 if previous == METHOD_CLIPBOARD else paste
+                    candidates.append((cost + added, path + [method]))
+                step[method] = min(candidates, key=lambda c: c[0])
+            best = step
+
+        _, methods = min(best.values(), key=lambda c: c[0])
+
+        runs: List[PlannedRun] = []
+        for (segment, script), method in zip(segments, methods):
+            if runs and runs[-1].method == method:
+                runs[-1].text += segment
+                if script not in runs[-1].scripts:
+                    runs[-1].scripts.append(script)
+            else:
+                runs.append(PlannedRun(text=segment, method=method, scripts=[script], estimate_ms=0.0))
+
+        for run in runs:
+            run.estimate_ms = per_key * len(run.text) if run.method == METHOD_UINPUT else paste
+
+        return runs
+
+    def log_plan(self, runs: List[PlannedRun], layout: str):
+        """Log the chosen paths with estimated and actual cost."""
+        estimate = sum(run.estimate_ms for run in runs)
+        actual = sum(run.actual_ms for run in runs if run.actual_ms is not None)
+        logger.info(
+            f"Hybrid injection (layout {layout}): " + ", ".join(str(run) for run in runs) +
+            f" | total est {estimate:.0f} / actual {actual:.0f} ms"
+            f" (per-key {self.per_key_ms:.2f} ms, paste {self.paste_overhead_ms:.0f} ms)"
+        )
+
+
+def initial_per_key_ms(key_delay_ms: float, burst_size: int) -> float:
+    """Per-character typing cost implied by the uinput pacing settings.
+
+    A plain character is two key transition groups (press, release), and a
+    burst of burst_size groups is followed by key_delay_ms.
+    """
+    return 2 * key_delay_ms / max(1, burst_size) if key_delay_ms > 0 else 0.1
+
@@ -0,0 +1,163 @@
+"""Raw PCM audio sources for in-memory capture."""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PCMSource(ABC):
+    """
+    Base class for raw S16_LE PCM sources.
+
+    Subclasses deliver interleaved little-endian 16-bit frames through read().
+    An empty result from read() means the source has ended.
+    """
+
+    @abstractmethod
+    async def start(self):
+        """Open the source."""
+
+    @abstractmethod
+    async def read(self, max_bytes: int) -> bytes:
+        """
+        Read up to max_bytes of raw PCM.
+
+        Returns:
+            Raw bytes, or b"" at end of stream
+        """
+
+    @abstractmethod
+    async def close(self):
+        """Stop the source and release its resources."""
+
+
+class ArecordSource(PCMSource):
+    """PCM source that streams raw audio from arecord's stdout."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        audio_format: str = "S16_LE",
+    ):
+        """
+        Initialize arecord source.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            channels: Number of channels
+            audio_format: ALSA sample format (must be S16_LE for in-memory capture)
+        """
+        if audio_format != "S16_LE":
+            raise ValueError(f"In-memory capture requires S16_LE audio, got {audio_format}")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.audio_format = audio_format
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def start(self):
+        """Spawn arecord writing raw frames to a pipe."""
+        cmd = [
+            "arecord",
+            "-q",
+            "-f", self.audio_format,
+            "-r", str(self.sample_rate),
+            "-c", str(self.channels),
+            "-t", "raw",
+        ]
+
+        self._process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+    async def read(self, max_bytes: int) -> bytes:
+        """Read the next chunk of raw PCM from arecord."""
+        if self._process is None or self._process.stdout is None:
+            return b""
+        return await self._process.stdout.read(max_bytes)
+
+    async def close(self):
+        """Stop arecord gracefully, killing it if it does not exit."""
+        if self._process is None:
+            return
+
+        if self._process.returncode is None:
+            self._process.terminate()
+            try:
+                await asyncio.wait_for(self._process.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                logger.warning("arecord did not stop, killing...")
+                self._process.kill()
+                await self._process.wait()
+
+        self._process = None
+
+
+class SyntheticSource(PCMSource):
+    """
+    PCM source that produces low-level noise at real-time pace.
+
+    Stands in for a microphone in tests and benchmarks: chunks arrive every
+    period_ms like ALSA periods do, after an optional simulated device open.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        period_ms: float = 20.0,
+        open_delay_ms: float = 0.0,
+    ):
+        """
+        Initialize synthetic source.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            channels: Number of channels
+            period_ms: Interval between chunks
+            open_delay_ms: Simulated device open time in start()
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.period_ms = period_ms
+        self.open_delay_ms = open_delay_ms
+        self._period_bytes = max(1, int(sample_rate * period_ms / 1000)) * channels * 2
+        self._next_chunk: Optional[float] = None
+        self._closed = False
+        self._rng = None
+
+    async def start(self):
+        """Simulate opening the device."""
+        import numpy as np
+
+        if self.open_delay_ms > 0:
+            await asyncio.sleep(self.open_delay_ms / 1000.0)
+        self._rng = np.random.default_rng(0)
+        self._next_chunk = time.monotonic() + self.period_ms / 1000.0
+        self._closed = False
+
+    async def read(self, max_bytes: int) -> bytes:
+        """Return the next period of audio once it has been 'captured'."""
+        if self._closed or self._next_chunk is None:
+            return b""
+
+        delay = self._next_chunk - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._closed:
+            return b""
+        self._next_chunk += self.period_ms / 1000.0
+
+        frames = min(max_bytes, self._period_bytes) // 2
+        return self._rng.normal(0, 30, frames).astype("<i2").tobytes()
+
+    async def close(self):
+        """Stop producing audio."""
+        self._closed = True
@@ -1,24 +1,61 @@
 """Audio recording module."""
 
 import asyncio
+import importlib
 import logging
 import os
 import subprocess
 import tempfile
+import time
+import wave
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .audio_buffer import PCMRingBuffer
+    from .capture_stream import CaptureStream
+    from .pcm_source import PCMSource
 
 logger = logging.getLogger(__name__)
 
 
+# Size of each read from the PCM pipe (~64 ms of 16 kHz mono audio)
+PCM_READ_CHUNK_BYTES = 2048
+
+CAPTURE_MODES = ("file", "memory")
+
+# Canonical WAV header size and poll interval for first-frame detection (file mode)
+WAV_HEADER_BYTES = 44
+FILE_POLL_INTERVAL_SEC = 0.005
+
+
 class AudioRecorder:
-    """Audio recorder using arecord (ALSA)."""
+    """Audio recorder using arecord (ALSA).
+
+    Supports two capture modes:
+    - "file": arecord writes a temporary WAV file (default)
+    - "memory": raw PCM is read from arecord's stdout into a NumPy ring
+      buffer and returned as a float32 array, nothing touches the disk
+
+    In memory mode the recorder can also keep a warm capture stream open
+    between utterances. Recordings are then cut from the stream at the
+    hotkey event timestamps, extended by a pre-roll and post-roll window.
+    """
 
     def __init__(
         self,
         sample_rate: int = 16000,
         channels: int = 1,
         audio_format: str = "S16_LE",
+        capture_mode: str = "file",
+        max_duration: int = 60,
+        pcm_source_factory: Optional[Callable[[], "PCMSource"]] = None,
+        warm_capture: bool = False,
+        pre_roll_ms: int = 0,
+        post_roll_ms: int = 0,
     ):
         """
         Initialize recorder.
@@ -27,14 +64,48 @@ class AudioRecorder:
             sample_rate: Sample rate in Hz (16000 optimal for Whisper)
             channels: Number of channels (1 = mono)
             audio_format: Audio format (S16_LE = 16-bit signed little-endian)
+            capture_mode: "file" (temp WAV) or "memory" (in-memory ring buffer)
+            max_duration: Ring buffer length in seconds (memory mode)
+            pcm_source_factory: Optional callable returning a PCMSource
+                (memory mode, defaults to arecord on stdout)
+            warm_capture: Keep capturing between utterances (memory mode only)
+            pre_roll_ms: Audio kept from before the press event (warm capture)
+            post_roll_ms: Audio kept after the release event (warm capture)
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.audio_format = audio_format
+        self.capture_mode = capture_mode.lower()
+        self.max_duration = max_duration
+        self._pcm_source_factory = pcm_source_factory
         self._process: Optional[asyncio.subprocess.Process] = None
         self._audio_file: Optional[str] = None
         self._is_recording = False
 
+        # Memory mode state
+        self._source: Optional["PCMSource"] = None
+        self._buffer: Optional["PCMRingBuffer"] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._first_chunk: Optional[asyncio.Future] = None
+
+        # Warm capture state
+        self.warm_capture = warm_capture
+        self.pre_roll_frames = int(sample_rate * pre_roll_ms / 1000)
+        self.post_roll_frames = int(sample_rate * post_roll_ms / 1000)
+        self._stream: Optional["CaptureStream"] = None
+        self._utterance_start_frame = 0
+
+        # Per-utterance start cost (spawn + device open, or just gating when warm)
+        self.last_start_cost_ms: Optional[float] = None
+        self.start_costs_ms: deque = deque(maxlen=100)
+
+        if self.capture_mode not in CAPTURE_MODES:
+            raise ValueError(
+                f"Invalid capture mode '{capture_mode}'. Must be 'file' or 'memory'"
+            )
+        if self.warm_capture and self.capture_mode != "memory":
+            raise ValueError("Warm capture requires capture_mode 'memory'")
+
     @property
     def is_recording(self) -> bool:
         """Check if currently recording."""
@@ -57,6 +128,9 @@ class AudioRecorder:
 
         logger.info(f"Recording for {duration} seconds...")
 
+        if self.warm_capture:
+            return self._record_sync_from_stream(duration, output_file)
+
         try:
             cmd = [
                 "arecord",
@@ -93,20 +167,119 @@ class AudioRecorder:
             logger.error(f"Recording error: {e}")
             return None
 
-    async def start_recording(self, output_file: Optional[str] = None) -> str:
+    def record_array_sync(self, duration: int) -> Optional["np.ndarray"]:
+        """
+        Record audio synchronously into memory (memory capture mode only).
+
+        Args:
+            duration: Recording duration in seconds
+
+        Returns:
+            Samples at self.sample_rate for Transcriber.transcribe_array()
+            (int16 frames from the warm stream, float32 otherwise), or None on failure
+        """
+        if self.capture_mode != "memory":
+            raise ValueError("record_array_sync requires capture_mode 'memory'")
+
+        logger.info(f"Recording for {duration} seconds (in-memory)...")
+
+        if self.warm_capture:
+            return self._read_from_stream_sync(duration)
+
+        async def record() -> Optional["np.ndarray"]:
+            await self.start_recording()
+            await asyncio.sleep(duration)
+            return await self.stop_recording()
+
+        try:
+            return asyncio.run(record())
+        except FileNotFoundError:
+            logger.error("arecord not found. Install with: sudo apt install alsa-utils")
+            return None
+        except Exception as e:
+            logger.error(f"Recording error: {e}")
+            return None
+
+    def _read_from_stream_sync(self, duration: int) -> Optional["np.ndarray"]:
+        """Cut a fixed duration starting now out of the persistent capture worker."""
+        try:
+            self._ensure_stream()
+        except Exception as e:
+            logger.error(f"Recording error: {e}")
+            return None
+
+        start = self._stream.frame_at()
+        end = start + duration * self.sample_rate
+        self._stream.wait_for_frame(end, timeout=duration + 5)
+        frames = self._stream.read(start, end)
+
+        if len(frames) == 0:
+            logger.error("Recording failed: capture worker delivered no audio")
+            return None
+        return frames
+
+    def _record_sync_from_stream(self, duration: int, output_file: str) -> Optional[str]:
+        """Record a fixed duration from the persistent capture worker into a WAV file."""
+        frames = self._read_from_stream_sync(duration)
+        if frames is None:
+            return None
+
+        with wave.open(output_file, "wb") as wav:
+            wav.setnchannels(self.channels)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(frames.astype("<i2", copy=False).tobytes())
+
+        file_size = os.path.getsize(output_file)
+        logger.info(f"Recording complete ({file_size / 1024:.1f} KB)")
+        return output_file
+
+    async def start_recording(
+        self,
+        output_file: Optional[str] = None,
+        event_time: Optional[float] = None,
+    ) -> Optional[str]:
         """
         Start recording audio (async, non-blocking).
 
+        The time spent here is the per-utterance start cost; it is stored in
+        last_start_cost_ms and logged.
+
         Args:
-            output_file: Path to save WAV file (auto-generated if None)
+            output_file: Path to save WAV file (auto-generated if None, file mode only)
+            event_time: Timestamp of the press event (warm capture; now if None)
 
         Returns:
-            Path to audio file being recorded
+            Path to audio file being recorded, or None in memory mode
         """
+        started = time.perf_counter()
+        result = await self._start_recording(output_file, event_time)
+
+        if self._is_recording:
+            self.last_start_cost_ms = (time.perf_counter() - started) * 1000
+            self.start_costs_ms.append(self.last_start_cost_ms)
+            logger.info(f"Recording start cost: {self.last_start_cost_ms:.1f} ms")
+
+        return result
+
+    async def _start_recording(
+        self,
+        output_file: Optional[str],
+        event_time: Optional[float],
+    ) -> Optional[str]:
+        """Start recording in the configured capture mode."""
         if self._is_recording:
             logger.warning("Already recording")
             return self._audio_file
 
+        if self.warm_capture:
+            await self._start_warm_utterance(event_time)
+            return None
+
+        if self.capture_mode == "memory":
+            await self._start_memory_capture()
+            return None
+
         if output_file is None:
             fd, output_file = tempfile.mkstemp(suffix=".wav")
             os.close(fd)
@@ -132,13 +305,245 @@ class AudioRecorder:
 
         return output_file
 
-    async def stop_recording(self) -> Optional[str]:
+    async def _start_memory_capture(self):
+        """Start streaming raw PCM into a preallocated ring buffer."""
+        from .audio_buffer import PCMRingBuffer
+
+        if self._buffer is None:
+            self._buffer = PCMRingBuffer(
+                capacity_frames=self.sample_rate * self.max_duration,
+                channels=self.channels,
+            )
+        else:
+            self._buffer.clear()
+
+        self._source = self._create_pcm_source()
+
+        logger.info("Starting recording (in-memory)...")
+        self._first_chunk = asyncio.get_running_loop().create_future()
+        await self._source.start()
+        self._reader_task = asyncio.create_task(
+            self._pump_pcm(self._source, self._buffer, self._first_chunk)
+        )
+        self._is_recording = True
+
+    @staticmethod
+    async def _pump_pcm(
+        source: "PCMSource",
+        buffer: "PCMRingBuffer",
+        first_chunk: Optional[asyncio.Future] = None,
+    ):
+        """Copy PCM chunks from the source into the ring buffer until EOF.
+
+        Args:
+            source: Started PCM source
+            buffer: Ring buffer receiving the frames
+            first_chunk: Resolved with the wall-clock arrival time of the first chunk
+        """
+        try:
+            while True:
+                chunk = await source.read(PCM_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if first_chunk is not None and not first_chunk.done():
+                    first_chunk.set_result(time.time())
+                buffer.write(chunk)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"PCM capture error: {e}")
+
+    def _create_pcm_source(self) -> "PCMSource":
+        """Create the PCM source used for in-memory capture."""
+        from .pcm_source import ArecordSource
+
+        if self._pcm_source_factory is not None:
+            return self._pcm_source_factory()
+        return ArecordSource(
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            audio_format=self.audio_format,
+        )
+
+    async def open_stream(self):
+        """Prepare memory capture and start the persistent capture worker if enabled.
+
+        Without warm capture this only imports the buffer code (NumPy), so
+        the first key press does not pay for the import.
+        """
+        if self.capture_mode == "memory":
+            await asyncio.to_thread(importlib.import_module, ".audio_buffer", __package__)
+        if self.warm_capture:
+            self._ensure_stream()
+
+    def _ensure_stream(self):
+        """Create the persistent capture worker if needed and make sure it runs."""
+        from .capture_stream import CaptureStream
+
+        if self._stream is None:
+            capacity_sec = (
+                self.max_duration
+                + (self.pre_roll_frames + self.post_roll_frames) / self.sample_rate
+                + 1.0
+            )
+            self._stream = CaptureStream(
+                source_factory=self._create_pcm_source,
+                sample_rate=self.sample_rate,
+                channels=self.channels,
+                capacity_sec=capacity_sec,
+            )
+
+        self._stream.start()
+
+    def continuous_stream(self) -> "CaptureStream":
         """
-        Stop recording and return audio file path.
+        Start (or reuse) the persistent capture stream for hands-free dictation.
 
         Returns:
-            Path to recorded audio file or None if not recording
+            The running CaptureStream; stop it with close_stream() unless
+            warm capture keeps it open anyway
+
+        Raises:
+            RuntimeError: If not in memory capture mode
         """
+        if self.capture_mode != "memory":
+            raise RuntimeError("Continuous capture requires memory capture mode")
+        self._ensure_stream()
+        return self._stream
+
+    async def wait_for_first_frame(
+        self,
+        event_time: Optional[float] = None,
+        timeout: float = 2.0,
+    ) -> Optional[float]:
+        """
+        Wait until the current utterance has its first audio frame.
+
+        With warm capture that is the frame recorded at the press instant
+        (this also works between utterances, e.g. to wait for the stream to
+        come up); otherwise it is the first chunk delivered after the device
+        opened.
+
+        Args:
+            event_time: Timestamp of the press event (warm capture; now if None)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Wall-clock time the frame became available, or None if no audio
+            arrived in time (or not recording)
+        """
+        if self.warm_capture and self._stream is not None:
+            target = self._stream.frame_at(event_time) + 1
+            if await self._stream.wait_for_frame_async(target, timeout) < target:
+                return None
+            return time.time()
+
+        if not self._is_recording:
+            return None
+
+        if self.capture_mode == "memory":
+            if self._first_chunk is None:
+                return None
+            try:
+                return await asyncio.wait_for(asyncio.shield(self._first_chunk), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        # File mode: the first frame is on disk once the WAV grows past its header
+        deadline = time.monotonic() + timeout
+        while self._is_recording and time.monotonic() < deadline:
+            try:
+                if os.path.getsize(self._audio_file) > WAV_HEADER_BYTES:
+                    return time.time()
+            except (OSError, TypeError):
+                pass
+            await asyncio.sleep(FILE_POLL_INTERVAL_SEC)
+        return None
+
+    async def close_stream(self):
+        """Stop the warm capture stream."""
+        if self._stream is not None:
+            await self._stream.close_async()
+
+    def close_stream_sync(self):
+        """Stop the warm capture stream (synchronous version)."""
+        if self._stream is not None:
+            self._stream.close()
+
+    @property
+    def capture_restarts(self) -> int:
+        """Number of times the persistent capture worker restarted its source."""
+        return self._stream.restarts if self._stream is not None else 0
+
+    async def _start_warm_utterance(self, event_time: Optional[float]):
+        """Mark the start of an utterance in the warm stream."""
+        if self._stream is None or not self._stream.is_running:
+            logger.warning("Warm capture stream not running, starting it now")
+            self._ensure_stream()
+
+        start = self._stream.frame_at(event_time) - self.pre_roll_frames
+        self._utterance_start_frame = max(start, self._stream.oldest_frame)
+        self._is_recording = True
+        logger.info("Starting recording (warm stream)...")
+
+    async def _stop_warm_utterance(self, event_time: Optional[float]) -> Optional["np.ndarray"]:
+        """Cut the current utterance out of the warm stream."""
+        from .audio_buffer import pcm_to_float32
+
+        self._is_recording = False
+        end = self._stream.frame_at(event_time) + self.post_roll_frames
+        await self._stream.wait_for_frame_async(end)
+
+        frames = self._stream.read(self._utterance_start_frame, end)
+        if len(frames) == 0:
+            return None
+
+        logger.info(f"Recording stopped ({len(frames) / self.sample_rate:.2f} s from warm stream)")
+        return pcm_to_float32(frames)
+
+    async def _stop_memory_capture(self) -> Optional["np.ndarray"]:
+        """Stop the PCM source, drain the pipe and return float32 samples."""
+        from .audio_buffer import pcm_to_float32
+
+        logger.info("Stopping recording...")
+
+        # Closing the source lets the reader drain what is left in the pipe
+        await self._source.close()
+        try:
+            await asyncio.wait_for(self._reader_task, timeout=2.0)
+        except asyncio.TimeoutError:
+            logger.warning("PCM reader did not finish, cancelling...")
+            self._reader_task.cancel()
+
+        self._source = None
+        self._reader_task = None
+        self._first_chunk = None
+        self._is_recording = False
+
+        frames = self._buffer.read()
+        if len(frames) == 0:
+            return None
+
+        logger.info(f"Recording stopped ({len(frames) / self.sample_rate:.2f} s in memory)")
+        return pcm_to_float32(frames)
+
+    async def stop_recording(self, event_time: Optional[float] = None) -> Optional["str | np.ndarray"]:
+        """
+        Stop recording and return the captured audio.
+
+        Args:
+            event_time: Timestamp of the release event (warm capture; now if None)
+
+        Returns:
+            Path to recorded audio file (file mode), float32 samples
+            (memory mode), or None if not recording
+        """
+        if self._is_recording and self.warm_capture:
+            return await self._stop_warm_utterance(event_time)
+
+        if self._is_recording and self.capture_mode == "memory":
+            return await self._stop_memory_capture()
+
         if not self._is_recording or self._process is None:
             logger.warning("Not currently recording")
             return None
@@ -165,16 +570,106 @@ class AudioRecorder:
 
         return None
 
+    def snapshot(self, offset_frames: int = 0) -> Optional["np.ndarray"]:
+        """
+        Get the audio captured so far in the current utterance.
+
+        Only available while recording in memory mode; used by streaming
+        transcription to decode windows before the hotkey is released.
+
+        Args:
+            offset_frames: Skip this many frames from the utterance start
+
+        Returns:
+            float32 samples, or None if no in-memory recording is active
+        """
+        if not self._is_recording:
+            return None
+
+        from .audio_buffer import pcm_to_float32
+
+        if self.warm_capture and self._stream is not None:
+            frames = self._stream.read(self._utterance_start_frame + offset_frames)
+        elif self._buffer is not None:
+            frames = self._buffer.read(offset_frames)
+        else:
+            return None
+
+        return pcm_to_float32(frames)
+
     async def cancel_recording(self):
         """Cancel recording and delete audio file."""
         audio_file = await self.stop_recording()
-        if audio_file and os.path.exists(audio_file):
+        if isinstance(audio_file, str) and os.path.exists(audio_file):
             os.unlink(audio_file)
             logger.info("Recording cancelled and file deleted")
 
+    def duration_of(self, audio: "str | np.ndarray") -> float:
+        """
+        Get the duration of a recording in seconds.
+
+        Args:
+            audio: WAV file path or samples from stop_recording()/record_array_sync()
+
+        Returns:
+            Duration in seconds from the frame count (0.0 if the file is missing)
+        """
+        if isinstance(audio, str):
+            frames, sample_rate = wav_frame_count(audio)
+            return frames / sample_rate if sample_rate else 0.0
+        return len(audio) / self.sample_rate
+
     @staticmethod
-    def cleanup(audio_file: str):
-        """Clean up temporary audio file."""
-        if audio_file and os.path.exists(audio_file):
+    def load_samples(audio: "str | np.ndarray") -> "np.ndarray":
+        """
+        Get a recording as float32 mono samples.
+
+        Args:
+            audio: WAV file path (16-bit PCM) or samples, returned unchanged
+
+        Returns:
+            float32 samples in [-1.0, 1.0)
+        """
+        if not isinstance(audio, str):
+            return audio
+
+        import numpy as np
+
+        from .audio_buffer import pcm_to_float32
+
+        frames, _ = wav_frame_count(audio)
+        with wave.open(audio, "rb") as wav:
+            channels = wav.getnchannels()
+            data = wav.readframes(frames)
+        pcm = np.frombuffer(data, dtype="<i2")
+        return pcm_to_float32(pcm[:len(pcm) - len(pcm) % channels].reshape(-1, channels))
+
+    @staticmethod
+    def cleanup(audio_file: "str | np.ndarray | None"):
+        """Clean up temporary audio file (no-op for in-memory recordings)."""
+        if isinstance(audio_file, str) and os.path.exists(audio_file):
             os.unlink(audio_file)
             logger.debug(f"Cleaned up {audio_file}")
+
+
+def wav_frame_count(path: str) -> "tuple[int, int]":
+    """
+    Count the audio frames in a WAV file.
+
+    The header's frame count is checked against the data actually on disk:
+    a recorder that was killed can leave a placeholder (or zero) in the
+    header.
+
+    Returns:
+        (frames, sample_rate), or (0, 0) if the file is missing or not a WAV
+    """
+    try:
+        with wave.open(path, "rb") as wav:
+            frame_bytes = wav.getsampwidth() * wav.getnchannels()
+            header_frames = wav.getnframes()
+            sample_rate = wav.getframerate()
+        on_disk = max(0, os.path.getsize(path) - WAV_HEADER_BYTES) // frame_bytes
+    except (OSError, EOFError, wave.Error):
+        return 0, 0
+    frames = min(header_frames, on_disk) if header_frames else on_disk
+    return frames, sample_rate
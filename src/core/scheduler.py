@@ -0,0 +1,384 @@
+"""Dedicated transcription executor with priorities and cancellation.
+
+All model decodes of the daemon go through one TranscriptionScheduler
+instead of the event loop's shared default thread pool:
+
+- It owns its worker thread(s), so file I/O and layout lookups on the
+  default pool never queue behind a decode, and vice versa.
+- Jobs are served by priority: the final decode of a released hotkey
+  (INTERACTIVE) runs before a streaming window (STREAMING), which runs
+  before background work such as batch or re-transcription (BACKGROUND).
+  Equal priorities run in submission order.
+- Each job carries its own options (language, prompt); nothing on the shared
+  Transcriber is changed, so jobs can run concurrently.
+- A job is a generator of segments. Cancelling it takes effect before it
+  starts or between two segments; the segment being decoded is finished
+  first, because the model itself cannot be interrupted.
+- Queue depth and per-priority wait times are exported as metrics.
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .transcriber import Transcriber
+    from ..utils.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Job priorities (lower runs first)
+INTERACTIVE = 0  # Final decode of an utterance the user is waiting for
+STREAMING = 1  # Window decodes while the hotkey is held
+BACKGROUND = 2  # Batch files, re-transcription
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", STREAMING: "streaming", BACKGROUND: "background"}
+
+
+class JobCancelled(Exception):
+    """Raised by TranscriptionJob.result() when the job was cancelled."""
+
+
+@dataclass(frozen=True)
+class TranscribeOptions:
+    """Per-job decode options (None = the Transcriber's default)."""
+    language: Optional[str] = None
+    initial_prompt: Optional[str] = None
+
+
+class TranscriptionJob:
+    """
+    A queued or running decode.
+
+    The result is the list of items the job's generator produced.
+    """
+
+    def __init__(
+        self,
+        produce: Callable[[], Iterable[Any]],
+        priority: int,
+        on_item: Optional[Callable[[Any], None]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        label: str = "",
+    ):
+        self.priority = priority
+        self.label = label
+        self._produce = produce
+        self._on_item = on_item
+        self._loop = loop
+        self._cancel = threading.Event()
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancellation was requested."""
+        return self._cancel.is_set()
+
+    @property
+    def wait_ms(self) -> Optional[float]:
+        """Time spent queued before a worker picked the job up."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.submitted_at) * 1000
+
+    def cancel(self):
+        """Request cancellation (before the job starts or at the next segment boundary)."""
+        self._cancel.set()
+
+    async def result(self) -> List[Any]:
+        """
+        Wait for the job from the event loop.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        try:
+            return await asyncio.wrap_future(self.future)
+        except asyncio.CancelledError:
+            # The waiter went away; don't leave the decode running for nobody
+            self.cancel()
+            raise
+
+    def _deliver(self, item: Any):
+        """Pass one produced item to on_item (on the event loop, if the job has one)."""
+        if self._on_item is None:
+            return
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._on_item, item)
+        else:
+            self._on_item(item)
+
+    def _run(self):
+        """Run the job in a worker thread."""
+        if not self.future.set_running_or_notify_cancel():
+            return
+        items: List[Any] = []
+        try:
+            if self.cancelled:
+                raise JobCancelled(self.label)
+            iterator = iter(self._produce())
+            try:
+                for item in iterator:
+                    items.append(item)
+                    self._deliver(item)
+                    if self.cancelled:
+                        raise JobCancelled(self.label)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()  # Stops a generator mid-file
+        except BaseException as e:
+            self.future.set_exception(e)
+            return
+        self.future.set_result(items)
+
+
+class TranscriptionScheduler:
+    """
+    Priority queue of decodes served by dedicated worker threads.
+
+    Example:
+        >>> scheduler = TranscriptionScheduler(transcriber, workers=1, metrics=metrics)
+        >>> job = scheduler.submit_segments(samples, TranscribeOptions(language="uk"),
+        ...                                 on_segment=print)
+        >>> segments = await job.result()
+        >>> scheduler.shutdown()
+    """
+
+    def __init__(
+        self,
+        transcriber: "Transcriber",
+        workers: int = 1,
+        metrics: Optional["MetricsRegistry"] = None,
+    ):
+        """
+        Initialize scheduler (worker threads start with the first job).
+
+        Args:
+            transcriber: Transcriber shared by all workers
+            workers: Concurrent decodes; more than one only helps when the
+                model was loaded with a matching num_workers
+            metrics: Registry for queue depth and wait times (optional)
+        """
+        self.transcriber = transcriber
+        self.workers = max(1, workers)
+        self.metrics = metrics
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._running: set = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if metrics is not None:
+            metrics.describe("transcription_queue_depth", "Decodes waiting for a transcription worker")
+            for name in PRIORITY_NAMES.values():
+                metrics.describe(f"transcription_wait_{name}_ms", f"Queue wait of {name} decodes")
+            metrics.describe("transcription_jobs_cancelled_total", "Decodes cancelled before finishing")
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def _ensure_started(self):
+        """Start the worker threads on first use."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"transcribe-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.debug(f"Transcription scheduler started with {self.workers} worker(s)")
+
+    def submit(
+        self,
+        produce: Callable[[], Iterable[Any]],
+        priority: int = INTERACTIVE,
+        on_item: Optional[Callable[[Any], None]] = None,
+        label: str = "",
+    ) -> TranscriptionJob:
+        """
+        Queue a job.
+
+        Args:
+            produce: Called in a worker thread; returns the iterable of
+                results (normally a segment generator of the Transcriber)
+            priority: INTERACTIVE, STREAMING or BACKGROUND
+            on_item: Called with each item as it is produced; runs on the
+                submitting event loop if there is one, else in the worker
+            label: Name used in log messages
+
+        Returns:
+            TranscriptionJob
+
+        Raises:
+            RuntimeError: If the scheduler was shut down
+        """
+        if self._closed:
+            raise RuntimeError("Transcription scheduler is shut down")
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        job = TranscriptionJob(produce, priority, on_item=on_item, loop=loop, label=label)
+        job.future.add_done_callback(lambda future: self._on_done(job))
+        self._ensure_started()
+        self._queue.put((priority, next(self._sequence), job))
+        self._record(job, self._set_depth)
+        return job
+
+    def submit_segments(
+        self,
+        audio: "str | np.ndarray",
+        options: TranscribeOptions = TranscribeOptions(),
+        priority: int = INTERACTIVE,
+        sample_rate: int = 16000,
+        on_segment: Optional[Callable[[tuple], None]] = None,
+        timing: Optional[dict] = None,
+    ) -> TranscriptionJob:
+        """
+        Queue a decode of a file or in-memory samples.
+
+        Args:
+            audio: Audio file path, or mono int16/float32 samples
+            options: Language and prompt for this decode
+            priority: INTERACTIVE, STREAMING or BACKGROUND
+            sample_rate: Sample rate of in-memory samples in Hz
+            on_segment: Called with each (start_sec, end_sec, text) segment
+            timing: Optional dict filled with the model timings
+
+        Returns:
+            TranscriptionJob whose result is the list of segments
+        """
+        transcriber = self.transcriber
+
+        def produce():
+            if isinstance(audio, str):
+                return transcriber.transcribe_segments(
+                    audio,
+                    language=options.language,
+                    initial_prompt=options.initial_prompt,
+                    timing=timing,
+                )
+            return transcriber.transcribe_array_segments(
+                audio,
+                sample_rate=sample_rate,
+                language=options.language,
+                initial_prompt=options.initial_prompt,
+                timing=timing,
+            )
+
+        return self.submit(produce, priority, on_item=on_segment, label=PRIORITY_NAMES.get(priority, ""))
+
+    def submit_words(
+        self,
+        samples: "np.ndarray",
+        options: TranscribeOptions = TranscribeOptions(),
+        priority: int = STREAMING,
+        sample_rate: int = 16000,
+    ) -> TranscriptionJob:
+        """
+        Queue a word-timestamped decode of in-memory samples.
+
+        Returns:
+            TranscriptionJob whose result is one list of
+            (start_sec, end_sec, word) tuples per segment
+        """
+        return self.submit(
+            lambda: self.transcriber.transcribe_word_segments(
+                samples,
+                sample_rate=sample_rate,
+                language=options.language,
+                initial_prompt=options.initial_prompt,
+            ),
+            priority,
+            label=f"{PRIORITY_NAMES.get(priority, '')} words",
+        )
+
+    def _worker(self):
+        """Serve jobs until shut down."""
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+            job.started_at = time.perf_counter()
+            with self._lock:
+                self._running.add(job)
+            self._record(job, lambda: self._record_start(job))
+            try:
+                job._run()
+            finally:
+                with self._lock:
+                    self._running.discard(job)
+
+    def _record(self, job: TranscriptionJob, update: Callable[[], None]):
+        """Apply a metrics update on the job's event loop (the registry is not thread-safe)."""
+        if self.metrics is None or job._loop is None or job._loop.is_closed():
+            return
+        try:
+            job._loop.call_soon_threadsafe(update)
+        except RuntimeError:
+            pass  # Loop closed while shutting down
+
+    def _set_depth(self):
+        self.metrics.set_gauge("transcription_queue_depth", self.queue_depth)
+
+    def _record_start(self, job: TranscriptionJob):
+        name = PRIORITY_NAMES.get(job.priority, str(job.priority))
+        self.metrics.observe(f"transcription_wait_{name}_ms", job.wait_ms)
+        self._set_depth()
+
+    def _on_done(self, job: TranscriptionJob):
+        """Log and count cancelled jobs."""
+        if not job.future.cancelled() and not isinstance(job.future.exception(), JobCancelled):
+            return
+        logger.debug(f"Transcription job cancelled: {job.label}")
+        if self.metrics is not None:
+            self._record(job, lambda: self.metrics.inc("transcription_jobs_cancelled_total"))
+
+    def shutdown(self, wait: bool = False):
+        """
+        Cancel queued and running jobs and stop the workers.
+
+        Args:
+            wait: Join the worker threads (a running job finishes its
+                current segment first)
+        """
+        self._closed = True
+        with self._lock:
+            for job in self._running:
+                job.cancel()
+        while True:
+            try:
+                _, _, job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.cancel()
+                job._run()  # Resolves the future with JobCancelled without decoding
+        if self.metrics is not None:
+            self.metrics.set_gauge("transcription_queue_depth", 0)
+        # Sentinels sort after every real job
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._sequence), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
@@ -0,0 +1,244 @@
+"""Incremental transcription while the hotkey is held.
+
+A StreamingSession decodes the not-yet-final part of the utterance every few
+seconds while recording continues. Words are finalized with a local-agreement
+policy: a word is committed once two consecutive hypotheses agree on it, and
+the next window starts at the end of the last committed word. After release
+only the trailing, uncommitted window needs decoding, so release-to-text
+latency stays roughly constant instead of growing with utterance length.
+
+Windows are decoded as STREAMING jobs of the transcription scheduler, so the
+final decode of an earlier utterance is never stuck behind them; the tail
+decode after release is INTERACTIVE.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from .scheduler import INTERACTIVE, STREAMING, TranscribeOptions, TranscriptionJob
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .scheduler import TranscriptionScheduler
+
+logger = logging.getLogger(__name__)
+
+# (start_sec, end_sec, word) with times relative to the utterance start
+Word = Tuple[float, float, str]
+
+# Committed text passed back to the model as context (characters)
+PROMPT_CONTEXT_CHARS = 200
+
+# Windows shorter than this are not worth a decode (seconds)
+MIN_WINDOW_SEC = 1.0
+
+
+def _normalize(word: str) -> str:
+    """Normalize a word for agreement comparison."""
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class StreamingSession:
+    """
+    Streaming transcription of a single utterance.
+
+    Example:
+        >>> session = StreamingSession(scheduler, recorder.snapshot, language="uk")
+        >>> session.start()
+        >>> ...  # recording continues
+        >>> text = await session.finish(audio)
+    """
+
+    def __init__(
+        self,
+        scheduler: "TranscriptionScheduler",
+        snapshot: Callable[[int], Optional["np.ndarray"]],
+        sample_rate: int = 16000,
+        interval_sec: float = 2.0,
+        max_window_sec: float = 15.0,
+        language: Optional[str] = None,
+    ):
+        """
+        Initialize streaming session.
+
+        Args:
+            scheduler: Scheduler that runs the window and tail decodes
+            snapshot: Callable(offset_frames) returning float32 audio recorded
+                so far, starting offset_frames into the utterance
+            sample_rate: Sample rate of the snapshot audio in Hz
+            interval_sec: How often a new window is decoded
+            max_window_sec: Force-commit words once the uncommitted window
+                grows beyond this length
+            language: Language for all decodes of this utterance
+        """
+        self.scheduler = scheduler
+        self.sample_rate = sample_rate
+        self.interval_sec = interval_sec
+        self.max_window_sec = max_window_sec
+        self.language = language
+        self._snapshot = snapshot
+
+        self._committed: List[Word] = []
+        self._committed_frames = 0
+        self._previous: List[Word] = []
+
+        self._active = False
+        self._decoding = False
+        self._job: Optional[TranscriptionJob] = None  # Window being decoded
+        self._task: Optional[asyncio.Task] = None
+        self.windows_decoded = 0
+
+    @property
+    def committed_text(self) -> str:
+        """Text finalized so far."""
+        return "".join(word for _, _, word in self._committed).strip()
+
+    @property
+    def committed_sec(self) -> float:
+        """Audio covered by committed text, in seconds."""
+        return self._committed_frames / self.sample_rate
+
+    def start(self):
+        """Start decoding windows in the background."""
+        self._active = True
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Decode a new window every interval while recording is active."""
+        try:
+            while self._active:
+                await asyncio.sleep(self.interval_sec)
+                if not self._active:
+                    break
+
+                audio = self._snapshot(self._committed_frames)
+                if audio is None or len(audio) < MIN_WINDOW_SEC * self.sample_rate:
+                    continue
+
+                offset_sec = self.committed_sec
+                self._decoding = True
+                try:
+                    started = time.perf_counter()
+                    words = await self._decode_window(audio)
+                    logger.debug(
+                        f"Streaming window {offset_sec:.1f}s+{len(audio) / self.sample_rate:.1f}s "
+                        f"decoded in {time.perf_counter() - started:.2f}s"
+                    )
+                finally:
+                    self._decoding = False
+                    self._job = None
+
+                self.windows_decoded += 1
+                self._commit(
+                    [(offset_sec + s, offset_sec + e, w) for s, e, w in words],
+                    window_end_sec=offset_sec + len(audio) / self.sample_rate,
+                )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Streaming transcription error: {e}")
+
+    async def _decode_window(self, audio: "np.ndarray") -> List[Word]:
+        """Decode one window with the committed text as context."""
+        prompt = self.committed_text[-PROMPT_CONTEXT_CHARS:] or None
+        self._job = self.scheduler.submit_words(
+            audio,
+            TranscribeOptions(language=self.language, initial_prompt=prompt),
+            priority=STREAMING,
+            sample_rate=self.sample_rate,
+        )
+        segments = await self._job.result()
+        return [word for segment in segments for word in segment]
+
+    def _commit(self, hypothesis: List[Word], window_end_sec: float):
+        """Apply the local-agreement policy to a new hypothesis."""
+        agreed = 0
+        for previous, current in zip(self._previous, hypothesis):
+            if _normalize(previous[2]) != _normalize(current[2]):
+                break
+            agreed += 1
+
+        # Overlap policy: a window that never stabilizes is force-committed,
+        # keeping only the last interval open for revision
+        window_sec = window_end_sec - self.committed_sec
+        if window_sec > self.max_window_sec:
+            cutoff = window_end_sec - self.interval_sec
+            forced = sum(1 for word in hypothesis if word[1] <= cutoff)
+            if forced > agreed:
+                logger.debug(f"Force-committing {forced - agreed} words after {window_sec:.1f}s window")
+                agreed = forced
+
+        if agreed:
+            self._committed.extend(hypothesis[:agreed])
+            self._committed_frames = int(hypothesis[agreed - 1][1] * self.sample_rate)
+            logger.debug(f"Committed up to {self.committed_sec:.2f}s: {self.committed_text[-60:]!r}")
+
+        self._previous = hypothesis[agreed:]
+
+    def stop(self):
+        """Stop decoding new windows (on release; finish() later decodes the tail)."""
+        self._active = False
+
+    async def finish(self, audio: Optional["np.ndarray"]) -> str:
+        """
+        Stop streaming and decode the trailing, uncommitted audio.
+
+        Args:
+            audio: Complete utterance samples from the recorder
+
+        Returns:
+            Full transcribed text
+        """
+        self._active = False
+        if self._task is not None:
+            if self._decoding:
+                # Let the in-flight window land; its words shorten the tail
+                await self._task
+            else:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+
+        committed = self.committed_text
+        tail = audio[self._committed_frames:] if audio is not None else None
+        tail_text = ""
+
+        if tail is not None and len(tail) >= 0.1 * self.sample_rate:
+            prompt = committed[-PROMPT_CONTEXT_CHARS:] or None
+            self._job = self.scheduler.submit_segments(
+                tail,
+                TranscribeOptions(language=self.language, initial_prompt=prompt),
+                priority=INTERACTIVE,
+                sample_rate=self.sample_rate,
+            )
+            try:
+                segments = await self._job.result()
+            finally:
+                self._job = None
+            tail_text = " ".join(text for _, _, text in segments if text)
+
+        logger.info(
+            f"Streaming: {self.committed_sec:.1f}s committed in {self.windows_decoded} windows, "
+            f"{(len(tail) if tail is not None else 0) / self.sample_rate:.1f}s decoded after release"
+        )
+        return " ".join(part for part in (committed, tail_text.strip()) if part)
+
+    async def cancel(self):
+        """Stop streaming without decoding the tail (an in-flight decode stops at its next segment)."""
+        self._active = False
+        if self._job is not None:
+            self._job.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
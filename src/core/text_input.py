@@ -2,7 +2,7 @@
 """Text input using python-uinput or clipboard-based paste.
 
 This module provides a unified interface for typing text on both X11 and Wayland
-using two modes:
+using three modes:
 
 1. **uinput mode**: Uses python-uinput for direct keycode injection (kernel level)
    - Works on both X11 and Wayland
@@ -14,6 +14,11 @@ using two modes:
    - Better for mixed-script text (e.g., "Він сказав hello")
    - Requires wl-clipboard package on Wayland or xclip package on X11
 
+3. **hybrid mode**: Chooses uinput or clipboard per script segment
+   - A cost model (see injection_planner) types short text that matches the
+     layout and pastes long or mixed-script text
+   - Same requirements as clipboard mode
+
 Requirements:
     - User must be in 'input' group
     - /dev/uinput must be accessible
@@ -26,12 +31,16 @@ import logging
 import os
 import re
 import shutil
-import subprocess
+import threading
 import time
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 from evdev import ecodes
+from .clipboard_owner import SelectionOwner
+from .injection_planner import METHOD_UINPUT, InjectionPlanner, initial_per_key_ms
+from .keystroke_engine import TypingReport
 from .uinput_keyboard import UInputKeyboard
+from ..utils.keyboard_layout import get_keyboard_mapper
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +48,10 @@ logger = logging.getLogger(__name__)
 class TextInput:
     """Text input using python-uinput or clipboard-based paste.
 
-    Supports two modes:
+    Supports three modes:
     - "uinput": Direct keycode injection (default)
     - "clipboard": Copy to clipboard and emulate paste key
+    - "hybrid": Per-segment choice between the two by estimated cost
 
     Example:
         >>> text_input = TextInput(mode="clipboard", paste_key="shift+insert")
@@ -52,59 +62,63 @@ class TextInput:
         self,
         display_server: Optional[str] = None,
         key_delay_ms: int = 10,
+        typing_burst_size: int = 8,
         mode: str = "uinput",
         paste_key_combination: str = "shift+insert",
-        pre_paste_delay_ms: int = 0
+        pre_paste_delay_ms: int = 0,
+        restore_selection_after_ms: int = 500,
+        defer_setup: bool = False,
+        uinput_device=None,
     ):
         """Initialize text input handler.
 
         Args:
             display_server: Ignored (kept for API compatibility).
-            key_delay_ms: Delay between key events in milliseconds.
-            mode: Input mode - "uinput" or "clipboard".
+            key_delay_ms: Delay between key events in milliseconds (between
+                bursts of key events when typing text).
+            typing_burst_size: Key transitions written per burst in uinput typing.
+            mode: Input mode - "uinput", "clipboard" or "hybrid".
             paste_key_combination: Key combination for clipboard paste (e.g., "shift+insert").
             pre_paste_delay_ms: Delay before pasting (gives time to restore window focus).
+            restore_selection_after_ms: Restore the previous selection this long after
+                pasting (clipboard mode). 0 leaves the pasted text in the selection.
+            defer_setup: Skip device setup here; call setup_async() before typing.
+            uinput_device: Event sink used instead of /dev/uinput (see UInputKeyboard).
 
         Raises:
             RuntimeError: If uinput is not accessible.
             ValueError: If mode is invalid or clipboard mode requirements not met.
         """
         self.key_delay_ms = key_delay_ms
+        self.typing_burst_size = typing_burst_size
         self.mode = mode.lower()
         self.paste_key_combination = paste_key_combination
         self.pre_paste_delay_ms = pre_paste_delay_ms
+        self.restore_selection_after_ms = restore_selection_after_ms
+        self.uinput_device = uinput_device
         self._uinput_keyboard: Optional[UInputKeyboard] = None
+        self._planner: Optional[InjectionPlanner] = None  # hybrid mode
+        self._typing_reports: List[TypingReport] = []  # uinput typing reports of the current call
+        self._selection_owners: Dict[str, SelectionOwner] = {}
+        # Pending background restores: selection -> (timer, previous content)
+        self._pending_restores: Dict[str, Tuple[threading.Timer, bytes]] = {}
         self.tool = f"python-uinput ({self.mode} mode)"
 
         # Validate mode
-        if self.mode not in ("uinput", "clipboard"):
-            raise ValueError(f"Invalid mode '{self.mode}'. Must be 'uinput' or 'clipboard'")
+        if self.mode not in ("uinput", "clipboard", "hybrid"):
+            raise ValueError(f"Invalid mode '{self.mode}'. Must be 'uinput', 'clipboard' or 'hybrid'")
 
         # Detect display server (for logging only)
         self.display_server = os.environ.get("XDG_SESSION_TYPE", "x11").lower()
         logger.info(f"Display server: {self.display_server}")
 
-        # Check clipboard mode requirements
-        if self.mode == "clipboard":
-            self._validate_clipboard_mode()
-
-        # Check uinput availability
-        if not self._is_uinput_available():
-            raise RuntimeError(
-                "python-uinput not available. "
-                "Ensure user is in 'input' group and /dev/uinput is accessible. "
-                "Run: sudo usermod -aG input $USER && logout/login"
-            )
+        if not defer_setup:
+            # Check clipboard mode requirements
+            if self.uses_clipboard:
+                self._validate_clipboard_mode()
 
-        # Initialize uinput keyboard
-        self._init_uinput()
-
-        # Log clipboard backend info
-        if self.mode == "clipboard":
-            clipboard_tool = "wl-clipboard" if self.display_server == "wayland" else "xclip"
-            logger.info(f"Using python-uinput in {self.mode} mode with {clipboard_tool} ({self.display_server})")
-        else:
-            logger.info(f"Using python-uinput in {self.mode} mode")
+            self._setup_uinput()
+            self._log_backend()
 
         # Special command mapping: word -> key code
         # These are voice commands that trigger key presses instead of typing
@@ -120,6 +134,44 @@ class TextInput:
             # "BACKSPACE": ecodes.KEY_BACKSPACE,
         }
 
+    async def setup_async(self):
+        """Validate the clipboard tool and create the uinput device concurrently.
+
+        Used with defer_setup=True so device setup overlaps other startup work.
+
+        Raises:
+            RuntimeError: If uinput or the clipboard tool is not available.
+        """
+        jobs = [asyncio.to_thread(self._setup_uinput)]
+        if self.uses_clipboard:
+            jobs.append(asyncio.to_thread(self._validate_clipboard_mode))
+        await asyncio.gather(*jobs)
+        self._log_backend()
+
+    def _setup_uinput(self):
+        """Check uinput availability and create the virtual keyboard."""
+        if self.uinput_device is None and not self._is_uinput_available():
+            raise RuntimeError(
+                "python-uinput not available. "
+                "Ensure user is in 'input' group and /dev/uinput is accessible. "
+                "Run: sudo usermod -aG input $USER && logout/login"
+            )
+
+        self._init_uinput()
+
+    @property
+    def uses_clipboard(self) -> bool:
+        """Check if the mode pastes through the clipboard (clipboard or hybrid)."""
+        return self.mode in ("clipboard", "hybrid")
+
+    def _log_backend(self):
+        """Log the active typing backend."""
+        if self.uses_clipboard:
+            clipboard_tool = "wl-clipboard" if self.display_server == "wayland" else "xclip"
+            logger.info(f"Using python-uinput in {self.mode} mode with {clipboard_tool} ({self.display_server})")
+        else:
+            logger.info(f"Using python-uinput in {self.mode} mode")
+
     def _is_uinput_available(self) -> bool:
         """Check if uinput is accessible."""
         return os.path.exists('/dev/uinput') and os.access('/dev/uinput', os.W_OK)
@@ -127,8 +179,17 @@ class TextInput:
     def _init_uinput(self):
         """Initialize python-uinput keyboard."""
         try:
-            self._uinput_keyboard = UInputKeyboard(key_delay_ms=self.key_delay_ms)
+            self._uinput_keyboard = UInputKeyboard(
+                key_delay_ms=self.key_delay_ms,
+                burst_size=self.typing_burst_size,
+                device=self.uinput_device,
+            )
             logger.info("Python uinput keyboard initialized successfully")
+            if self.mode == "hybrid":
+                self._planner = InjectionPlanner(
+                    get_keyboard_mapper(),
+                    per_key_ms=initial_per_key_ms(self.key_delay_ms, self.typing_burst_size),
+                )
         except Exception as e:
             logger.error(f"Failed to initialize python-uinput: {e}")
             raise RuntimeError(f"Failed to initialize python-uinput: {e}") from e
@@ -156,6 +217,9 @@ class TextInput:
                 )
             logger.info("Clipboard mode validated: xclip available (X11)")
 
+        # Start the PRIMARY owner process now so the first paste doesn't pay for it
+        self._selection_owner(primary=True).prespawn()
+
     def _parse_paste_key_combination(self) -> list:
         """Parse paste key combination string into evdev key codes.
 
@@ -245,6 +309,14 @@ class TextInput:
 
         logger.debug("Emulated middle-click to paste from PRIMARY selection")
 
+    def _selection_owner(self, primary: bool) -> SelectionOwner:
+        """Get the owner helper for PRIMARY or CLIPBOARD."""
+        selection = "primary" if primary else "clipboard"
+        owner = self._selection_owners.get(selection)
+        if owner is None:
+            owner = self._selection_owners[selection] = SelectionOwner(self.display_server, selection)
+        return owner
+
     def _clipboard_get(self, primary: bool = False) -> bytes:
         """Get current clipboard contents.
 
@@ -254,37 +326,14 @@ class TextInput:
         Returns:
             Clipboard contents as bytes, or empty bytes if clipboard is empty/unavailable.
         """
-        try:
-            selection = "primary" if primary else "clipboard"
-            if self.display_server == "wayland":
-                # Wayland: use wl-paste with --primary flag
-                cmd = ["wl-paste", "--primary"] if primary else ["wl-paste"]
-            else:
-                # X11: use xclip with -selection flag
-                cmd = ["xclip", "-selection", selection, "-o"]
-
-            logger.debug(f"Reading {selection} selection with: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=1.0,
-                check=False
-            )
-
-            if result.returncode != 0:
-                logger.debug(f"xclip read failed with exit code {result.returncode}")
-                if result.stderr:
-                    stderr_text = result.stderr.decode('utf-8', errors='replace')
-                    logger.debug(f"xclip read stderr: {stderr_text}")
-
-            return result.stdout if result.returncode == 0 else b""
-        except Exception as e:
-            logger.debug(f"Could not read clipboard: {e}")
-            return b""
+        return self._selection_owner(primary).read()
 
     def _clipboard_set(self, text: str, primary: bool = False) -> bool:
         """Set clipboard contents.
 
+        The text is handed to a pre-spawned wl-copy/xclip (see SelectionOwner),
+        which keeps serving it until another client takes the selection.
+
         Args:
             text: Text to copy to clipboard.
             primary: If True, use PRIMARY selection instead of CLIPBOARD.
@@ -293,103 +342,62 @@ class TextInput:
             True if successful, False otherwise.
         """
         try:
-            # Use PRIMARY selection to avoid clipboard history managers
-            # Most clipboard managers only track CLIPBOARD, not PRIMARY
-            if self.display_server == "wayland":
-                # Wayland: use wl-copy with --primary flag
-                selection = "primary" if primary else "clipboard"
-                cmd = ["wl-copy", "--primary"] if primary else ["wl-copy"]
-
-                # Log Wayland environment for debugging
-                wayland_display = os.environ.get('WAYLAND_DISPLAY', 'NOT SET')
-                xdg_runtime = os.environ.get('XDG_RUNTIME_DIR', 'NOT SET')
-                logger.info(f"Wayland environment: WAYLAND_DISPLAY={wayland_display}, XDG_RUNTIME_DIR={xdg_runtime}")
-
-                try:
-                    # Spawn wl-copy and send to background (don't wait for it)
-                    # wl-copy needs to stay running to maintain selection ownership
-                    logger.info(f"Spawning wl-copy for {selection} selection: {' '.join(cmd)}")
-                    proc = subprocess.Popen(
-                        cmd,
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        start_new_session=True  # Detach from parent process group
-                    )
-
-                    # Write data to stdin and close (non-blocking)
-                    try:
-                        proc.stdin.write(text.encode('utf-8'))
-                        proc.stdin.close()
-                    except Exception as e:
-                        logger.error(f"Failed to write to wl-copy stdin: {e}")
-                        proc.kill()
-                        return False
+            return self._selection_owner(primary).set(text.encode('utf-8'))
+        except Exception as e:
+            logger.error(f"Failed to set clipboard: {e}")
+            return False
 
-                    # Don't wait or poll on Wayland; wl-copy ownership timing varies
-                    logger.info(f"wl-copy spawned for {selection} selection (PID: {proc.pid})")
+    async def _set_selection(self, text: str, primary: bool) -> bool:
+        """Set a selection and wait until it is confirmed to serve the text."""
+        owner = self._selection_owner(primary)
+        if not await asyncio.to_thread(self._clipboard_set, text, primary):
+            return False
+        return await asyncio.to_thread(owner.confirm, text.encode('utf-8'))
 
-                except Exception as e:
-                    logger.error(f"wl-copy error: {e}")
-                    return False
-            else:
-                # X11: use xclip with -selection flag
-                selection = "primary" if primary else "clipboard"
-
-                # Log X11 environment for debugging
-                display = os.environ.get('DISPLAY', 'NOT SET')
-                xauth = os.environ.get('XAUTHORITY', 'NOT SET')
-                logger.info(f"X11 environment: DISPLAY={display}, XAUTHORITY={xauth}")
-
-                # Quick test: can we run xclip at all?
-                try:
-                    test_result = subprocess.run(
-                        ["xclip", "-version"],
-                        capture_output=True,
-                        timeout=0.5,
-                        check=False
-                    )
-                    logger.debug(f"xclip -version returned: {test_result.returncode}")
-                except Exception as e:
-                    logger.warning(f"xclip -version test failed: {e}")
-
-                # Use xclip to set selection
-                # Use Popen and don't wait - like running "echo text | xclip &" in bash
-                cmd = ["xclip", "-selection", selection, "-i"]
-
-                try:
-                    # Spawn xclip and send to background (don't wait for it)
-                    proc = subprocess.Popen(
-                        cmd,
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                        start_new_session=True  # Detach from parent process group
-                    )
-
-                    # Write data to stdin and close (non-blocking)
-                    try:
-                        proc.stdin.write(text.encode('utf-8'))
-                        proc.stdin.flush()
-                        proc.stdin.close()
-                    except Exception as e:
-                        logger.error(f"Failed to write to xclip stdin: {e}")
-                        proc.kill()
-                        return False
+    async def _remember_selection(self, primary: bool) -> bytes:
+        """Content to restore after pasting (empty if restoring is disabled)."""
+        if self.restore_selection_after_ms <= 0:
+            return b""
 
-                    # Give xclip time to fork and become selection owner
-                    # Don't wait for process to exit - it's running in background
-                    time.sleep(0.15)
-                    logger.debug(f"xclip spawned for {selection} selection (PID may have changed after fork)")
+        selection = "primary" if primary else "clipboard"
+        pending = self._pending_restores.pop(selection, None)
+        if pending is not None:
+            # The selection still holds our previous paste; keep the user's original content
+            timer, previous = pending
+            timer.cancel()
+            return previous
 
-                except Exception as e:
-                    logger.error(f"xclip error: {e}")
-                    return False
+        return await asyncio.to_thread(self._clipboard_get, primary)
 
-            return True
-        except Exception as e:
-            logger.error(f"Failed to set clipboard: {e}")
-            return False
+    def _schedule_restore(self, primary: bool, previous: bytes):
+        """Restore a selection in the background once the paste has been served."""
+        if self.restore_selection_after_ms <= 0 or not previous:
+            return
+
+        selection = "primary" if primary else "clipboard"
+        timer = threading.Timer(
+            self.restore_selection_after_ms / 1000.0,
+            self._restore_selection,
+            args=(primary, previous),
+        )
+        timer.daemon = True
+        self._pending_restores[selection] = (timer, previous)
+        timer.start()
+
+    def _restore_selection(self, primary: bool, previous: bytes):
+        """Hand the previous content back to the selection (timer thread)."""
+        selection = "primary" if primary else "clipboard"
+        pending = self._pending_restores.get(selection)
+        if pending is None or pending[1] is not previous:
+            return  # Superseded by a newer paste
+        del self._pending_restores[selection]
+
+        owner = self._selection_owner(primary)
+        if not owner.owns():
+            logger.debug(f"{selection} selection changed since pasting; not restoring")
+            return
+        if owner.set(previous):
+            logger.debug(f"Restored previous {selection} selection ({len(previous)} bytes)")
 
     def _parse_special_commands(self, text: str) -> List[Tuple[str, str]]:
         """Parse text for special command words and split into segments.
@@ -519,7 +527,12 @@ class TextInput:
 
         logger.debug(f"Pressed key: {keycode}")
 
-    async def process_and_type_with_commands(self, text: str, auto_switch_layout: bool = True) -> bool:
+    async def process_and_type_with_commands(
+        self,
+        text: str,
+        auto_switch_layout: bool = True,
+        timing: Optional[Dict[str, float]] = None,
+    ) -> bool:
         """Type text with special command recognition.
 
         This is the main entry point for command-aware text input. It:
@@ -530,6 +543,8 @@ class TextInput:
         Args:
             text: Transcribed text that may contain special commands.
             auto_switch_layout: Ignored (kept for API compatibility).
+            timing: Optional dict that receives command_parse_ms, typing_ms and
+                (uinput mode) pacing_error_ms, the worst keystroke burst lateness.
 
         Returns:
             bool: True if successful, False on error.
@@ -550,9 +565,24 @@ class TextInput:
             return True
 
         # Parse text into command segments
+        started = time.perf_counter()
         segments = self._parse_special_commands(text)
+        parsed = time.perf_counter()
         logger.debug(f"Parsed {len(segments)} segments: {segments}")
+        if timing is not None:
+            timing["command_parse_ms"] = (parsed - started) * 1000
 
+        self._typing_reports = []
+        try:
+            return await self._run_command_segments(segments, auto_switch_layout)
+        finally:
+            if timing is not None:
+                timing["typing_ms"] = (time.perf_counter() - parsed) * 1000
+                if self._typing_reports:
+                    timing["pacing_error_ms"] = max(r.pacing_error_max_ms for r in self._typing_reports)
+
+    async def _run_command_segments(self, segments: List[Tuple[str, str]], auto_switch_layout: bool) -> bool:
+        """Type text segments and press command keys in order."""
         try:
             for action_type, content in segments:
                 if action_type == "text":
@@ -632,6 +662,7 @@ class TextInput:
 
         Uses PRIMARY selection to avoid polluting clipboard history.
         Most clipboard managers only track CLIPBOARD, not PRIMARY.
+        The selection's previous content is restored in the background.
 
         Args:
             text: Text to type.
@@ -642,100 +673,83 @@ class TextInput:
         try:
             logger.debug(f"Setting PRIMARY selection to: {repr(text[:100])}...")
 
-            # Copy text to PRIMARY selection
-            if self._clipboard_set(text, primary=True):
-                # Wayland primary readback can be unreliable with wl-copy ownership;
-                # skip verification and paste immediately.
-                if self.display_server == "wayland":
-                    await asyncio.sleep(0.05)
-
-                    # Pre-paste delay: gives user time to restore window focus
-                    if self.pre_paste_delay_ms > 0:
-                        logger.info(f"Waiting {self.pre_paste_delay_ms}ms before pasting (gives time to restore focus)...")
-                        await asyncio.sleep(self.pre_paste_delay_ms / 1000.0)
-
-                    await self._emulate_middle_click()
-                    logger.info("Text pasted successfully via PRIMARY selection (middle-click)")
-                    await asyncio.sleep(0.05)
-                    return True
-
-                # Delay to ensure clipboard tool has registered as PRIMARY owner
-                # X11 xclip needs time to become selection owner
-                await asyncio.sleep(0.2)
-
-                # Verify PRIMARY was set correctly
-                readback = self._clipboard_get(primary=True).decode('utf-8', errors='replace')
-                if readback != text:
-                    logger.warning("PRIMARY verification failed!")
-                    logger.warning(f"Expected: {repr(text[:100])}")
-                    logger.warning(f"Got: {repr(readback[:100])}")
-                    logger.warning("Retrying with longer delay...")
-
-                    # Retry with longer delay
-                    await asyncio.sleep(0.15)
-                    readback = self._clipboard_get(primary=True).decode('utf-8', errors='replace')
-
-                if readback == text:
-                    logger.debug("PRIMARY verified successfully")
-
-                    # Give applications time to register the PRIMARY selection change
-                    # Some apps (terminals, etc.) need time to notice the selection changed
-                    await asyncio.sleep(0.1)
-
-                    # Pre-paste delay: gives user time to restore window focus
-                    if self.pre_paste_delay_ms > 0:
-                        logger.info(f"Waiting {self.pre_paste_delay_ms}ms before pasting (gives time to restore focus)...")
-                        await asyncio.sleep(self.pre_paste_delay_ms / 1000.0)
-
-                    # Emulate middle-click to paste from PRIMARY selection
-                    await self._emulate_middle_click()
-
-                    logger.info("Text pasted successfully via PRIMARY selection (middle-click)")
-                    await asyncio.sleep(0.05)
-                    return True
-
-                logger.warning("PRIMARY still incorrect after retry - falling back to CLIPBOARD")
-            else:
-                logger.warning("Failed to set PRIMARY selection - falling back to CLIPBOARD")
+            # Copy text to PRIMARY selection, paste once the owner serves it
+            previous = await self._remember_selection(primary=True)
+            if await self._set_selection(text, primary=True):
+                await self._pre_paste_delay()
+
+                # Emulate middle-click to paste from PRIMARY selection
+                await self._emulate_middle_click()
+                logger.info("Text pasted successfully via PRIMARY selection (middle-click)")
+                self._schedule_restore(True, previous)
+                return True
+
+            logger.warning("PRIMARY selection not confirmed - falling back to CLIPBOARD")
+            self._schedule_restore(True, previous)
 
             # Fallback to CLIPBOARD selection + paste key combination
             logger.debug(f"Setting CLIPBOARD selection to: {repr(text[:100])}...")
-            if not self._clipboard_set(text, primary=False):
-                logger.error("Failed to set CLIPBOARD selection")
-                return False
+            previous = await self._remember_selection(primary=False)
+            if not await self._set_selection(text, primary=False):
+                logger.error("CLIPBOARD selection not confirmed - falling back to uinput typing")
+                self._schedule_restore(False, previous)
+                return await self._type_text_uinput_fallback(text)
 
-            if self.display_server != "wayland":
-                await asyncio.sleep(0.2)
-                readback = self._clipboard_get(primary=False).decode('utf-8', errors='replace')
-                if readback != text:
-                    logger.warning("CLIPBOARD verification failed!")
-                    logger.warning(f"Expected: {repr(text[:100])}")
-                    logger.warning(f"Got: {repr(readback[:100])}")
-                    logger.warning("Retrying with longer delay...")
-                    await asyncio.sleep(0.15)
-                    readback = self._clipboard_get(primary=False).decode('utf-8', errors='replace')
-                    if readback != text:
-                        logger.error("CLIPBOARD still incorrect after retry - falling back to uinput typing")
-                        return await self._type_text_uinput_fallback(text)
-                logger.debug("CLIPBOARD verified successfully")
-
-            await asyncio.sleep(0.1)
-
-            # Pre-paste delay: gives user time to restore window focus
-            if self.pre_paste_delay_ms > 0:
-                logger.info(f"Waiting {self.pre_paste_delay_ms}ms before pasting (gives time to restore focus)...")
-                await asyncio.sleep(self.pre_paste_delay_ms / 1000.0)
+            await self._pre_paste_delay()
 
             # Use paste key combination for CLIPBOARD
             await self._emulate_paste_key()
             logger.info("Text pasted successfully via CLIPBOARD (paste key)")
-            await asyncio.sleep(0.05)
+            self._schedule_restore(False, previous)
             return True
 
         except Exception as e:
             logger.error(f"Failed to type text via clipboard: {e}")
             return await self._type_text_uinput_fallback(text)
 
+    async def _pre_paste_delay(self):
+        """Pre-paste delay: gives user time to restore window focus."""
+        if self.pre_paste_delay_ms > 0:
+            logger.info(f"Waiting {self.pre_paste_delay_ms}ms before pasting (gives time to restore focus)...")
+            await asyncio.sleep(self.pre_paste_delay_ms / 1000.0)
+
+    async def _type_text_hybrid(self, text: str) -> bool:
+        """Type text choosing uinput or clipboard per segment (hybrid mode).
+
+        Args:
+            text: Text to type.
+
+        Returns:
+            bool: True if successful, False on error.
+        """
+        layout = self._planner.mapper.get_layout()
+        runs = self._planner.plan(text, layout)
+
+        success = True
+        try:
+            for run in runs:
+                started = time.perf_counter()
+                if run.method == METHOD_UINPUT:
+                    report = await self._uinput_keyboard.type_text(run.text, layout)
+                    run.actual_ms = (time.perf_counter() - started) * 1000
+                    if report is not None:
+                        self._typing_reports.append(report)
+                        self._planner.observe_typing(report.chars, report.elapsed_sec * 1000)
+                else:
+                    ok = await self._type_text_clipboard(run.text)
+                    run.actual_ms = (time.perf_counter() - started) * 1000
+                    if not ok:
+                        success = False
+                        break
+                    self._planner.observe_paste(run.actual_ms)
+        except Exception as e:
+            logger.error(f"Failed to type text: {e}")
+            success = False
+        finally:
+            self._planner.log_plan(runs, layout)
+
+        return success
+
     async def _type_text_uinput_fallback(self, text: str) -> bool:
         if self._uinput_keyboard is None:
             logger.error("Cannot fall back to uinput typing: uinput device not initialized")
@@ -772,10 +786,14 @@ class TextInput:
         # Route to appropriate method based on mode
         if self.mode == "clipboard":
             return await self._type_text_clipboard(text)
+        elif self.mode == "hybrid":
+            return await self._type_text_hybrid(text)
         else:  # uinput mode
             try:
-                await self._uinput_keyboard.type_text(text)
-                logger.info("Text typing completed successfully with python-uinput")
+                report = await self._uinput_keyboard.type_text(text)
+                if report is not None:
+                    self._typing_reports.append(report)
+                logger.info(f"Text typing completed successfully with python-uinput: {report}")
                 return True
             except Exception as e:
                 logger.error(f"Failed to type text: {e}")
@@ -805,10 +823,12 @@ class TextInput:
         if self.mode == "clipboard":
             # Run async clipboard method in sync context
             return asyncio.run(self._type_text_clipboard(text))
+        elif self.mode == "hybrid":
+            return asyncio.run(self._type_text_hybrid(text))
         else:  # uinput mode
             try:
-                self._uinput_keyboard.type_text_sync(text)
-                logger.debug("Text typing completed successfully (sync)")
+                report = self._uinput_keyboard.type_text_sync(text)
+                logger.debug(f"Text typing completed successfully (sync): {report}")
                 return True
             except Exception as e:
                 logger.error(f"Failed to type text: {e}")
@@ -819,6 +839,12 @@ class TextInput:
 
         Should be called when done using TextInput to release resources.
         """
+        for timer, _ in self._pending_restores.values():
+            timer.cancel()
+        self._pending_restores.clear()
+        for owner in self._selection_owners.values():
+            owner.close()
+
         if self._uinput_keyboard is not None:
             self._uinput_keyboard.close()
             self._uinput_keyboard = None
@@ -844,6 +870,105 @@ class TextInput:
         self.close()
 
 
+class CommandTextStream:
+    """
+    Type text that arrives in pieces (transcription segments) as it arrives.
+
+    The result is the same as typing the joined pieces in one
+    process_and_type_with_commands() call: pieces are joined with a space,
+    voice commands are recognized across piece boundaries and trailing
+    dots/ellipsis are dropped at the end. Trailing dots of a piece are held
+    back until the next piece shows they are not the end of the text.
+
+    Example:
+        >>> stream = CommandTextStream(text_input)
+        >>> await stream.feed("First sentence.")  # types "First sentence"
+        >>> await stream.feed("Second ENTER")     # types ". Second", presses Enter
+    """
+
+    # Stripped from the end of the text (layout-dependent punctuation)
+    TRAILING = " .…"
+
+    def __init__(self, text_input: TextInput, prefix: str = ""):
+        """
+        Initialize stream.
+
+        Args:
+            text_input: TextInput used for typing
+            prefix: Typed before the first piece (e.g. a separating space)
+        """
+        self.text_input = text_input
+        self.prefix = prefix
+        self.text = ""  # Pieces joined so far
+        self.timing: Dict[str, float] = {}  # command_parse_ms, typing_ms, pacing_error_ms (summed/max)
+        self._typed: List = []  # Units already executed: characters and ("key", command) tuples
+
+    @property
+    def typed_anything(self) -> bool:
+        """Check if any text or key has been typed."""
+        return bool(self._typed)
+
+    def _units(self, text: str) -> List:
+        """Flatten parsed command segments into characters and key units."""
+        units: List = []
+        for kind, content in self.text_input._parse_special_commands(text):
+            if kind == "text":
+                units.extend(content)
+            else:
+                units.append((kind, content))
+        return units
+
+    async def feed(self, piece: str) -> bool:
+        """
+        Add a piece and type everything that can no longer change.
+
+        Returns:
+            False if typing failed
+        """
+        piece = piece.strip()
+        if not piece:
+            return True
+        self.text = f"{self.text} {piece}" if self.text else piece
+
+        started = time.perf_counter()
+        stable = (self.prefix + self.text).rstrip(self.TRAILING)
+        units = self._units(stable) if stable else []
+        if units[:len(self._typed)] != self._typed:
+            # Not expected: earlier output can only be extended by later pieces
+            logger.debug("Streamed text diverged from what was typed, continuing after it")
+        new_units = units[len(self._typed):]
+        self._add_timing("command_parse_ms", (time.perf_counter() - started) * 1000)
+        if not new_units:
+            return True
+
+        # Regroup the new units into the text/key segments the typing code expects
+        segments: List[Tuple[str, str]] = []
+        for unit in new_units:
+            if isinstance(unit, tuple):
+                segments.append(unit)
+            elif segments and segments[-1][0] == "text":
+                segments[-1] = ("text", segments[-1][1] + unit)
+            else:
+                segments.append(("text", unit))
+
+        started = time.perf_counter()
+        self.text_input._typing_reports = []
+        try:
+            success = await self.text_input._run_command_segments(segments, True)
+        finally:
+            self._add_timing("typing_ms", (time.perf_counter() - started) * 1000)
+            reports = self.text_input._typing_reports
+            if reports:
+                worst = max(r.pacing_error_max_ms for r in reports)
+                self.timing["pacing_error_ms"] = max(worst, self.timing.get("pacing_error_ms", 0.0))
+        self._typed.extend(new_units)
+        return success
+
+    def _add_timing(self, stage: str, ms: float):
+        """Accumulate a stage over all pieces."""
+        self.timing[stage] = self.timing.get(stage, 0.0) + ms
+
+
 async def test_text_input():
     """Test function for TextInput abstraction.
 
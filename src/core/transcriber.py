@@ -1,11 +1,43 @@
 """Whisper transcription module."""
 
 import logging
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Length of the synthetic utterance used for warm-up (seconds)
+WARMUP_UTTERANCE_SEC = 2.0
+
+
+def _synthetic_utterance(duration_sec: float = WARMUP_UTTERANCE_SEC) -> "np.ndarray":
+    """
+    Generate a deterministic speech-like signal for model warm-up.
+
+    A harmonic voice source with vibrato is shaped into ~4 Hz syllables and
+    padded with silence, so the VAD sees both speech-like and silent regions.
+
+    Returns:
+        16 kHz mono float32 samples
+    """
+    import numpy as np
+
+    rate = 16000
+    t = np.arange(int(duration_sec * rate), dtype=np.float32) / rate
+    f0 = 140.0 + 15.0 * np.sin(2 * np.pi * 3.0 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 11))
+    syllables = np.sin(np.pi * 4.0 * t) ** 2
+    noise = np.random.default_rng(0).normal(0.0, 0.01, len(t))
+
+    audio = (0.3 * voice * syllables / 3.0 + noise).astype(np.float32)
+    pad = np.zeros(rate // 4, dtype=np.float32)
+    return np.concatenate((pad, audio, pad))
+
 
 class Transcriber:
     """Wrapper for Whisper speech recognition model."""
@@ -21,6 +53,8 @@ class Transcriber:
         initial_prompt: str = "",
         local_model_path: str | None = None,
         download_if_missing: bool = True,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
     ):
         """
         Initialize transcriber.
@@ -35,6 +69,9 @@ class Transcriber:
             initial_prompt: Optional prompt to guide transcription
             local_model_path: Optional local path to model directory; skips network if present
             download_if_missing: Download model to local path if not found
+            cpu_threads: CTranslate2 threads per decode (0 = library default)
+            num_workers: Decodes that can run in parallel on this model when
+                it is called from several threads
         """
         self.model_name = model
         self.device = device
@@ -45,6 +82,8 @@ class Transcriber:
         self.initial_prompt = initial_prompt if initial_prompt else None
         self.local_model_path = Path(local_model_path).expanduser() if local_model_path else None
         self.download_if_missing = download_if_missing
+        self.cpu_threads = cpu_threads
+        self.num_workers = max(1, num_workers)
         self._model = None
 
     def _repo_id_for_download(self) -> str:
@@ -145,6 +184,8 @@ class Transcriber:
                 model_source,
                 device=self.device,
                 compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
             )
             logger.info("Model loaded successfully")
             return self._model
@@ -156,48 +197,271 @@ class Transcriber:
             logger.error(f"Failed to load model: {e}")
             raise
 
-    def transcribe(self, audio_file: str | Path) -> str:
+    def warmup(self, runs: int = 2) -> List[float]:
         """
-        Transcribe audio file to text.
+        Run a synthetic utterance through the full decode path.
+
+        load_model() only constructs the model; CTranslate2 allocates its
+        decode buffers and faster-whisper loads the Silero VAD model on the
+        first transcription. Warming up moves that cost to startup.
 
         Args:
-            audio_file: Path to WAV audio file
+            runs: Number of decodes (the first is the cold path)
 
         Returns:
-            Transcribed text
+            Wall time of each decode in milliseconds
         """
         model = self.load_model()
-        audio_path = str(audio_file)
-
-        logger.info(f"Transcribing {audio_path}...")
+        audio = _synthetic_utterance()
 
-        try:
-            segments, info = model.transcribe(
-                audio_path,
+        timings = []
+        for _ in range(max(1, runs)):
+            started = time.perf_counter()
+            segments, _ = model.transcribe(
+                audio,
                 language=self.language,
                 beam_size=self.beam_size,
                 vad_filter=self.vad_filter,
                 initial_prompt=self.initial_prompt,
             )
+            decoded = list(segments)  # Segments are decoded lazily
+            if not decoded and self.vad_filter:
+                # VAD rejected the synthetic audio; still exercise the decoder
+                segments, _ = model.transcribe(
+                    audio,
+                    language=self.language,
+                    beam_size=self.beam_size,
+                    vad_filter=False,
+                )
+                list(segments)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        if len(timings) > 1:
+            logger.info(f"Model warm-up: cold path {timings[0]:.0f} ms, warm path {timings[-1]:.0f} ms")
+        else:
+            logger.info(f"Model warm-up: cold path {timings[0]:.0f} ms")
+        return timings
+
+    def transcribe(
+        self,
+        audio_file: "str | Path | np.ndarray",
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+        timing: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """
+        Transcribe audio to text.
+
+        Args:
+            audio_file: Path to WAV audio file, or 16 kHz mono float32 samples
+                (passed straight to the model without decoding)
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+            timing: Optional dict that receives model_prepare_ms (VAD, features,
+                language detection), model_decode_ms, audio_sec and speech_sec
+
+        Returns:
+            Transcribed text
+        """
+        try:
+            text_parts = [
+                text for _, _, text in self.transcribe_segments(
+                    audio_file, language=language, initial_prompt=initial_prompt, timing=timing
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            return ""
+
+        full_text = " ".join(text_parts)
+        logger.debug(f"Transcribed text: {full_text[:100]}...")
+        return full_text
+
+    def transcribe_segments(
+        self,
+        audio_file: "str | Path | np.ndarray",
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+        timing: Optional[Dict[str, float]] = None,
+    ) -> Iterator[Tuple[float, float, str]]:
+        """
+        Transcribe audio, yielding each segment as soon as it is decoded.
 
-            # Collect all segments
-            text_parts = []
-            for segment in segments:
-                text_parts.append(segment.text.strip())
+        faster-whisper decodes lazily, so the first segment is available
+        while later ones are still being decoded.
 
-            full_text = " ".join(text_parts)
+        Args:
+            audio_file: Path to WAV audio file, or 16 kHz mono float32 samples
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+            timing: Optional dict that receives model_prepare_ms and
+                first_segment_ms as they happen, and model_decode_ms, audio_sec
+                and speech_sec once all segments are decoded
+
+        Yields:
+            (start_sec, end_sec, text) for each segment, in order
+        """
+        model = self.load_model()
 
-            logger.info(
-                f"Detected language: {info.language} ({info.language_probability:.1%})"
-            )
-            logger.debug(f"Transcribed text: {full_text[:100]}...")
+        if isinstance(audio_file, (str, Path)):
+            audio = str(audio_file)
+            logger.info(f"Transcribing {audio}...")
+        else:
+            audio = audio_file
+            logger.info(f"Transcribing {len(audio) / 16000:.2f} s of in-memory audio...")
+
+        started = time.perf_counter()
+        segments, info = model.transcribe(
+            audio,
+            language=language or self.language,
+            beam_size=self.beam_size,
+            vad_filter=self.vad_filter,
+            initial_prompt=initial_prompt or self.initial_prompt,
+        )
+        prepared = time.perf_counter()
+        if timing is not None:
+            timing["model_prepare_ms"] = (prepared - started) * 1000
+        logger.info(f"Detected language: {info.language} ({info.language_probability:.1%})")
+
+        # Encoding and decoding happen lazily while iterating
+        for segment in segments:
+            if timing is not None and "first_segment_ms" not in timing:
+                timing["first_segment_ms"] = (time.perf_counter() - started) * 1000
+            yield segment.start, segment.end, segment.text.strip()
+
+        if timing is not None:
+            timing["model_decode_ms"] = (time.perf_counter() - prepared) * 1000
+            timing["audio_sec"] = info.duration
+            timing["speech_sec"] = getattr(info, "duration_after_vad", info.duration)
+
+    def transcribe_array(
+        self,
+        samples: "np.ndarray | memoryview | bytes",
+        sample_rate: int = 16000,
+        channels: int = 1,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+        timing: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """
+        Transcribe an in-memory PCM buffer.
+
+        Args:
+            samples: int16 or float32 audio (ndarray, memoryview, or raw S16_LE bytes)
+            sample_rate: Sample rate of the buffer in Hz
+            channels: Number of interleaved channels in the buffer
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+            timing: Optional dict that receives stage timings (see transcribe())
+
+        Returns:
+            Transcribed text
+        """
+        from .audio_buffer import to_whisper_input
+
+        audio = to_whisper_input(samples, sample_rate, channels)
+        return self.transcribe(audio, language=language, initial_prompt=initial_prompt, timing=timing)
+
+    def transcribe_array_segments(
+        self,
+        samples: "np.ndarray | memoryview | bytes",
+        sample_rate: int = 16000,
+        channels: int = 1,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+        timing: Optional[Dict[str, float]] = None,
+    ) -> Iterator[Tuple[float, float, str]]:
+        """
+        Transcribe an in-memory PCM buffer, yielding segments as they are decoded.
+
+        Args:
+            samples: int16 or float32 audio (ndarray, memoryview, or raw S16_LE bytes)
+            sample_rate: Sample rate of the buffer in Hz
+            channels: Number of interleaved channels in the buffer
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+            timing: Optional dict that receives stage timings (see transcribe_segments())
+
+        Yields:
+            (start_sec, end_sec, text) for each segment, in order
+        """
+        from .audio_buffer import to_whisper_input
+
+        audio = to_whisper_input(samples, sample_rate, channels)
+        yield from self.transcribe_segments(
+            audio, language=language, initial_prompt=initial_prompt, timing=timing
+        )
+
+    def transcribe_words(
+        self,
+        samples: "np.ndarray | memoryview | bytes",
+        sample_rate: int = 16000,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+    ) -> List[Tuple[float, float, str]]:
+        """
+        Transcribe an in-memory buffer and return word-level timestamps.
 
-            return full_text
+        Used by streaming transcription to decide which words are stable.
+
+        Args:
+            samples: Mono int16 or float32 audio
+            sample_rate: Sample rate of the buffer in Hz
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+
+        Returns:
+            List of (start_sec, end_sec, word) tuples; words keep their
+            leading whitespace as produced by the model
+        """
+        try:
+            words = []
+            for segment_words in self.transcribe_word_segments(
+                samples, sample_rate=sample_rate, language=language, initial_prompt=initial_prompt
+            ):
+                words.extend(segment_words)
+            return words
 
         except Exception as e:
             logger.error(f"Transcription error: {e}")
-            return ""
+            return []
 
-    def transcribe_sync(self, audio_file: str | Path) -> str:
+    def transcribe_word_segments(
+        self,
+        samples: "np.ndarray | memoryview | bytes",
+        sample_rate: int = 16000,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+    ) -> Iterator[List[Tuple[float, float, str]]]:
+        """
+        Transcribe an in-memory buffer, yielding the timed words of each segment.
+
+        Args:
+            samples: Mono int16 or float32 audio
+            sample_rate: Sample rate of the buffer in Hz
+            language: Language override for this call (None = self.language)
+            initial_prompt: Prompt override for this call (None = self.initial_prompt)
+
+        Yields:
+            (start_sec, end_sec, word) tuples of one segment, in order
+        """
+        from .audio_buffer import to_whisper_input
+
+        model = self.load_model()
+        audio = to_whisper_input(samples, sample_rate)
+
+        segments, _ = model.transcribe(
+            audio,
+            language=language or self.language,
+            beam_size=self.beam_size,
+            vad_filter=self.vad_filter,
+            initial_prompt=initial_prompt or self.initial_prompt,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+        )
+        for segment in segments:
+            yield [(word.start, word.end, word.word) for word in segment.words or []]
+
+    def transcribe_sync(self, audio_file: "str | Path | np.ndarray") -> str:
         """Synchronous transcription (alias for transcribe)."""
         return self.transcribe(audio_file)
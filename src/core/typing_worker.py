@@ -0,0 +1,228 @@
+"""Dedicated typing thread with a deadline-based pacing clock.
+
+Keystroke bursts used to be paced with asyncio.sleep() on the event loop
+that also runs the evdev readers, so any loop stall turned into typing
+stutter. The TypingWorker owns a single thread that writes bursts at
+absolute monotonic deadlines (start + n * interval): it sleeps until just
+before each deadline and spins the last stretch, so sleep overshoot and
+scheduler jitter do not accumulate. Jobs are queued and can be cancelled
+while waiting or between bursts; each finished job reports how far its
+bursts landed from their deadlines.
+
+The asyncio side only submits jobs and awaits their futures:
+
+    job = worker.submit(bursts, interval_sec=0.01)
+    stats = await asyncio.wrap_future(job.future)
+"""
+
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sleep until this close to a deadline, then spin. time.sleep() overshoots by
+# the kernel timer slack (~50-100 µs idle, more under load); the spin absorbs it.
+DEFAULT_SPIN_THRESHOLD_MS = 1.0
+
+
+@dataclass
+class PacingStats:
+    """Outcome of one typing job."""
+    bursts: int  # Bursts written (fewer than planned if cancelled)
+    elapsed_sec: float
+    error_mean_ms: float = 0.0  # Mean lateness of bursts relative to their deadlines
+    error_max_ms: float = 0.0
+    cancelled: bool = False
+
+
+class TypingJob:
+    """A queued sequence of bursts, resolved through a concurrent future."""
+
+    def __init__(self, bursts: List[bytes], interval_sec: float, release: bytes = b""):
+        """
+        Initialize job.
+
+        Args:
+            bursts: Write buffers, emitted one per deadline
+            interval_sec: Time between consecutive bursts
+            release: Written if the job is cancelled part-way (releases held keys)
+        """
+        self.bursts = bursts
+        self.interval_sec = max(0.0, interval_sec)
+        self.release = release
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancellation was requested."""
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Cancel the job: drop it if still queued, stop it after the current burst if running."""
+        self._cancel.set()
+        self.future.cancel()  # Only succeeds while the job is still queued
+
+
+class TypingWorker:
+    """
+    Thread that writes queued keystroke bursts at exact intervals.
+
+    Example:
+        >>> worker = TypingWorker(write=lambda data: os.write(fd, data))
+        >>> job = worker.submit(bursts, interval_sec=0.01)
+        >>> job.future.result().error_max_ms
+        0.04
+        >>> worker.stop()
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], None],
+        spin_threshold_ms: float = DEFAULT_SPIN_THRESHOLD_MS,
+    ):
+        """
+        Initialize worker (the thread starts on the first submit).
+
+        Args:
+            write: Callable that writes one burst to the device
+            spin_threshold_ms: Busy-wait window before each deadline
+        """
+        self._write = write
+        self.spin_threshold_sec = max(0.0, spin_threshold_ms) / 1000.0
+        self._queue: "queue.Queue[Optional[TypingJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._current: Optional[TypingJob] = None
+
+        # Totals across jobs
+        self.jobs_completed = 0
+        self.jobs_cancelled = 0
+        self.max_error_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Check if the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, bursts: List[bytes], interval_sec: float, release: bytes = b"") -> TypingJob:
+        """
+        Queue bursts for emission.
+
+        Args:
+            bursts: Write buffers, emitted one per deadline
+            interval_sec: Time between consecutive bursts
+            release: Written if the job is cancelled part-way
+
+        Returns:
+            TypingJob whose future resolves to PacingStats
+        """
+        job = TypingJob(bursts, interval_sec, release)
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="typing-worker", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        return job
+
+    def cancel_all(self):
+        """Cancel queued jobs and the one being typed."""
+        current = self._current
+        if current is not None:
+            current.cancel()
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # Keep the stop sentinel for the worker thread
+                self._queue.put(None)
+                break
+            job.cancel()
+
+    def stop(self, timeout: float = 1.0):
+        """Cancel pending work and stop the thread."""
+        self.cancel_all()
+        if self.running:
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Worker thread main loop."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                self.jobs_cancelled += 1
+                continue
+
+            self._current = job
+            try:
+                stats = self._emit(job)
+            except BaseException as e:
+                job.future.set_exception(e)
+                continue
+            finally:
+                self._current = None
+
+            if stats.cancelled:
+                self.jobs_cancelled += 1
+            else:
+                self.jobs_completed += 1
+            self.max_error_ms = max(self.max_error_ms, stats.error_max_ms)
+            job.future.set_result(stats)
+
+    def _emit(self, job: TypingJob) -> PacingStats:
+        """Write a job's bursts on their deadlines."""
+        started = time.perf_counter()
+        deadline = started
+        errors: List[float] = []
+        written = 0
+
+        for index, burst in enumerate(job.bursts):
+            if index:
+                deadline += job.interval_sec
+                self._sleep_until(deadline, job)
+
+            if job.cancelled:
+                if job.release:
+                    self._write(job.release)
+                logger.debug(f"Typing job cancelled after {written}/{len(job.bursts)} bursts")
+                break
+
+            now = time.perf_counter()
+            if index:
+                lateness = now - deadline
+                errors.append(lateness)
+                if lateness > job.interval_sec:
+                    # Fell behind by more than a slot (e.g. process suspended):
+                    # re-anchor rather than firing the missed bursts back to back
+                    deadline = now
+
+            self._write(burst)
+            written += 1
+
+        return PacingStats(
+            bursts=written,
+            elapsed_sec=time.perf_counter() - started,
+            error_mean_ms=(sum(errors) / len(errors) * 1000) if errors else 0.0,
+            error_max_ms=max(errors) * 1000 if errors else 0.0,
+            cancelled=job.cancelled,
+        )
+
+    def _sleep_until(self, deadline: float, job: TypingJob):
+        """Sleep to just before a deadline, then spin until it passes."""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_threshold_sec:
+            # Wakes early on cancellation
+            job._cancel.wait(remaining - self.spin_threshold_sec)
+        while time.perf_counter() < deadline and not job.cancelled:
+            time.sleep(0)  # Yield the GIL while spinning
@@ -10,7 +10,8 @@ Key Features:
 - Full Unicode support (Ukrainian Cyrillic, English, etc.)
 - Layout-aware character mapping
 - Async and sync typing interfaces
-- Configurable key delay for reliability
+- Batched event emission with configurable pacing (see keystroke_engine)
+- Keystrokes paced on a dedicated thread, independent of the event loop
 - No clipboard modification (pure keyboard events)
 
 Requirements:
@@ -33,11 +34,11 @@ Unsupported:
 
 import asyncio
 import logging
-import time
 from typing import Optional
 from evdev import UInput, ecodes
 
 from ..utils.keyboard_layout import get_keyboard_mapper, KeyboardLayoutMapper
+from .keystroke_engine import DEFAULT_BURST_SIZE, KeystrokeEngine, TypingReport
 
 logger = logging.getLogger(__name__)
 
@@ -55,13 +56,23 @@ class UInputKeyboard:
         >>> keyboard.close()
     """
 
-    def __init__(self, key_delay_ms: int = 10):
+    def __init__(
+        self,
+        key_delay_ms: int = 10,
+        burst_size: int = DEFAULT_BURST_SIZE,
+        device: Optional[UInput] = None,
+    ):
         """Initialize virtual keyboard device.
 
         Args:
-            key_delay_ms: Delay in milliseconds between key events.
+            key_delay_ms: Delay in milliseconds between bursts of key events.
                 Higher values = slower typing but more reliable.
                 Default: 10ms (reasonable for most systems).
+            burst_size: Key transition groups (each ending in one SYN) written
+                per burst. 1 = one key event per delay (slowest, most compatible).
+            device: Event sink to write to instead of a new uinput device
+                (anything with write(type, code, value), syn() and close(),
+                e.g. the replay harness's in-memory sink).
 
         Raises:
             PermissionError: If user lacks access to /dev/uinput.
@@ -70,11 +81,23 @@ class UInputKeyboard:
         """
         self.key_delay_ms = key_delay_ms
         self.key_delay_sec = key_delay_ms / 1000.0
-        self._device: Optional[UInput] = None
+        self._device: Optional[UInput] = device
         self._mapper: KeyboardLayoutMapper = get_keyboard_mapper()
 
         # Initialize the virtual keyboard device
-        self._init_device()
+        if self._device is None:
+            self._init_device()
+        self._engine = KeystrokeEngine(
+            self._device,
+            self._mapper,
+            burst_size=burst_size,
+            burst_interval_ms=key_delay_ms,
+        )
+
+    @property
+    def last_report(self) -> Optional[TypingReport]:
+        """Statistics of the most recent type_text()/type_text_sync() call."""
+        return self._engine.last_report
 
     def _init_device(self):
         """Create the uinput virtual keyboard device.
@@ -170,105 +193,55 @@ class UInputKeyboard:
         # Synchronize the event
         self._device.syn()
 
-    def _type_char_sync(self, char: str, layout: Optional[str] = None):
-        """Type a single character synchronously.
-
-        Args:
-            char: Single character to type.
-            layout: Optional layout override. If None, uses detected layout.
-        """
-        # Get keycode and modifiers for this character
-        keycode, modifiers = self._mapper.get_keycode_for_char(char, layout)
-
-        # Press modifier keys first
-        for mod in modifiers:
-            self._send_key_event(mod, press=True)
-            time.sleep(self.key_delay_sec)
-
-        # Press main key
-        self._send_key_event(keycode, press=True)
-        time.sleep(self.key_delay_sec)
-
-        # Release main key
-        self._send_key_event(keycode, press=False)
-        time.sleep(self.key_delay_sec)
-
-        # Release modifier keys in reverse order
-        for mod in reversed(modifiers):
-            self._send_key_event(mod, press=False)
-            time.sleep(self.key_delay_sec)
-
-    async def _type_char_async(self, char: str, layout: Optional[str] = None):
-        """Type a single character asynchronously.
-
-        Args:
-            char: Single character to type.
-            layout: Optional layout override. If None, uses detected layout.
-        """
-        # Get keycode and modifiers for this character
-        keycode, modifiers = self._mapper.get_keycode_for_char(char, layout)
-
-        # Press modifier keys first
-        for mod in modifiers:
-            self._send_key_event(mod, press=True)
-            await asyncio.sleep(self.key_delay_sec)
-
-        # Press main key
-        self._send_key_event(keycode, press=True)
-        await asyncio.sleep(self.key_delay_sec)
-
-        # Release main key
-        self._send_key_event(keycode, press=False)
-        await asyncio.sleep(self.key_delay_sec)
-
-        # Release modifier keys in reverse order
-        for mod in reversed(modifiers):
-            self._send_key_event(mod, press=False)
-            await asyncio.sleep(self.key_delay_sec)
-
-    def type_text_sync(self, text: str, layout: Optional[str] = None):
+    def type_text_sync(self, text: str, layout: Optional[str] = None) -> Optional[TypingReport]:
         """Type text synchronously (blocking).
 
         Args:
             text: Text to type. May contain newlines and tabs.
-            layout: Optional layout override. If None, auto-detects layout
-                for each character.
+            layout: Optional layout override. If None, uses the layout
+                detected when typing starts.
+
+        Returns:
+            TypingReport with the achieved rate, or None for empty text.
 
         Example:
             >>> keyboard = UInputKeyboard()
             >>> keyboard.type_text_sync("Hello, world!")
         """
         if not text:
-            return
+            return None
 
         logger.debug(f"Typing text (sync): {repr(text[:50])}...")
 
-        for char in text:
-            self._type_char_sync(char, layout)
+        report = self._engine.type_text_sync(text, layout)
 
-        logger.debug("Text typing completed (sync)")
+        logger.debug(f"Text typing completed (sync): {report}")
+        return report
 
-    async def type_text(self, text: str, layout: Optional[str] = None):
+    async def type_text(self, text: str, layout: Optional[str] = None) -> Optional[TypingReport]:
         """Type text asynchronously (non-blocking).
 
         Args:
             text: Text to type. May contain newlines and tabs.
-            layout: Optional layout override. If None, auto-detects layout
-                for each character.
+            layout: Optional layout override. If None, uses the layout
+                detected when typing starts.
+
+        Returns:
+            TypingReport with the achieved rate, or None for empty text.
 
         Example:
             >>> keyboard = UInputKeyboard()
             >>> await keyboard.type_text("Hello, світ!")
         """
         if not text:
-            return
+            return None
 
         logger.debug(f"Typing text (async): {repr(text[:50])}...")
 
-        for char in text:
-            await self._type_char_async(char, layout)
+        report = await self._engine.type_text(text, layout)
 
-        logger.debug("Text typing completed (async)")
+        logger.debug(f"Text typing completed (async): {report}")
+        return report
 
     def close(self):
         """Close and cleanup the virtual keyboard device.
@@ -276,6 +249,9 @@ class UInputKeyboard:
         This should be called when done using the keyboard to properly
         release system resources.
         """
+        engine = getattr(self, "_engine", None)
+        if engine is not None:
+            engine.close()
         if self._device is not None:
             self._device.close()
             self._device = None
@@ -0,0 +1,285 @@
+"""Energy-based endpointing for captured utterances.
+
+Everything between press and release used to go to the model, including
+the silence before the user starts speaking and after they stop (plus
+pre-roll and post-roll with warm capture). EnergyVAD finds where speech
+starts and ends from per-frame RMS energy, computed for the whole clip at
+once with NumPy, so the ends can be trimmed before the model runs and
+clips without any speech skip the model entirely.
+
+A frame counts as voiced when its energy is above both an absolute floor
+and the clip's own noise level (a low percentile of frame energies) plus a
+margin. Speech starts at the first run of min_speech_ms voiced frames and
+ends after the last one; padding is kept on both sides so soft word onsets
+and endings survive.
+
+SpeechSegmenter applies the same rules to a live stream for hands-free
+dictation: it is fed a few frames at a time and closes an utterance once
+speech has paused for pause_ms. Its noise level is the same low percentile,
+taken over the last few seconds of the stream, so it follows the background
+up as well as down (a fan turning on becomes the new floor within seconds
+instead of one endless utterance).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Analysis frame length
+FRAME_MS = 20
+
+# Percentile of frame energies taken as the clip's noise level
+NOISE_PERCENTILE = 10
+
+# Voiced frames must be this far above the noise level (dB)
+NOISE_MARGIN_DB = 10.0
+
+# Stream history the running noise level is taken from (hands-free)
+NOISE_WINDOW_SEC = 3.0
+
+# Frames at the start of a stream only calibrate the noise level (hands-free)
+NOISE_CALIBRATION_MS = 200
+
+# Keeps log10 finite for digital silence
+_EPSILON = 1e-10
+
+
+@dataclass
+class SpeechBounds:
+    """Where speech was found in a clip (sample indices, end exclusive)."""
+    start: int
+    end: int
+    total: int  # Samples in the clip
+    sample_rate: int
+
+    @property
+    def is_silent(self) -> bool:
+        """Check if no speech was found."""
+        return self.end <= self.start
+
+    @property
+    def speech_sec(self) -> float:
+        """Length of the kept audio in seconds."""
+        return max(0, self.end - self.start) / self.sample_rate
+
+    @property
+    def trimmed_sec(self) -> float:
+        """Length of the audio trimmed away in seconds."""
+        return (self.total - max(0, self.end - self.start)) / self.sample_rate
+
+
+class EnergyVAD:
+    """
+    Find the speech region of a clip from frame energies.
+
+    Example:
+        >>> vad = EnergyVAD(sample_rate=16000)
+        >>> bounds = vad.detect(samples)  # float32 mono
+        >>> speech = samples[bounds.start:bounds.end]
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        threshold_db: float = -45.0,
+        min_speech_ms: int = 100,
+        padding_ms: int = 250,
+    ):
+        """
+        Initialize VAD.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            threshold_db: Minimum frame energy (dBFS) that can count as speech
+            min_speech_ms: Shortest run of voiced frames that counts as speech
+            padding_ms: Audio kept before the first and after the last speech frame
+        """
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.frame_len = max(1, int(sample_rate * FRAME_MS / 1000))
+        self.min_speech_frames = max(1, round(min_speech_ms / FRAME_MS))
+        self.padding = int(sample_rate * padding_ms / 1000)
+
+    def frame_energy_db(self, samples: np.ndarray) -> np.ndarray:
+        """
+        RMS energy of each full frame in dBFS.
+
+        Args:
+            samples: float32 mono samples in [-1.0, 1.0)
+
+        Returns:
+            One value per frame (a trailing partial frame is ignored)
+        """
+        n_frames = len(samples) // self.frame_len
+        frames = np.asarray(samples[:n_frames * self.frame_len], dtype=np.float32)
+        frames = frames.reshape(n_frames, self.frame_len)
+        power = np.einsum("ij,ij->i", frames, frames) / self.frame_len
+        return 10.0 * np.log10(power + _EPSILON)
+
+    def detect(self, samples: np.ndarray) -> SpeechBounds:
+        """
+        Find the first and last speech in a clip.
+
+        Args:
+            samples: float32 mono samples in [-1.0, 1.0)
+
+        Returns:
+            SpeechBounds (start == end when the clip is silent)
+        """
+        total = len(samples)
+        energy = self.frame_energy_db(samples)
+        if len(energy) < self.min_speech_frames:
+            return SpeechBounds(0, 0, total, self.sample_rate)
+
+        threshold = max(self.threshold_db, np.percentile(energy, NOISE_PERCENTILE) + NOISE_MARGIN_DB)
+        voiced = (energy > threshold).astype(np.int32)
+
+        # Frames that start a run of min_speech_frames voiced frames
+        runs = np.convolve(voiced, np.ones(self.min_speech_frames, dtype=np.int32), mode="valid")
+        starts = np.flatnonzero(runs == self.min_speech_frames)
+        if len(starts) == 0:
+            return SpeechBounds(0, 0, total, self.sample_rate)
+
+        start = max(0, int(starts[0]) * self.frame_len - self.padding)
+        end = min(total, (int(starts[-1]) + self.min_speech_frames) * self.frame_len + self.padding)
+        return SpeechBounds(start, end, total, self.sample_rate)
+
+
+@dataclass
+class SpeechSegment:
+    """One utterance cut from a stream (absolute sample indices, end exclusive)."""
+    start: int
+    end: int
+    speech_end: int  # End of the last voiced frame (before padding)
+
+
+class SpeechSegmenter(EnergyVAD):
+    """
+    Cut continuous audio into utterances at pauses.
+
+    Example:
+        >>> segmenter = SpeechSegmenter(sample_rate=16000, pause_ms=700)
+        >>> for segment in segmenter.push(block, position):  # whole frames
+        ...     queue(samples[segment.start:segment.end])
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        threshold_db: float = -45.0,
+        min_speech_ms: int = 100,
+        padding_ms: int = 250,
+        pause_ms: int = 700,
+        max_segment_sec: float = 30.0,
+    ):
+        """
+        Initialize segmenter.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            threshold_db: Minimum frame energy (dBFS) that can count as speech
+            min_speech_ms: Shortest run of voiced frames that starts an utterance
+            padding_ms: Audio kept before and after the speech of each utterance
+            pause_ms: Silence that ends an utterance
+            max_segment_sec: Utterances are cut here even without a pause
+        """
+        super().__init__(sample_rate, threshold_db, min_speech_ms, padding_ms)
+        self.pause_frames = max(1, round(pause_ms / FRAME_MS))
+        self.max_segment = int(max_segment_sec * sample_rate)
+        self.calibration_frames = max(1, round(NOISE_CALIBRATION_MS / FRAME_MS))
+        self._history = np.empty(max(self.calibration_frames, round(NOISE_WINDOW_SEC * 1000 / FRAME_MS)))
+        self.reset()
+
+    def reset(self):
+        """Forget all state (e.g. after a gap in the stream)."""
+        self._history_len = 0  # Frame energies in the noise window
+        self._history_pos = 0  # Next slot to overwrite
+        self._noise_db: Optional[float] = None
+        self._run = 0  # Consecutive voiced frames
+        self._start: Optional[int] = None  # Start of the open utterance
+        self._last_voiced_end = 0  # End of the last voiced frame
+        self._last_end = 0  # End of the last emitted utterance
+
+    @property
+    def in_speech(self) -> bool:
+        """Check if an utterance is open."""
+        return self._start is not None
+
+    def push(self, samples: np.ndarray, position: int) -> List[SpeechSegment]:
+        """
+        Feed the next whole frames of the stream.
+
+        Args:
+            samples: float32 mono samples, a multiple of the frame length
+            position: Absolute index of samples[0]
+
+        Returns:
+            Utterances that ended in this block
+        """
+        segments = []
+        for i, energy in enumerate(self.frame_energy_db(samples)):
+            frame_start = position + i * self.frame_len
+            frame_end = frame_start + self.frame_len
+
+            self._track_noise(energy)
+            threshold = max(self.threshold_db, self._noise_db + NOISE_MARGIN_DB)
+            # Nothing counts as speech while the noise level is calibrating
+            voiced = self._history_len >= self.calibration_frames and energy > threshold
+
+            if voiced:
+                self._run += 1
+                self._last_voiced_end = frame_end
+            else:
+                self._run = 0
+
+            if self._start is None:
+                if self._run >= self.min_speech_frames:
+                    onset = frame_end - self._run * self.frame_len
+                    self._start = max(self._last_end, onset - self.padding)
+                continue
+
+            if frame_end - self._last_voiced_end >= self.pause_frames * self.frame_len:
+                segments.append(self._close(frame_end))
+            elif frame_end - self._start >= self.max_segment:
+                segments.append(self._close(frame_end, split=True))
+                # No pause for max_segment_sec: the floor may no longer match
+                # the room, so calibrate it again from the audio that follows
+                self._history_len = self._history_pos = 0
+        return segments
+
+    def _track_noise(self, energy: float):
+        """Add a frame energy to the noise window and update the noise level."""
+        self._history[self._history_pos] = energy
+        self._history_pos = (self._history_pos + 1) % len(self._history)
+        self._history_len = min(self._history_len + 1, len(self._history))
+        self._noise_db = float(np.percentile(self._history[:self._history_len], NOISE_PERCENTILE))
+
+    def flush(self, position: int) -> Optional[SpeechSegment]:
+        """
+        Close the open utterance at the end of the stream.
+
+        Args:
+            position: Absolute index of the end of the audio fed so far
+
+        Returns:
+            The open utterance, or None
+        """
+        if self._start is None:
+            return None
+        return self._close(position)
+
+    def _close(self, position: int, split: bool = False) -> SpeechSegment:
+        """End the open utterance (a split continues in a new one)."""
+        if split:
+            end = speech_end = position
+        else:
+            speech_end = self._last_voiced_end
+            end = min(position, speech_end + self.padding)
+        segment = SpeechSegment(self._start, end, speech_end)
+        self._last_end = end
+        self._start = end if split else None
+        return segment
@@ -1,8 +1,9 @@
 """Daemon service modules."""
 
+from .input_reader import InputReader
 from .hotkey_listener import HotkeyListener
 from .multi_hotkey_listener import MultiHotkeyListener
-from .state_machine import StateMachine, State
+from .state_machine import StateMachine, State, UtteranceTracker
 from .service import SpeechToTextService
 
-__all__ = ["HotkeyListener", "MultiHotkeyListener", "StateMachine", "State", "SpeechToTextService"]
+__all__ = ["InputReader", "HotkeyListener", "MultiHotkeyListener", "StateMachine", "State", "UtteranceTracker", "SpeechToTextService"]
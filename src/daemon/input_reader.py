@@ -0,0 +1,349 @@
+"""Multiplexed evdev reader with device hotplug.
+
+All matching input devices are read from one place: every device fd is
+registered with the event loop (epoll) through add_reader(), and a single
+callback drains whichever device became readable. Events are filtered
+against a precomputed set of key codes before anything else happens, and
+matching events are handed to one synchronous callback in arrival order.
+The callback must not block (the hotkey listeners turn events into intents
+and queue them), so reading never waits for the pipeline.
+
+New devices are attached while the daemon runs. udev (pyudev) reports them
+once their permissions are set up; without pyudev, /dev/input is watched
+through inotify and a device is retried when its permissions change. A
+device that disappears is detached, and keys it was holding are released so
+a recording never hangs on an unplugged mouse.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from evdev import InputDevice, ecodes
+
+from ..utils.device_cache import DeviceCache, get_device_cache
+
+logger = logging.getLogger(__name__)
+
+INPUT_DIR = "/dev/input"
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+
+# (device path, device name, matching key codes)
+DeviceInfo = Tuple[str, str, List[int]]
+
+# Extra device check: (path, device, matching key codes) -> accept?
+DeviceFilter = Callable[[str, InputDevice, List[int]], bool]
+
+
+def _is_event_node(path: str) -> bool:
+    """Check if a path names an evdev event node (/dev/input/eventN)."""
+    return os.path.basename(path).startswith("event")
+
+
+class _Inotify:
+    """Minimal inotify watch on one directory (ctypes, no dependencies)."""
+
+    def __init__(self, directory: str, mask: int):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch({directory}) failed")
+
+    def read(self) -> List[Tuple[int, str]]:
+        """Drain pending events as (mask, name) pairs."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                events.append((mask, name))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class InputReader:
+    """
+    Read trigger key events from all matching devices, attaching new ones live.
+
+    Example:
+        >>> def on_event(code, value, timestamp): ...
+        >>> reader = InputReader({ecodes.KEY_RIGHTCTRL, ecodes.BTN_SIDE}, on_event)
+        >>> reader.scan()       # probe devices (blocking; fine in a thread)
+        >>> await reader.run()  # until reader.stop()
+    """
+
+    def __init__(
+        self,
+        key_codes: Iterable[int],
+        on_event: Callable[[int, int, float], None],
+        device_filter: Optional[DeviceFilter] = None,
+        input_dir: str = INPUT_DIR,
+        hotplug: bool = True,
+        device_cache: Optional[DeviceCache] = None,
+    ):
+        """
+        Initialize reader.
+
+        Args:
+            key_codes: EV_KEY codes to deliver; everything else is dropped
+            on_event: Non-blocking callback called as on_event(code, value,
+                timestamp) for each matching event, in arrival order
+            device_filter: Optional extra check a device must pass to be read
+            input_dir: Directory holding the event nodes
+            hotplug: Attach and detach devices while running
+            device_cache: Capability cache used by scan() (default: global cache)
+        """
+        self.codes = frozenset(key_codes)
+        self.on_event = on_event
+        self.device_filter = device_filter
+        self.input_dir = input_dir
+        self.hotplug = hotplug
+        self.device_cache = device_cache if device_cache is not None else get_device_cache()
+
+        self._devices: Dict[str, InputDevice] = {}
+        self._held: Dict[str, Set[int]] = {}  # Codes each device is holding down
+        self._probed: Dict[str, InputDevice] = {}  # Opened by scan(), attached by run()
+        self._probing: Set[str] = set()
+        self._stopped = asyncio.Event()
+        self._udev_monitor = None
+        self._inotify: Optional[_Inotify] = None
+        self._watch_fd: Optional[int] = None
+
+    @property
+    def device_paths(self) -> List[str]:
+        """Paths of the devices currently being read."""
+        return sorted(self._devices)
+
+    @property
+    def watching(self) -> bool:
+        """Check if hotplug events are being received."""
+        return self._watch_fd is not None
+
+    def _probe(self, path: str) -> Optional[InputDevice]:
+        """Open a device and keep it if it has one of our key codes (blocking)."""
+        try:
+            device = InputDevice(path)
+        except (PermissionError, OSError) as e:
+            logger.debug(f"Cannot access {path}: {e}")
+            return None
+
+        try:
+            keys = device.capabilities().get(ecodes.EV_KEY, [])
+            matching = [code for code in keys if code in self.codes]
+            if matching and (self.device_filter is None or self.device_filter(path, device, matching)):
+                return device
+        except OSError as e:
+            logger.debug(f"Cannot query {path}: {e}")
+        device.close()
+        return None
+
+    def scan(self) -> List[DeviceInfo]:
+        """
+        Find the devices that have any of the key codes (blocking).
+
+        Capabilities come from the device cache, so only candidate devices
+        are opened. The opened devices are kept and attached when run() starts.
+
+        Returns:
+            (device_path, device_name, [key_codes]) for each matching device
+        """
+        found = []
+        for info in self.device_cache.devices():
+            if self.codes.isdisjoint(info.keys):
+                continue
+            device = self._probed.get(info.path) or self._probe(info.path)
+            if device is None:
+                continue
+            self._probed[info.path] = device
+            matching = sorted(self.codes.intersection(info.keys))
+            found.append((info.path, device.name, matching))
+            logger.info(f"Found device: {device.name} at {info.path} with keys: {matching}")
+        return found
+
+    def _attach(self, path: str, device: InputDevice):
+        """Start reading a device."""
+        if path in self._devices:
+            device.close()
+            return
+        self._devices[path] = device
+        self._held[path] = set()
+        asyncio.get_running_loop().add_reader(device.fd, self._on_readable, path)
+        logger.info(f"Monitoring {device.name} ({path})")
+
+    def _detach(self, path: str, reason: str = "removed", release_held: bool = True):
+        """Stop reading a device and release the keys it was holding."""
+        device = self._devices.pop(path, None)
+        if device is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(device.fd)
+        except (RuntimeError, ValueError):
+            pass
+        try:
+            device.close()
+        except OSError:
+            pass
+        logger.info(f"Input device {path} {reason}")
+
+        held = self._held.pop(path, set())
+        if not release_held:
+            return
+        now = time.time()
+        for code in held:
+            logger.info(f"Releasing key {code} held on {path}")
+            self._emit(code, 0, now)
+
+    def _on_readable(self, path: str):
+        """Drain a readable device (event loop callback)."""
+        device = self._devices.get(path)
+        if device is None:
+            return
+        codes = self.codes
+        held = self._held[path]
+        try:
+            for event in device.read():
+                if event.code in codes and event.type == ecodes.EV_KEY:
+                    if event.value == 1:
+                        held.add(event.code)
+                    elif event.value == 0:
+                        held.discard(event.code)
+                    self._emit(event.code, event.value, event.timestamp())
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            # ENODEV once the device is unplugged
+            self._detach(path, reason=f"removed ({e.strerror or e})")
+
+    async def _try_attach(self, path: str):
+        """Probe a new event node off the loop and attach it if it matches."""
+        if path in self._devices or path in self._probing:
+            return
+        self._probing.add(path)
+        try:
+            device = await asyncio.to_thread(self._probe, path)
+        finally:
+            self._probing.discard(path)
+        if device is not None:
+            self._attach(path, device)
+
+    def _start_watch(self):
+        """Subscribe to device add/remove events (udev if available, else inotify)."""
+        loop = asyncio.get_running_loop()
+        try:
+            import pyudev
+
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem="input")
+            monitor.start()
+            self._udev_monitor = monitor
+            self._watch_fd = monitor.fileno()
+            loop.add_reader(self._watch_fd, self._on_udev)
+            logger.debug("Watching udev for input device hotplug")
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.debug(f"udev monitor unavailable: {e}")
+
+        try:
+            self._inotify = _Inotify(self.input_dir, IN_CREATE | IN_ATTRIB | IN_DELETE)
+        except OSError as e:
+            logger.warning(f"Device hotplug disabled (cannot watch {self.input_dir}: {e})")
+            return
+        self._watch_fd = self._inotify.fd
+        loop.add_reader(self._watch_fd, self._on_inotify)
+        logger.debug(f"Watching {self.input_dir} for input device hotplug (inotify)")
+
+    def _on_udev(self):
+        """Handle pending udev events (event loop callback)."""
+        while True:
+            device = self._udev_monitor.poll(timeout=0)
+            if device is None:
+                return
+            node = device.device_node
+            if not node or not _is_event_node(node):
+                continue
+            if device.action == "add":
+                asyncio.create_task(self._try_attach(node))
+            elif device.action == "remove":
+                self._detach(node)
+
+    def _on_inotify(self):
+        """Handle pending inotify events (event loop callback)."""
+        for mask, name in self._inotify.read():
+            if not name.startswith("event"):
+                continue
+            path = os.path.join(self.input_dir, name)
+            if mask & IN_DELETE:
+                self._detach(path)
+            elif mask & (IN_CREATE | IN_ATTRIB):
+                # Nodes appear root-only; udev fixes permissions right after (IN_ATTRIB)
+                asyncio.create_task(self._try_attach(path))
+
+    def _stop_watch(self):
+        """Unsubscribe from hotplug events."""
+        if self._watch_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._watch_fd)
+            self._watch_fd = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._udev_monitor = None
+
+    def _emit(self, code: int, value: int, timestamp: float):
+        """Hand one event to the callback."""
+        try:
+            self.on_event(code, value, timestamp)
+        except Exception as e:
+            logger.error(f"Error handling key {code}: {e}")
+
+    async def run(self):
+        """Read events until stop() is called."""
+        if self.hotplug:
+            # Subscribe before the initial scan so nothing plugged in between is missed
+            self._start_watch()
+        if not self._probed:
+            await asyncio.to_thread(self.scan)
+        probed, self._probed = self._probed, {}
+        for path, device in probed.items():
+            self._attach(path, device)
+
+        if not self._devices:
+            if not self.watching:
+                raise RuntimeError("No input devices with the trigger keys found")
+            logger.warning("No input devices with the trigger keys yet; waiting for one to be plugged in")
+
+        try:
+            await self._stopped.wait()
+        finally:
+            self._stop_watch()
+            for path in list(self._devices):
+                self._detach(path, reason="closed", release_held=False)
+
+    def stop(self):
+        """Stop run() (call from the event loop thread)."""
+        self._stopped.set()
@@ -0,0 +1,128 @@
+"""Turn raw hotkey events into press/release intents.
+
+The input reader hands every trigger key event to IntentDispatcher.feed(),
+which runs synchronously and never waits on the pipeline. It tracks which
+keys are held, ignores key repeat, applies double-tap arming, and returns a
+HotkeyIntent when the service should start or stop recording. The listeners
+queue intents for the service, so the next input event is read even while an
+earlier press or release is still being handled.
+
+Double-tap timing uses the kernel event timestamps, so a busy event loop
+cannot turn a quick double tap into two single taps (or the reverse).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+PRESS = "press"
+RELEASE = "release"
+
+# evdev EV_KEY values
+KEY_UP = 0
+KEY_DOWN = 1
+KEY_REPEAT = 2
+
+
+@dataclass(frozen=True)
+class HotkeyIntent:
+    """A request to start (press) or stop (release) recording."""
+    kind: str  # PRESS or RELEASE
+    key_code: int
+    timestamp: float  # Kernel timestamp of the triggering event
+
+
+class IntentDispatcher:
+    """
+    Per-key press/release and double-tap state machine.
+
+    Example:
+        >>> dispatcher = IntentDispatcher([97], double_tap_codes=[97])
+        >>> dispatcher.feed(97, 1, 10.00), dispatcher.feed(97, 0, 10.08)
+        (None, None)
+        >>> dispatcher.feed(97, 1, 10.20)
+        HotkeyIntent(kind='press', key_code=97, timestamp=10.2)
+    """
+
+    def __init__(
+        self,
+        key_codes: Iterable[int],
+        double_tap_codes: Iterable[int] = (),
+        double_tap_timeout_ms: int = 300,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            key_codes: Trigger key codes
+            double_tap_codes: Keys that must be tapped twice (and held) to record
+            double_tap_timeout_ms: Max time between the first release and the second press
+        """
+        self.double_tap_codes = frozenset(double_tap_codes)
+        self.double_tap_timeout = double_tap_timeout_ms / 1000.0
+        self._held: Dict[int, bool] = {code: False for code in key_codes}
+        self._last_release: Dict[int, Optional[float]] = {code: None for code in self._held}
+        self._armed: Dict[int, bool] = {code: False for code in self._held}
+
+    def is_held(self, key_code: int) -> bool:
+        """Check if a trigger key is currently held down."""
+        return self._held.get(key_code, False)
+
+    @property
+    def any_held(self) -> bool:
+        """Check if any trigger key is held down."""
+        return any(self._held.values())
+
+    def feed(self, key_code: int, value: int, timestamp: float) -> Optional[HotkeyIntent]:
+        """
+        Process one EV_KEY event.
+
+        Args:
+            key_code: Key code of the event
+            value: 1 = down, 0 = up, 2 = repeat
+            timestamp: Kernel timestamp of the event
+
+        Returns:
+            The intent the event produces, if any
+        """
+        if key_code not in self._held or value == KEY_REPEAT:
+            return None
+
+        if value == KEY_DOWN:
+            if self._held[key_code]:
+                return None
+            self._held[key_code] = True
+
+            if key_code not in self.double_tap_codes:
+                logger.debug(f"Key {key_code} pressed")
+                return HotkeyIntent(PRESS, key_code, timestamp)
+
+            last_release = self._last_release[key_code]
+            if last_release is not None and 0 <= timestamp - last_release < self.double_tap_timeout:
+                self._armed[key_code] = True
+                logger.info(
+                    f"Double-tap detected on key {key_code} "
+                    f"({(timestamp - last_release) * 1000:.0f} ms) - hold to record"
+                )
+                return HotkeyIntent(PRESS, key_code, timestamp)
+            logger.debug(f"First tap on key {key_code}")
+            return None
+
+        if value == KEY_UP:
+            if not self._held[key_code]:
+                return None
+            self._held[key_code] = False
+
+            if key_code not in self.double_tap_codes:
+                logger.debug(f"Key {key_code} released")
+                return HotkeyIntent(RELEASE, key_code, timestamp)
+
+            self._last_release[key_code] = timestamp
+            if self._armed[key_code]:
+                self._armed[key_code] = False
+                return HotkeyIntent(RELEASE, key_code, timestamp)
+            logger.debug(f"Key {key_code} released (not armed, awaiting second tap)")
+
+        return None
@@ -1,22 +1,41 @@
 """Main speech-to-text daemon service."""
 
 import asyncio
+import copy
 import logging
 import signal
 import os
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from .hotkey_listener import HotkeyListener
 from .multi_hotkey_listener import MultiHotkeyListener
-from .state_machine import StateMachine, State
+from .state_machine import StateMachine, State, UtteranceTracker
 from ..core.transcriber import Transcriber
 from ..core.recorder import AudioRecorder
-from ..core.text_input import TextInput
+from ..core.pcm_source import PCMSource, SyntheticSource
+from ..core.text_input import CommandTextStream, TextInput
+from ..core.streaming import StreamingSession
+from ..core.scheduler import INTERACTIVE, JobCancelled, TranscribeOptions, TranscriptionJob, TranscriptionScheduler
 from ..config import Config
-from ..utils.keyboard_layout import KeyboardLayoutMapper
+from ..utils.metrics import MetricsRegistry, UtteranceTiming
+from ..utils.layout_service import get_layout_service, language_for_layout
+from ..utils.loop_monitor import LoopLagMonitor
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..core.capture_stream import CaptureStream
+    from ..core.handsfree import HandsFreeSession
+    from ..core.vad import EnergyVAD, SpeechSegment
 
 logger = logging.getLogger(__name__)
 
+# Fake capture device used by measure_press_latency(): ALSA-like period and open time
+FAKE_PERIOD_MS = 20.0
+FAKE_OPEN_DELAY_MS = 30.0
+
 
 class AudioFeedback:
     """Simple audio feedback using paplay."""
@@ -50,11 +69,39 @@ class AudioFeedback:
             logger.debug(f"Could not play sound: {e}")
 
 
+@dataclass
+class Utterance:
+    """One recording moving through the capture -> transcribe -> type pipeline."""
+    state: StateMachine
+    language: Optional[str] = None  # Language hint from the keyboard layout at press time
+    audio: "str | np.ndarray | None" = None  # WAV path (file mode) or samples (memory mode)
+    streaming_session: Optional[StreamingSession] = None
+    text: str = ""
+    pieces: Optional[asyncio.Queue] = None  # Decoded segments for the typing stage (None ends them)
+    job: Optional[TranscriptionJob] = None  # Decode in progress
+    timing: UtteranceTiming = field(default_factory=UtteranceTiming)
+    release_time: Optional[float] = None  # Wall-clock release event time
+    queued_at: float = 0.0  # perf_counter() when handed to the next stage
+    press_task: Optional[asyncio.Task] = None  # Language hint, start sound, streaming setup
+    hands_free: bool = False  # Cut from continuous capture; release_time is the end of speech
+    first_frame_task: Optional[asyncio.Task] = None  # Press -> first audio frame measurement
+
+    @property
+    def id(self) -> int:
+        """Utterance number (for logging)."""
+        return self.state.utterance_id
+
+
 class SpeechToTextService:
     """
     Main speech-to-text service.
 
     Orchestrates hotkey listening, audio recording, transcription, and text input.
+
+    Utterances flow through three stages connected by bounded queues:
+    capture (hotkey handlers), transcription and typing. Each stage has a
+    single worker, so a new recording can start while earlier utterances are
+    still being transcribed or typed, and text is typed in recording order.
     """
 
     def __init__(self, config: Config):
@@ -65,7 +112,9 @@ class SpeechToTextService:
             config: Configuration object
         """
         self.config = config
-        self.state = StateMachine(on_state_change=self._on_state_change)
+        self.utterances = UtteranceTracker(on_state_change=self._on_state_change)
+        # Keyboard layout (language hint) answered from memory on key press
+        self.layout_service = get_layout_service()
 
         # Initialize components
         self.transcriber = Transcriber(
@@ -78,20 +127,30 @@ class SpeechToTextService:
             beam_size=config.whisper.beam_size,
             vad_filter=config.whisper.vad_filter,
             initial_prompt=config.whisper.initial_prompt or "",
+            cpu_threads=config.whisper.cpu_threads,
+            num_workers=config.whisper.decode_workers,
         )
 
         self.recorder = AudioRecorder(
             sample_rate=config.audio.sample_rate,
             channels=config.audio.channels,
             audio_format=config.audio.format,
+            capture_mode=config.audio.capture_mode,
+            max_duration=config.audio.max_duration,
+            warm_capture=config.audio.warm_capture,
+            pre_roll_ms=config.audio.pre_roll_ms,
+            post_roll_ms=config.audio.post_roll_ms,
         )
 
         self.text_input = TextInput(
             display_server=config.display.actual_server,
             key_delay_ms=config.text_input.key_delay_ms,
+            typing_burst_size=config.text_input.typing_burst_size,
             mode=config.text_input.mode,
             paste_key_combination=config.text_input.paste_key_combination,
             pre_paste_delay_ms=config.text_input.pre_paste_delay_ms,
+            restore_selection_after_ms=config.text_input.restore_selection_after_ms,
+            defer_setup=True,  # Device setup runs concurrently in run()
         )
 
         self.feedback = AudioFeedback(
@@ -102,207 +161,767 @@ class SpeechToTextService:
 
         self.listener: Optional[HotkeyListener] = None
         self._shutdown_event = asyncio.Event()
-        self._current_audio_file: Optional[str] = None
-        self._detected_language: Optional[str] = None  # Store language detected at key press
+        self._recording: Optional[Utterance] = None
+
+        # Pipeline stages; queue bounds match the in-flight utterance limit
+        self._max_pending = max(1, config.audio.max_pending_utterances)
+        self._transcribe_queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_pending)
+        self._typing_queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_pending)
+        self._workers: list = []
+
+        self.metrics: Optional[MetricsRegistry] = None
+        if config.metrics.enabled:
+            self.metrics = MetricsRegistry(
+                export_dir=config.metrics.directory or None,
+                textfile=config.metrics.textfile or None,
+            )
+
+        # Every model decode runs here, by priority, off the default executor
+        self.scheduler = TranscriptionScheduler(
+            self.transcriber,
+            workers=config.whisper.decode_workers,
+            metrics=self.metrics,
+        )
+
+        # Energy-based endpointing between capture and transcription (created on first use)
+        self.vad: Optional["EnergyVAD"] = None
+
+        self.loop_monitor: Optional[LoopLagMonitor] = None
+        if config.metrics.loop_lag_interval_ms > 0:
+            self.loop_monitor = LoopLagMonitor(
+                metrics=self.metrics,
+                interval_ms=config.metrics.loop_lag_interval_ms,
+                stall_threshold_ms=config.metrics.loop_stall_threshold_ms,
+                debug=config.metrics.loop_stall_debug,
+            )
+
+        # Startup: the listener accepts presses while the model is still loading
+        self._model_ready = asyncio.Event()
+        self._model_failed = False
+        self._model_task: Optional[asyncio.Task] = None
+        self._startup_time: Optional[float] = None
+        self.time_to_listen_ms: Optional[float] = None
+        self.time_to_ready_ms: Optional[float] = None
+
+        self._streaming_enabled = config.whisper.streaming and self.recorder.capture_mode == "memory"
+        if config.whisper.streaming and not self._streaming_enabled:
+            logger.warning("Streaming transcription requires audio.capture_mode = \"memory\", disabling it")
+
+        # Toggle mode: a press starts or stops hands-free dictation
+        self._hands_free_enabled = config.hotkey.mode == "toggle" and self.recorder.capture_mode == "memory"
+        if config.hotkey.mode == "toggle" and not self._hands_free_enabled:
+            logger.warning("Hands-free toggle mode requires audio.capture_mode = \"memory\", using hold mode")
+        self._hands_free: Optional["HandsFreeSession"] = None
+        self._hands_free_language: Optional[str] = None
+        self._hands_free_typed = False  # Later utterances of the session need a leading space
 
     def _on_state_change(self, old_state: State, new_state: State):
         """Handle state changes (for logging/debugging)."""
         pass
 
-    async def _on_key_press(self):
-        """Handle hotkey press - start recording."""
-        if not self.state.is_idle:
-            logger.debug("Ignoring key press - not in IDLE state")
-            return
+    async def _on_key_press(self, event_time: Optional[float] = None):
+        """Handle hotkey press - start recording a new utterance.
 
-        logger.info("Hotkey pressed - starting recording")
+        Earlier utterances may still be transcribing or typing; they continue
+        in the background.
 
-        # Detect keyboard layout and use it to guide Whisper language detection
-        if self.config.whisper.language == "":
-            from ..utils.keyboard_layout import KeyboardLayoutMapper
-            mapper = KeyboardLayoutMapper()
-            detected_layout = mapper.detect_current_layout()
-            if detected_layout:
-                # Map GNOME layout codes to Whisper language codes
-                layout_to_language = {
-                    'us': 'en',
-                    'uk': 'uk',
-                    'ua': 'uk',  # GNOME uses 'ua' for Ukrainian, Whisper uses 'uk'
-                }
-                self._detected_language = layout_to_language.get(detected_layout, detected_layout)
-                logger.info(f"Detected keyboard layout '{detected_layout}' -> language: {self._detected_language}")
-            else:
-                logger.info("Could not detect keyboard layout")
-                self._detected_language = None
+        Args:
+            event_time: Kernel timestamp of the press event (used to align
+                warm-capture audio with the actual key press)
+        """
+        if self._hands_free_enabled:
+            await self._toggle_hands_free(event_time)
+            return
 
-        if not self.state.start_recording():
+        if self._recording is not None:
+            logger.debug("Ignoring key press - already recording")
+            return
+
+        if self.utterances.in_flight >= self._max_pending:
+            logger.warning(
+                f"Ignoring key press - {self.utterances.in_flight} utterances still in progress"
+            )
             return
 
-        # Play start sound
-        await self.feedback.play_start()
+        if event_time is None:
+            event_time = time.time()
 
-        # Start recording
+        state = self.utterances.begin()
+        if state is None:
+            return
+        utterance = Utterance(state=state)
+        utterance.timing.utterance_id = utterance.id
+        self._recording = utterance
+
+        # Capture first: everything else on this path delays the first frame
         try:
-            self._current_audio_file = await self.recorder.start_recording()
+            await self.recorder.start_recording(event_time=event_time)
         except Exception as e:
             logger.error(f"Failed to start recording: {e}")
-            self.state.error(str(e))
-            self.state.recover_from_error()
+            self._recording = None
+            state.error(str(e))
+            await self._discard(utterance, outcome="error")
+            return
+        utterance.timing.since_event("press_to_capture_ms", event_time)
+        logger.info("Hotkey pressed - recording started")
 
-    async def _on_key_release(self):
-        """Handle hotkey release - stop recording and transcribe."""
-        if not self.state.is_recording:
-            logger.debug("Ignoring key release - not in RECORDING state")
+        utterance.first_frame_task = asyncio.create_task(
+            self._measure_first_frame(utterance, event_time)
+        )
+        utterance.press_task = asyncio.create_task(self._after_press(utterance))
+
+    async def _after_press(self, utterance: Utterance):
+        """Work that follows a press once capture is running.
+
+        The language hint (a thread, in case the layout cache has to
+        re-detect) and the start sound run concurrently; streaming
+        transcription starts once the hint is known.
+        """
+        try:
+            language, _ = await asyncio.gather(
+                asyncio.to_thread(self._detect_layout_language),
+                self.feedback.play_start(),
+            )
+        except Exception as e:
+            logger.warning(f"Press follow-up failed: {e}")
+            return
+        utterance.language = language
+
+        # Decode committed windows in the background while the key is held
+        # (only once the model is loaded, so windows never race the loader)
+        if (
+            self._streaming_enabled
+            and self._model_ready.is_set()
+            and self._recording is utterance
+        ):
+            utterance.streaming_session = StreamingSession(
+                scheduler=self.scheduler,
+                snapshot=self.recorder.snapshot,
+                sample_rate=self.config.audio.sample_rate,
+                interval_sec=self.config.whisper.streaming_interval_sec,
+                max_window_sec=self.config.whisper.streaming_max_window_sec,
+                language=language,
+            )
+            utterance.streaming_session.start()
+
+    async def _measure_first_frame(self, utterance: Utterance, event_time: float) -> Optional[float]:
+        """Record the press -> first audio frame latency and check it against the target.
+
+        Returns:
+            Latency in milliseconds, or None if no audio arrived
+        """
+        first_frame = await self.recorder.wait_for_first_frame(event_time)
+        if first_frame is None:
+            logger.warning("No audio frame arrived after the key press")
+            return None
+
+        latency_ms = max(0.0, (first_frame - event_time) * 1000)
+        utterance.timing.add("press_to_first_frame_ms", latency_ms)
+        target_ms = self.config.audio.press_latency_target_ms
+        if target_ms > 0 and latency_ms > target_ms:
+            logger.warning(
+                f"Press to first audio frame took {latency_ms:.0f} ms (target {target_ms} ms)"
+            )
+            if self.metrics is not None:
+                self.metrics.inc("press_latency_over_target_total")
+        else:
+            logger.debug(f"Press to first audio frame: {latency_ms:.1f} ms")
+        return latency_ms
+
+    def _detect_layout_language(self) -> Optional[str]:
+        """Detect the keyboard layout and map it to a Whisper language hint.
+
+        Returns:
+            Language code, or None if layout detection is disabled or failed
+        """
+        if self.config.whisper.language != "":
+            return None
+
+        detected_layout = self.layout_service.get_layout()
+        if not detected_layout:
+            logger.info("Could not detect keyboard layout")
+            return None
+
+        language = language_for_layout(detected_layout)
+        logger.info(f"Detected keyboard layout '{detected_layout}' -> language: {language}")
+        return language
+
+    async def _on_key_release(self, event_time: Optional[float] = None):
+        """Handle hotkey release - stop recording and queue the utterance.
+
+        Args:
+            event_time: Kernel timestamp of the release event
+        """
+        if self._hands_free_enabled:
+            return  # Toggle mode acts on presses only
+
+        utterance = self._recording
+        if utterance is None or not utterance.state.is_recording:
+            logger.debug("Ignoring key release - not recording")
             return
 
         logger.info("Hotkey released - stopping recording")
+        self._recording = None
+        utterance.release_time = event_time if event_time is not None else time.time()
+
+        # The language hint must be known before the utterance is queued
+        if utterance.press_task is not None:
+            await utterance.press_task
 
         # Stop recording
-        if not self.state.stop_recording():
+        if not utterance.state.stop_recording():
             return
 
-        audio_file = await self.recorder.stop_recording()
+        # File path in "file" capture mode, float32 samples in "memory" mode
+        utterance.audio = await self.recorder.stop_recording(event_time=event_time)
+        utterance.timing.since_event("release_to_capture_stop_ms", utterance.release_time)
+        if utterance.streaming_session:
+            # The recorder may start the next utterance before this one is decoded
+            utterance.streaming_session.stop()
 
         # Play stop sound
+        started = time.perf_counter()
         await self.feedback.play_stop()
+        utterance.timing.since("stop_sound_ms", started)
 
-        if not audio_file:
-            logger.warning("No audio file produced")
-            self.state.finish()
+        if utterance.audio is None:
+            logger.warning("No audio produced")
+            await self._discard(utterance)
             return
 
         # Check minimum duration
-        file_size = os.path.getsize(audio_file) if os.path.exists(audio_file) else 0
-        min_size = int(self.config.audio.sample_rate * self.config.audio.min_duration * 2)
-
-        if file_size < min_size:
+        if self.recorder.duration_of(utterance.audio) < self.config.audio.min_duration:
             logger.info("Recording too short, discarding")
-            AudioRecorder.cleanup(audio_file)
-            self.state.finish()
+            await self._discard(utterance)
             return
 
-        # Use the language detected at key press time
-        detected_lang = self._detected_language
+        if self.config.audio.trim_silence and not await self._trim_silence(utterance):
+            return
+
+        # Never blocks: presses are refused while max_pending utterances are in flight
+        utterance.queued_at = time.perf_counter()
+        self._transcribe_queue.put_nowait(utterance)
+        if self._transcribe_queue.qsize() > 1:
+            logger.info(f"Utterance #{utterance.id} queued ({self._transcribe_queue.qsize()} waiting)")
 
-        # Transcribe in thread pool (CPU-bound)
-        # Temporarily override language if keyboard layout was detected
-        original_language = self.transcriber.language
-        if detected_lang and self.config.whisper.language == "":
-            self.transcriber.language = detected_lang
-            logger.info(f"Using language from keyboard layout: {detected_lang}")
+    async def _toggle_hands_free(self, event_time: Optional[float] = None):
+        """Start hands-free dictation, or stop it if it is running.
 
+        Args:
+            event_time: Kernel timestamp of the press event
+        """
+        if self._hands_free is not None:
+            await self._stop_hands_free()
+            return
+
+        if event_time is None:
+            event_time = time.time()
+
+        # Capture first, as with a hold-mode press
         try:
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(
-                None,
-                self.transcriber.transcribe,
-                audio_file,
+            stream = self.recorder.continuous_stream()
+        except Exception as e:
+            logger.error(f"Failed to start hands-free capture: {e}")
+            return
+        from_frame = stream.frame_at(event_time)
+
+        from ..core.handsfree import HandsFreeSession
+        from ..core.vad import SpeechSegmenter
+
+        segmenter = SpeechSegmenter(
+            sample_rate=self.config.audio.sample_rate,
+            threshold_db=self.config.audio.vad_threshold_db,
+            min_speech_ms=self.config.audio.vad_min_speech_ms,
+            padding_ms=self.config.audio.vad_padding_ms,
+            pause_ms=self.config.audio.pause_ms,
+            # Utterances are read back from the capture ring buffer
+            max_segment_sec=min(self.config.audio.max_segment_sec, self.config.audio.max_duration),
+        )
+        session = HandsFreeSession(
+            stream,
+            segmenter,
+            on_segment=lambda samples, segment: self._queue_segment(stream, samples, segment),
+        )
+        self._hands_free = session
+
+        try:
+            language, _ = await asyncio.gather(
+                asyncio.to_thread(self._detect_layout_language),
+                self.feedback.play_start(),
             )
+        except Exception as e:
+            logger.warning(f"Press follow-up failed: {e}")
+            language = None
+        self._hands_free_language = language
+        self._hands_free_typed = False
+
+        if self._hands_free is session:
+            session.start(from_frame=from_frame)
+            logger.info("Hands-free dictation started - press again to stop")
+
+    async def _stop_hands_free(self, flush: bool = True):
+        """Stop hands-free dictation.
+
+        Args:
+            flush: Queue the utterance in progress (False drops it)
+        """
+        session, self._hands_free = self._hands_free, None
+        if session is None:
+            return
+
+        if flush:
+            await session.stop()
+            await self.feedback.play_stop()
+        else:
+            await session.cancel()
+        logger.info(f"Hands-free dictation stopped ({session.segments} utterances)")
+
+        if not self.recorder.warm_capture:
+            await self.recorder.close_stream()
+
+    async def _queue_segment(self, stream: "CaptureStream", samples: "np.ndarray", segment: "SpeechSegment"):
+        """Queue one utterance cut from hands-free capture for transcription."""
+        state = self.utterances.begin()
+        if state is None:
+            logger.warning("Dropping hands-free utterance - recorder busy")
+            return
+        utterance = Utterance(state=state, language=self._hands_free_language, hands_free=True)
+        utterance.timing.utterance_id = utterance.id
+        state.stop_recording()
+        utterance.audio = samples
+        utterance.release_time = stream.time_at(segment.speech_end) or time.time()
+        utterance.timing.since_event("segment_endpoint_ms", utterance.release_time)
+
+        if self.recorder.duration_of(samples) < self.config.audio.min_duration:
+            logger.info("Utterance too short, discarding")
+            await self._discard(utterance)
+            return
+
+        if self.config.audio.trim_silence and not await self._trim_silence(utterance):
+            return
+
+        logger.info(
+            f"Hands-free utterance #{utterance.id} "
+            f"({len(samples) / self.config.audio.sample_rate:.1f} s) queued"
+        )
+        # Waits while the pipeline is full; capture keeps filling the ring buffer
+        utterance.queued_at = time.perf_counter()
+        await self._transcribe_queue.put(utterance)
+
+    async def _trim_silence(self, utterance: Utterance) -> bool:
+        """Cut leading and trailing silence off the recording before it is queued.
+
+        Returns:
+            False if the recording has no speech (it was discarded without
+            running the model)
+        """
+        started = time.perf_counter()
+        audio = utterance.audio
+        try:
+            if self.vad is None:
+                from ..core.vad import EnergyVAD
+
+                self.vad = EnergyVAD(
+                    sample_rate=self.config.audio.sample_rate,
+                    threshold_db=self.config.audio.vad_threshold_db,
+                    min_speech_ms=self.config.audio.vad_min_speech_ms,
+                    padding_ms=self.config.audio.vad_padding_ms,
+                )
+            samples = await asyncio.to_thread(self.recorder.load_samples, audio)
+            bounds = await asyncio.to_thread(self.vad.detect, samples)
+        except Exception as e:
+            logger.warning(f"Silence trimming failed, using the whole recording: {e}")
+            return True
+        utterance.timing.since("vad_ms", started)
+        total_sec = bounds.total / self.config.audio.sample_rate
+
+        session = utterance.streaming_session
+        if bounds.is_silent and session is not None and session.committed_text:
+            return True  # Streaming already heard speech; keep everything
+
+        if self.metrics is not None:
+            self.metrics.inc("vad_input_seconds_total", total_sec)
+            self.metrics.inc("vad_trimmed_seconds_total", bounds.trimmed_sec)
+
+        if bounds.is_silent:
+            logger.info(f"No speech in {total_sec:.1f} s recording, skipping transcription")
+            if self.metrics is not None:
+                self.metrics.inc("vad_skipped_model_calls_total")
+            await self._discard(utterance, outcome="no_speech")
+            return False
+
+        # Streaming windows are addressed from the start of the recording: only trim the end
+        start = 0 if session is not None else bounds.start
+        if isinstance(audio, str):
+            AudioRecorder.cleanup(audio)  # The samples replace the WAV file
+        utterance.audio = samples[start:bounds.end]
+        logger.debug(
+            f"Speech {bounds.start / self.config.audio.sample_rate:.2f}-"
+            f"{bounds.end / self.config.audio.sample_rate:.2f} s of {total_sec:.2f} s "
+            f"({bounds.trimmed_sec:.2f} s trimmed)"
+        )
+        return True
+
+    async def _discard(self, utterance: Utterance, outcome: str = "discarded"):
+        """Drop an utterance without typing anything."""
+        for task in (utterance.press_task, utterance.first_frame_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._record_timing(utterance, outcome)
+        if utterance.job is not None:
+            utterance.job.cancel()
+            utterance.job = None
+        if utterance.streaming_session:
+            await utterance.streaming_session.cancel()
+            utterance.streaming_session = None
+        AudioRecorder.cleanup(utterance.audio)
+        utterance.audio = None
+        if utterance.state.state == State.ERROR:
+            utterance.state.recover_from_error()
+        elif not utterance.state.is_idle:
+            utterance.state.finish()
+
+    async def _transcription_stage(self):
+        """Transcribe queued utterances one at a time, in recording order."""
+        while True:
+            utterance = await self._transcribe_queue.get()
+            try:
+                await self._transcribe(utterance)
+            except Exception as e:
+                logger.error(f"Transcription stage error: {e}")
+                await self._discard(utterance, outcome="error")
+            finally:
+                self._transcribe_queue.task_done()
+
+    async def _transcribe(self, utterance: Utterance):
+        """Transcribe one utterance and hand its text to the typing stage.
+
+        The utterance is handed over with its first decoded segment; later
+        segments follow through utterance.pieces while they are decoded, so
+        typing starts before the whole recording is transcribed.
+        """
+        timing = utterance.timing
+        timing.since("queue_wait_ms", utterance.queued_at)
+
+        # Audio is already captured; hold it until the model has finished loading
+        if not self._model_ready.is_set():
+            logger.info("Waiting for model to finish loading...")
+            await self._model_ready.wait()
+        if self._model_failed:
+            await self._discard(utterance, outcome="error")
+            return
+
+        # Use the language detected at key press time
+        language = utterance.language
+        if language:
+            logger.info(f"Using language from keyboard layout: {language}")
+
+        audio = utterance.audio
+        streaming_session, utterance.streaming_session = utterance.streaming_session, None
+        pieces: asyncio.Queue = asyncio.Queue()
+        utterance.pieces = pieces
+
+        model_timing: dict = {}
+        handed_over = False
+        started = time.perf_counter()
+        try:
+            if streaming_session:
+                # Only the trailing, not-yet-committed window is decoded here
+                text = await streaming_session.finish(audio)
+                if text and text.strip():
+                    pieces.put_nowait(text)
+                decoding = None
+            else:
+                utterance.job, first_text = self._decode_segments(audio, language, model_timing, pieces)
+                decoding = asyncio.ensure_future(utterance.job.result())
+                waiter = asyncio.ensure_future(first_text.wait())
+                await asyncio.wait({waiter, decoding}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+
+            if not pieces.empty():
+                utterance.queued_at = time.perf_counter()
+                await self._typing_queue.put(utterance)
+                handed_over = True
+            if decoding is not None:
+                await decoding
+        except JobCancelled:
+            logger.info("Transcription cancelled")
+            if handed_over:
+                pieces.put_nowait(None)  # Keep the segments already typed
+                return
+            await self._discard(utterance)
+            return
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
-            AudioRecorder.cleanup(audio_file)
-            self.state.error(str(e))
-            self.state.recover_from_error()
+            if handed_over:
+                pieces.put_nowait(e)  # Ends typing after the segments already decoded
+                return
+            utterance.state.error(str(e))
+            await self._discard(utterance, outcome="error")
             return
         finally:
-            # Restore original language setting
-            if detected_lang and self.config.whisper.language == "":
-                self.transcriber.language = original_language
-            # Clear detected language for next recording
-            self._detected_language = None
-            AudioRecorder.cleanup(audio_file)
-
-        if not text or not text.strip():
+            utterance.job = None
+            AudioRecorder.cleanup(audio)
+            utterance.audio = None
+
+        timing.since("transcribe_ms", started)
+        for stage in ("model_prepare_ms", "model_decode_ms", "first_segment_ms"):
+            if stage in model_timing:
+                timing.add(stage, model_timing[stage])
+        timing.audio_sec = model_timing.get("audio_sec")
+        timing.speech_sec = model_timing.get("speech_sec")
+
+        if not handed_over:
             logger.info("No speech detected")
-            self.state.finish()
+            self._record_timing(utterance, "no_speech")
+            utterance.state.finish()
             return
+        pieces.put_nowait(None)  # End of text
 
-        # Strip trailing ellipsis/dots to avoid layout-dependent punctuation issues when typing
-        cleaned_text = text.rstrip(" .…")
-        if cleaned_text != text:
-            logger.info("Removed trailing punctuation before typing")
-            text = cleaned_text
+    def _decode_segments(
+        self,
+        audio: "str | np.ndarray",
+        language: Optional[str],
+        model_timing: dict,
+        pieces: asyncio.Queue,
+    ) -> "tuple[TranscriptionJob, asyncio.Event]":
+        """Schedule an interactive decode, queueing each segment's text as it is produced.
 
-        # Type text (with voice command recognition)
-        logger.info(f"Transcribed: {text[:50]}...")
+        Returns:
+            (the decode job, event set when the first text is queued)
+        """
+        first_text = asyncio.Event()
 
-        if not self.state.start_typing():
+        def publish(segment: tuple):
+            text = segment[2]
+            if text:
+                pieces.put_nowait(text)
+                first_text.set()
+
+        # In-memory samples go straight to the model, no WAV round trip
+        job = self.scheduler.submit_segments(
+            audio,
+            TranscribeOptions(language=language),
+            priority=INTERACTIVE,
+            sample_rate=self.config.audio.sample_rate,
+            on_segment=publish,
+            timing=model_timing,
+        )
+        return job, first_text
+
+    async def _typing_stage(self):
+        """Type transcribed utterances one at a time, in recording order."""
+        while True:
+            utterance = await self._typing_queue.get()
+            try:
+                await self._type(utterance)
+            finally:
+                self._typing_queue.task_done()
+
+    async def _type(self, utterance: Utterance):
+        """Type one utterance's segments as they arrive (with voice command recognition)."""
+        timing = utterance.timing
+        timing.since("typing_queue_ms", utterance.queued_at)
+
+        if not utterance.state.start_typing():
             return
 
+        # Hands-free utterances continue the same text
+        prefix = " " if utterance.hands_free and self._hands_free_typed else ""
+        stream = CommandTextStream(self.text_input, prefix=prefix)
+        first_stage = "speech_end_to_first_typed_ms" if utterance.hands_free else "release_to_first_typed_ms"
+
+        outcome = "typed"
         try:
-            # Use command-aware typing to handle special voice commands like "ENTER"
-            success = await self.text_input.process_and_type_with_commands(text)
-            if not success:
-                logger.warning("Text typing may have failed")
+            while True:
+                piece = await utterance.pieces.get()
+                if piece is None:
+                    break
+                if isinstance(piece, Exception):
+                    outcome = "error"
+                    break
+                if first_stage not in timing.stages:
+                    timing.since_event(first_stage, utterance.release_time)
+                # Command-aware typing handles special voice commands like "ENTER"
+                if not await stream.feed(piece):
+                    logger.warning("Text typing may have failed")
+                    outcome = "error"
+                    break
         except Exception as e:
             logger.error(f"Typing failed: {e}")
+            outcome = "error"
 
-        self.state.finish()
+        utterance.text = stream.text
+        logger.info(f"Transcribed: {stream.text[:50]}...")
+        if utterance.hands_free and stream.typed_anything:
+            self._hands_free_typed = True
+
+        # Command parsing is text post-processing; the rest is typing proper
+        if "command_parse_ms" in stream.timing:
+            timing.add("postprocess_ms", stream.timing["command_parse_ms"])
+        if "typing_ms" in stream.timing:
+            timing.add("typing_ms", stream.timing["typing_ms"])
+        if "pacing_error_ms" in stream.timing:
+            timing.add("typing_pacing_error_ms", stream.timing["pacing_error_ms"])
+        if utterance.hands_free:
+            timing.since_event("speech_end_to_typed_ms", utterance.release_time)
+        else:
+            timing.since_event("release_to_typed_ms", utterance.release_time)
+        self._record_timing(utterance, outcome)
+
+        utterance.state.finish()
+
+    def _record_timing(self, utterance: Utterance, outcome: str):
+        """Hand a finished utterance's timing record to the metrics registry."""
+        if self.metrics is None or utterance.timing.outcome != "pending":
+            return
+        utterance.timing.outcome = outcome
+        self.metrics.record_utterance(utterance.timing)
+        self.metrics.schedule_export()
 
     async def run(self):
         """Run the service main loop."""
         logger.info("Starting Speech-to-Text service...")
+        self._startup_time = time.perf_counter()
+
+        # Model loading runs in the background; releases wait for it
+        self._model_task = asyncio.create_task(self._load_model())
+
+        self.listener = self._create_listener()
 
-        # Pre-load Whisper model
+        # Device discovery, uinput creation and clipboard validation run concurrently
+        setup_jobs = [
+            asyncio.to_thread(self.listener.discover),
+            self.text_input.setup_async(),
+        ]
+        # Keep the microphone warm so pre-roll audio is available at press time
+        # (memory mode without it still preloads the capture buffer code)
+        setup_jobs.append(self.recorder.open_stream())
+        # Detect the layout once and watch for changes (language auto-detection)
+        if self.config.whisper.language == "":
+            setup_jobs.append(asyncio.to_thread(self.layout_service.start))
+
+        try:
+            await asyncio.gather(*setup_jobs)
+        except Exception as e:
+            logger.error(f"Startup failed: {e}")
+            self._model_task.cancel()
+            await self.recorder.close_stream()
+            return
+
+        if self._model_failed:
+            await self.recorder.close_stream()
+            return
+
+        # Set up signal handlers
+        loop = asyncio.get_event_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._handle_signal)
+
+        # Pipeline workers: transcription and typing run independently of capture
+        self._workers = [
+            asyncio.create_task(self._transcription_stage()),
+            asyncio.create_task(self._typing_stage()),
+        ]
+
+        if self.loop_monitor is not None:
+            self.loop_monitor.start()
+
+        self._log_ready_message()
+        self.time_to_listen_ms = (time.perf_counter() - self._startup_time) * 1000
+        if self.metrics is not None:
+            self.metrics.describe("time_to_listen_ms", "Service start to hotkey listener active")
+            self.metrics.set_gauge("time_to_listen_ms", self.time_to_listen_ms)
+        logger.info(f"Listening after {self.time_to_listen_ms:.0f} ms")
+
+        try:
+            await self.listener.start()
+        except asyncio.CancelledError:
+            logger.info("Service cancelled")
+        except Exception as e:
+            logger.error(f"Service error: {e}")
+        finally:
+            await self._cleanup()
+
+    async def _load_model(self):
+        """Load (and optionally warm up) the model off the event loop."""
         logger.info("Pre-loading Whisper model...")
         try:
-            self.transcriber.load_model()
+            started = time.perf_counter()
+            await asyncio.to_thread(self.transcriber.load_model)
+            logger.info(f"Model loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
+            self._model_failed = True
+            self._model_ready.set()
+            self._handle_signal()
             return
 
-        # Set up hotkey listener (multi-device support for keyboard + mouse)
+        # Pay for lazy decoder/VAD allocations now instead of on the first utterance
+        if self.config.whisper.warmup:
+            try:
+                await asyncio.to_thread(self.transcriber.warmup, self.config.whisper.warmup_runs)
+            except Exception as e:
+                logger.warning(f"Model warm-up failed: {e}")
+
+        self.time_to_ready_ms = (time.perf_counter() - self._startup_time) * 1000
+        if self.metrics is not None:
+            self.metrics.describe("time_to_ready_ms", "Service start to model ready")
+            self.metrics.set_gauge("time_to_ready_ms", self.time_to_ready_ms)
+            if self.time_to_listen_ms is not None:
+                self.metrics.set_gauge("time_to_listen_ms", self.time_to_listen_ms)
+            self.metrics.schedule_export()
+        self._model_ready.set()
+        logger.info(f"Model ready (time to ready: {self.time_to_ready_ms:.0f} ms)")
+
+    def _create_listener(self):
+        """Create the hotkey listener (multi-device support for keyboard + mouse)."""
         trigger_keys = self.config.hotkey.trigger_keys
-        double_tap_keys = self.config.hotkey.double_tap_key_list
 
         if len(trigger_keys) > 1:
             # Use multi-device listener for multiple triggers
-            self.listener = MultiHotkeyListener(
+            return MultiHotkeyListener(
                 trigger_keys=trigger_keys,
-                double_tap_keys=double_tap_keys,
-                on_press=self._on_key_press,
-                on_release=self._on_key_release,
-                double_tap_timeout_ms=self.config.hotkey.double_tap_timeout_ms,
-            )
-        else:
-            # Use single-device listener for backward compatibility
-            self.listener = HotkeyListener(
-                key_code=self.config.hotkey.key_code,
-                device_path=self.config.hotkey.device_path or None,
+                double_tap_keys=self.config.hotkey.double_tap_key_list,
                 on_press=self._on_key_press,
                 on_release=self._on_key_release,
-                enable_double_tap=self.config.hotkey.enable_double_tap,
                 double_tap_timeout_ms=self.config.hotkey.double_tap_timeout_ms,
             )
 
-        # Set up signal handlers
-        loop = asyncio.get_event_loop()
-        for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, self._handle_signal)
+        # Use single-device listener for backward compatibility
+        return HotkeyListener(
+            key_code=self.config.hotkey.key_code,
+            device_path=self.config.hotkey.device_path or None,
+            on_press=self._on_key_press,
+            on_release=self._on_key_release,
+            enable_double_tap=self.config.hotkey.enable_double_tap,
+            double_tap_timeout_ms=self.config.hotkey.double_tap_timeout_ms,
+        )
+
+    def _log_ready_message(self):
+        """Build user-friendly ready message."""
+        trigger_keys = self.config.hotkey.trigger_keys
+        double_tap_keys = self.config.hotkey.double_tap_key_list
+        loading = "" if self._model_ready.is_set() else " (model still loading, audio will be buffered)"
+
+        if self._hands_free_enabled:
+            trigger_desc = " or ".join(trigger_keys)
+            logger.info(f"Service ready{loading}. Press {trigger_desc} to start or stop hands-free dictation.")
+            return
 
-        # Build user-friendly message
         if double_tap_keys:
             double_tap_desc = " or ".join(double_tap_keys)
             single_tap_keys = [k for k in trigger_keys if k not in double_tap_keys]
             if single_tap_keys:
                 single_tap_desc = " or ".join(single_tap_keys)
-                logger.info(f"Service ready.")
+                logger.info(f"Service ready{loading}.")
                 logger.info(f"  - Double-tap {double_tap_desc} and hold to record")
                 logger.info(f"  - Hold {single_tap_desc} to record")
             else:
-                logger.info(f"Service ready. Double-tap {double_tap_desc} and hold to record.")
+                logger.info(f"Service ready{loading}. Double-tap {double_tap_desc} and hold to record.")
         else:
             trigger_desc = " or ".join(trigger_keys)
-            logger.info(f"Service ready. Hold {trigger_desc} to record.")
-
-        try:
-            await self.listener.start()
-        except asyncio.CancelledError:
-            logger.info("Service cancelled")
-        except Exception as e:
-            logger.error(f"Service error: {e}")
-        finally:
-            await self._cleanup()
+            logger.info(f"Service ready{loading}. Hold {trigger_desc} to record.")
 
     def _handle_signal(self):
         """Handle shutdown signals."""
@@ -315,17 +934,119 @@ class SpeechToTextService:
         """Clean up resources."""
         logger.info("Cleaning up...")
 
-        # Cancel any ongoing recording
-        if self.recorder.is_recording:
-            await self.recorder.cancel_recording()
+        if self._model_task and not self._model_task.done():
+            self._model_task.cancel()
+
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.scheduler.shutdown()
+
+        # Drop utterances that never reached the typing stage
+        for queue in (self._transcribe_queue, self._typing_queue):
+            while not queue.empty():
+                await self._discard(queue.get_nowait())
+
+        await self._cancel_recording()
+        await self._stop_hands_free(flush=False)
+
+        self.utterances.reset()
+        if self.metrics is not None:
+            await self.metrics.flush()
+
+        await self.recorder.close_stream()
+        self.layout_service.stop()
 
         logger.info("Service stopped")
 
+    async def _cancel_recording(self):
+        """Drop the utterance being recorded, if any, and stop the recorder."""
+        if self._recording is not None:
+            await self._discard(self._recording)
+            self._recording = None
+
+        if self.recorder.is_recording:
+            await self.recorder.cancel_recording()
+
     async def shutdown(self):
         """Initiate graceful shutdown."""
         self._handle_signal()
 
 
+async def measure_press_latency(
+    config: Config,
+    presses: int = 5,
+    source_factory: Optional[Callable[[], PCMSource]] = None,
+) -> List[float]:
+    """
+    Measure key press -> first audio frame latency through the real press handler.
+
+    The service runs against a fake capture device (no microphone, no
+    hotkey device, no model); start sounds and metrics are disabled.
+
+    Args:
+        config: Configuration (capture settings are taken from it)
+        presses: Number of simulated presses
+        source_factory: Callable returning the fake PCMSource
+            (default: SyntheticSource with an ALSA-like period and open time)
+
+    Returns:
+        Latency of each press in milliseconds (presses without audio are omitted)
+    """
+    config = copy.deepcopy(config)
+    config.feedback.enabled = False
+    config.metrics.enabled = False
+    config.whisper.streaming = False
+
+    if source_factory is None:
+        def source_factory() -> PCMSource:
+            return SyntheticSource(
+                sample_rate=config.audio.sample_rate,
+                channels=config.audio.channels,
+                period_ms=FAKE_PERIOD_MS,
+                open_delay_ms=FAKE_OPEN_DELAY_MS,
+            )
+
+    service = SpeechToTextService(config)
+    service.recorder = AudioRecorder(
+        sample_rate=config.audio.sample_rate,
+        channels=config.audio.channels,
+        capture_mode="memory",
+        max_duration=5,
+        pcm_source_factory=source_factory,
+        warm_capture=config.audio.warm_capture,
+        pre_roll_ms=config.audio.pre_roll_ms,
+        post_roll_ms=config.audio.post_roll_ms,
+    )
+
+    latencies: List[float] = []
+    try:
+        await service.recorder.open_stream()
+        if service.recorder.warm_capture:
+            await service.recorder.wait_for_first_frame(timeout=2.0)
+
+        for _ in range(presses):
+            await service._on_key_press(event_time=time.time())
+            utterance = service._recording
+            if utterance is None:
+                break
+            latency_ms = await utterance.first_frame_task
+            await utterance.press_task
+            await service._cancel_recording()
+            if latency_ms is not None:
+                latencies.append(latency_ms)
+            await asyncio.sleep(FAKE_PERIOD_MS / 1000.0)
+    finally:
+        await service._cancel_recording()
+        await service.recorder.close_stream()
+
+    return latencies
+
+
 async def run_daemon(config: Config):
     """Run the speech-to-text daemon."""
     service = SpeechToTextService(config)
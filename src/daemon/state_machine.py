@@ -2,7 +2,7 @@
 
 import logging
 from enum import Enum, auto
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -40,16 +40,22 @@ class StateMachine:
         State.ERROR: {State.IDLE},
     }
 
-    def __init__(self, on_state_change: Optional[Callable[[State, State], None]] = None):
+    def __init__(
+        self,
+        on_state_change: Optional[Callable[[State, State], None]] = None,
+        utterance_id: Optional[int] = None,
+    ):
         """
         Initialize state machine.
 
         Args:
             on_state_change: Optional callback(old_state, new_state) on transitions
+            utterance_id: Utterance this machine tracks (used as a log prefix)
         """
         self._state = State.IDLE
         self._on_state_change = on_state_change
         self._error_message: Optional[str] = None
+        self.utterance_id = utterance_id
 
     @property
     def state(self) -> State:
@@ -76,6 +82,11 @@ class StateMachine:
         """Get last error message."""
         return self._error_message
 
+    @property
+    def _log_prefix(self) -> str:
+        """Log prefix identifying the utterance, if any."""
+        return f"[#{self.utterance_id}] " if self.utterance_id is not None else ""
+
     def can_transition_to(self, new_state: State) -> bool:
         """Check if transition to new_state is valid."""
         valid_targets = self.VALID_TRANSITIONS.get(self._state, set())
@@ -94,7 +105,7 @@ class StateMachine:
         """
         if not self.can_transition_to(new_state):
             logger.warning(
-                f"Invalid state transition: {self._state.name} -> {new_state.name}"
+                f"{self._log_prefix}Invalid state transition: {self._state.name} -> {new_state.name}"
             )
             return False
 
@@ -103,11 +114,11 @@ class StateMachine:
 
         if new_state == State.ERROR:
             self._error_message = error_message
-            logger.error(f"Entered ERROR state: {error_message}")
+            logger.error(f"{self._log_prefix}Entered ERROR state: {error_message}")
         else:
             self._error_message = None
 
-        logger.info(f"State: {old_state.name} -> {new_state.name}")
+        logger.info(f"{self._log_prefix}State: {old_state.name} -> {new_state.name}")
 
         if self._on_state_change:
             try:
@@ -122,7 +133,7 @@ class StateMachine:
         old_state = self._state
         self._state = State.IDLE
         self._error_message = None
-        logger.info(f"State reset: {old_state.name} -> IDLE")
+        logger.info(f"{self._log_prefix}State reset: {old_state.name} -> IDLE")
 
     def start_recording(self) -> bool:
         """Transition to RECORDING state."""
@@ -155,7 +166,105 @@ class StateMachine:
         return False
 
     def __str__(self) -> str:
+        if self.utterance_id is not None:
+            return f"StateMachine(#{self.utterance_id} {self._state.name})"
         return f"StateMachine({self._state.name})"
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class UtteranceTracker:
+    """
+    Per-utterance state for the pipelined service.
+
+    Every utterance gets its own StateMachine, so a new recording can start
+    while earlier utterances are still being transcribed or typed. At most
+    one utterance is RECORDING at a time. Machines are dropped once they
+    return to IDLE.
+
+    Example:
+        >>> tracker = UtteranceTracker()
+        >>> first = tracker.begin()      # IDLE -> RECORDING
+        >>> first.stop_recording()       # RECORDING -> TRANSCRIBING
+        >>> second = tracker.begin()     # allowed while #1 is transcribing
+        >>> tracker.in_flight
+        2
+    """
+
+    def __init__(self, on_state_change: Optional[Callable[[State, State], None]] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            on_state_change: Optional callback(old_state, new_state) for every utterance
+        """
+        self._on_state_change = on_state_change
+        self._active: List[StateMachine] = []
+        self._next_id = 1
+
+    @property
+    def active(self) -> List[StateMachine]:
+        """State machines of utterances still in progress, oldest first."""
+        return list(self._active)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of utterances still in progress."""
+        return len(self._active)
+
+    @property
+    def is_idle(self) -> bool:
+        """Check if no utterance is in progress."""
+        return not self._active
+
+    @property
+    def recording(self) -> Optional[StateMachine]:
+        """State machine of the utterance being recorded, if any."""
+        for machine in self._active:
+            if machine.is_recording:
+                return machine
+        return None
+
+    def begin(self) -> Optional[StateMachine]:
+        """
+        Start tracking a new utterance in RECORDING state.
+
+        Returns:
+            The utterance's state machine, or None if another one is recording
+        """
+        if self.recording is not None:
+            logger.warning("Cannot start an utterance while another is recording")
+            return None
+
+        machine = StateMachine(utterance_id=self._next_id)
+        machine._on_state_change = self._make_callback(machine)
+        self._next_id += 1
+
+        if not machine.start_recording():
+            return None
+
+        self._active.append(machine)
+        return machine
+
+    def _make_callback(self, machine: StateMachine) -> Callable[[State, State], None]:
+        """Wrap the user callback to drop machines that returned to IDLE."""
+        def callback(old_state: State, new_state: State):
+            if new_state == State.IDLE and machine in self._active:
+                self._active.remove(machine)
+            if self._on_state_change:
+                self._on_state_change(old_state, new_state)
+        return callback
+
+    def reset(self):
+        """Forget all utterances (e.g. on shutdown)."""
+        for machine in self._active:
+            machine.reset()
+        self._active.clear()
+
+    def __str__(self) -> str:
+        states = ", ".join(f"#{m.utterance_id} {m.state.name}" for m in self._active)
+        return f"UtteranceTracker({states or 'IDLE'})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
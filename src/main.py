@@ -10,6 +10,9 @@ Usage:
     python -m src.main --daemon     # Background daemon (hold-to-talk)
     python -m src.main --record 5   # Record 5 seconds and transcribe
     python -m src.main --test       # Run component tests
+    python -m src.main --stats      # Show daemon latency statistics
+    python -m src.main --replay DIR # Replay WAV files through the daemon (benchmark)
+    python -m src.main --transcribe PATH...  # Transcribe recorded files (batch)
 
 Features:
     - Hold-to-talk recording (daemon mode)
@@ -24,6 +27,7 @@ import sys
 import os
 import tempfile
 import time
+from typing import Optional
 
 # Add parent directory to path for imports
 # This ensures we can import src.* modules regardless of how the script is run
@@ -47,6 +51,20 @@ except ImportError as e:
     raise
 
 
+def create_recorder(config: Config) -> AudioRecorder:
+    """Create an AudioRecorder from the audio configuration."""
+    return AudioRecorder(
+        sample_rate=config.audio.sample_rate,
+        channels=config.audio.channels,
+        audio_format=config.audio.format,
+        capture_mode=config.audio.capture_mode,
+        max_duration=config.audio.max_duration,
+        warm_capture=config.audio.warm_capture,
+        pre_roll_ms=config.audio.pre_roll_ms,
+        post_roll_ms=config.audio.post_roll_ms,
+    )
+
+
 def run_tests(config: Config) -> bool:
     """Run component tests."""
     print()
@@ -65,9 +83,11 @@ def run_tests(config: Config) -> bool:
     text_input = TextInput(
         display_server=display,
         key_delay_ms=config.text_input.key_delay_ms,
+        typing_burst_size=config.text_input.typing_burst_size,
         mode=config.text_input.mode,
         paste_key_combination=config.text_input.paste_key_combination,
         pre_paste_delay_ms=config.text_input.pre_paste_delay_ms,
+        restore_selection_after_ms=config.text_input.restore_selection_after_ms,
     )
     print(f"  Display server: {display}")
     print(f"  Text tool: {text_input.tool}")
@@ -79,17 +99,17 @@ def run_tests(config: Config) -> bool:
     # Test 2: Audio recording
     tests_total += 1
     print("Test 2: Audio Recording (2 seconds)")
-    recorder = AudioRecorder(
-        sample_rate=config.audio.sample_rate,
-        channels=config.audio.channels,
-    )
+    recorder = create_recorder(config)
     audio_file = recorder.record_sync(2)
     if audio_file and os.path.exists(audio_file):
+        if recorder.warm_capture:
+            print(f"  Capture worker restarts: {recorder.capture_restarts}")
         print("  Result: PASS")
         tests_passed += 1
         AudioRecorder.cleanup(audio_file)
     else:
         print("  Result: FAIL")
+    recorder.close_stream_sync()
     print()
 
     # Test 3: Whisper model
@@ -148,6 +168,32 @@ def run_tests(config: Config) -> bool:
         print("  Result: FAIL")
     print()
 
+    # Test 6: Press latency with a fake capture device
+    tests_total += 1
+    target_ms = config.audio.press_latency_target_ms
+    print("Test 6: Press Latency (fake audio source)")
+    try:
+        from src.daemon.service import measure_press_latency
+
+        latencies = asyncio.run(measure_press_latency(config))
+        if latencies:
+            worst = max(latencies)
+            print(f"  Press to first frame: min {min(latencies):.1f} ms, max {worst:.1f} ms")
+            if target_ms <= 0:
+                print("  Result: PASS (no target set)")
+                tests_passed += 1
+            elif worst <= target_ms:
+                print(f"  Result: PASS (target {target_ms} ms)")
+                tests_passed += 1
+            else:
+                print(f"  Result: FAIL - over target {target_ms} ms")
+        else:
+            print("  Result: FAIL - no audio frames")
+    except Exception as e:
+        print(f"  Error: {e}")
+        print("  Result: FAIL")
+    print()
+
     # Summary
     print("=" * 60)
     print(f"Tests Passed: {tests_passed}/{tests_total}")
@@ -160,8 +206,12 @@ def record_and_transcribe(
     config: Config,
     duration: int,
     type_output: bool = False,
+    recorder: Optional[AudioRecorder] = None,
 ) -> str:
-    """Record audio, transcribe, and optionally type."""
+    """Record audio, transcribe, and optionally type.
+
+    Pass a shared recorder to reuse its persistent capture worker across calls.
+    """
     print()
     print("=" * 60)
     print("STEP 1: Recording Audio")
@@ -170,13 +220,18 @@ def record_and_transcribe(
     print("Speak now!")
     print()
 
-    recorder = AudioRecorder(
-        sample_rate=config.audio.sample_rate,
-        channels=config.audio.channels,
-    )
+    owns_recorder = recorder is None
+    if owns_recorder:
+        recorder = create_recorder(config)
 
-    audio_file = recorder.record_sync(duration)
-    if not audio_file:
+    # Memory capture hands samples straight to the model; file mode records a WAV
+    if recorder.capture_mode == "memory":
+        audio_file = recorder.record_array_sync(duration)
+    else:
+        audio_file = recorder.record_sync(duration)
+    if owns_recorder:
+        recorder.close_stream_sync()
+    if audio_file is None:
         print("Recording failed")
         return ""
 
@@ -188,17 +243,10 @@ def record_and_transcribe(
     # Detect keyboard layout for language hint (like daemon mode does)
     detected_language = None
     if config.whisper.language == "":
-        from src.utils.keyboard_layout import KeyboardLayoutMapper
-        mapper = KeyboardLayoutMapper()
-        detected_layout = mapper.detect_current_layout()
+        from src.utils.layout_service import get_layout_service, language_for_layout
+        detected_layout = get_layout_service().get_layout()
         if detected_layout:
-            # Map GNOME layout codes to Whisper language codes
-            layout_to_language = {
-                'us': 'en',
-                'uk': 'uk',
-                'ua': 'uk',  # GNOME uses 'ua' for Ukrainian, Whisper uses 'uk'
-            }
-            detected_language = layout_to_language.get(detected_layout, detected_layout)
+            detected_language = language_for_layout(detected_layout)
             print(f"Detected keyboard layout '{detected_layout}' -> language: {detected_language}")
         else:
             print("Could not detect keyboard layout, using Whisper auto-detect")
@@ -212,7 +260,10 @@ def record_and_transcribe(
         language=detected_language or config.whisper.language or None,
     )
 
-    text = transcriber.transcribe(audio_file)
+    if isinstance(audio_file, str):
+        text = transcriber.transcribe(audio_file)
+    else:
+        text = transcriber.transcribe_array(audio_file, sample_rate=config.audio.sample_rate)
     AudioRecorder.cleanup(audio_file)
 
     if not text:
@@ -238,9 +289,11 @@ def record_and_transcribe(
         text_input = TextInput(
             display_server=config.display.actual_server,
             key_delay_ms=config.text_input.key_delay_ms,
+            typing_burst_size=config.text_input.typing_burst_size,
             mode=config.text_input.mode,
             paste_key_combination=config.text_input.paste_key_combination,
             pre_paste_delay_ms=config.text_input.pre_paste_delay_ms,
+            restore_selection_after_ms=config.text_input.restore_selection_after_ms,
         )
         text_input.type_text_sync(text)
 
@@ -271,6 +324,9 @@ def interactive_mode(config: Config):
     transcriber.load_model()
     print()
 
+    # Shared recorder keeps its capture worker open between recordings
+    recorder = create_recorder(config)
+
     while True:
         print()
         print("Options:")
@@ -286,19 +342,19 @@ def interactive_mode(config: Config):
         choice = input("Enter choice: ").strip().lower()
 
         if choice == "1":
-            record_and_transcribe(config, 5, type_output=False)
+            record_and_transcribe(config, 5, type_output=False, recorder=recorder)
 
         elif choice == "2":
             try:
                 duration = int(input("Enter duration in seconds: "))
-                record_and_transcribe(config, duration, type_output=False)
+                record_and_transcribe(config, duration, type_output=False, recorder=recorder)
             except ValueError:
                 print("Invalid duration")
 
         elif choice == "3":
             try:
                 duration = int(input("Enter duration in seconds [5]: ") or "5")
-                record_and_transcribe(config, duration, type_output=True)
+                record_and_transcribe(config, duration, type_output=True, recorder=recorder)
             except ValueError:
                 print("Invalid duration")
 
@@ -311,6 +367,8 @@ def interactive_mode(config: Config):
             print(f"Hold {config.hotkey.trigger_key} to record, release to transcribe.")
             print("Press Ctrl+C to exit.")
             print()
+            # The daemon opens its own capture worker
+            recorder.close_stream_sync()
             run_daemon_mode(config)
 
         elif choice == "c":
@@ -318,6 +376,7 @@ def interactive_mode(config: Config):
 
         elif choice == "q":
             print("Goodbye!")
+            recorder.close_stream_sync()
             break
 
         else:
@@ -334,6 +393,60 @@ def run_daemon_mode(config: Config):
         print("\nDaemon stopped.")
 
 
+def show_stats(config: Config) -> bool:
+    """Print the latency snapshot written by the daemon."""
+    from src.utils.metrics import format_snapshot, load_snapshot
+
+    try:
+        snapshot = load_snapshot(config.metrics.directory or None)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read metrics: {e}")
+        return False
+    if snapshot is None:
+        print("No metrics recorded yet. Run the daemon with [metrics] enabled = true.")
+        return False
+
+    print(format_snapshot(snapshot))
+    return True
+
+
+def run_replay(config: Config, directory: str, stub_transcriber: bool = False) -> bool:
+    """Replay a directory of WAV files through the daemon pipeline and print the report."""
+    from src.bench.replay import replay_directory
+
+    try:
+        report = replay_directory(config, directory, stub_transcriber=stub_transcriber)
+    except (FileNotFoundError, RuntimeError, ValueError) as e:
+        print(f"Replay failed: {e}")
+        return False
+
+    print(report.format())
+    return report.ok
+
+
+def run_batch(
+    config: Config,
+    inputs: list,
+    workers: Optional[int] = None,
+    fmt: Optional[str] = None,
+    output: Optional[str] = None,
+) -> bool:
+    """Transcribe files, directories or globs with the batch worker pool and print the report."""
+    from src.batch import transcribe_batch
+
+    try:
+        report = transcribe_batch(config, inputs, processes=workers, fmt=fmt, output=output)
+    except (FileNotFoundError, RuntimeError, ValueError) as e:
+        print(f"Batch transcription failed: {e}")
+        return False
+    except KeyboardInterrupt:
+        print("Interrupted - finished files are saved, run the same command again to resume")
+        return False
+
+    print(report.format())
+    return report.ok
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -346,6 +459,10 @@ Examples:
   python -m src.main --record 5   # Record 5 seconds
   python -m src.main --record 10 --type  # Record and type
   python -m src.main --test       # Run tests
+  python -m src.main --stats      # Latency percentiles from the daemon
+  python -m src.main --replay samples/ --stub-transcriber  # Offline benchmark
+  python -m src.main --transcribe memos/ --workers 4       # Batch transcription
+  python -m src.main --transcribe "memos/*.m4a" --format text
         """,
     )
 
@@ -374,6 +491,57 @@ Examples:
         help="Run component tests",
     )
 
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show per-stage latency statistics recorded by the daemon",
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="DIR",
+        help="Replay the WAV files in DIR through the daemon pipeline (fake "
+             "microphone, hotkey and keyboard) and report latency and typed output; "
+             "<name>.txt next to <name>.wav is the expected text",
+    )
+
+    parser.add_argument(
+        "--stub-transcriber",
+        action="store_true",
+        help="Use a stub transcriber that returns the expected text (use with --replay)",
+    )
+
+    parser.add_argument(
+        "--transcribe",
+        nargs="+",
+        metavar="PATH",
+        help="Transcribe audio files, directories or glob patterns; files that "
+             "already have a transcript are skipped (resumable)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Worker processes for --transcribe, each with its own model "
+             "(default: [batch] processes)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "text"],
+        help="Output of --transcribe: one JSONL file or <name>.<ext>.txt per file "
+             "(default: [batch] format)",
+    )
+
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        metavar="PATH",
+        help="JSONL file or text directory for --transcribe (default: [batch] output)",
+    )
+
     parser.add_argument(
         "--model", "-m",
         choices=["tiny", "base", "small", "medium", "large"],
@@ -413,6 +581,18 @@ Examples:
     log_level = "DEBUG" if args.verbose else ("WARNING" if args.quiet else config.logging.level)
     setup_logging(level=log_level)
 
+    # Latency statistics
+    if args.stats:
+        sys.exit(0 if show_stats(config) else 1)
+
+    # Offline replay benchmark
+    if args.replay:
+        sys.exit(0 if run_replay(config, args.replay, args.stub_transcriber) else 1)
+
+    # Batch transcription
+    if args.transcribe:
+        sys.exit(0 if run_batch(config, args.transcribe, args.workers, args.format, args.output) else 1)
+
     # Run tests
     if args.test:
         success = run_tests(config)
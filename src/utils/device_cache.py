@@ -0,0 +1,269 @@
+"""Cached input device capabilities for fast device discovery.
+
+Finding the hotkey devices used to open every /dev/input/event* node and
+query its key capabilities on each start, including virtual devices that can
+never match (such as our own uinput keyboard). DeviceCache remembers each
+device's key codes in $XDG_CACHE_HOME/speech-to-text/input-devices.json.
+
+Entries are keyed by the device's /dev/input/by-id name (or its sysfs
+identity when it has none) and carry a fingerprint of its sysfs attributes:
+name, phys, ids and capability bitmaps. Validating the cache reads those
+small sysfs files only; a device node is opened again only when its
+fingerprint is new or changed, and the file is rewritten only then.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INPUT_DIR = "/dev/input"
+SYSFS_INPUT_DIR = "/sys/class/input"
+
+CACHE_VERSION = 1
+
+# sysfs attributes (relative to /sys/class/input/eventN/device) in the fingerprint
+FINGERPRINT_ATTRS = (
+    "name",
+    "phys",
+    "uniq",
+    "id/bustype",
+    "id/vendor",
+    "id/product",
+    "id/version",
+    "capabilities/ev",
+    "capabilities/key",
+)
+
+
+def default_cache_path() -> Path:
+    """Location of the device cache ($XDG_CACHE_HOME/speech-to-text)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "speech-to-text" / "input-devices.json"
+
+
+@dataclass
+class InputDeviceInfo:
+    """An input device and the key codes it reports."""
+    path: str
+    name: str
+    phys: str
+    keys: FrozenSet[int]
+    stable_id: str
+
+
+class DeviceCache:
+    """
+    Input device key capabilities, validated against sysfs on each use.
+
+    Example:
+        >>> cache = get_device_cache()
+        >>> [d.path for d in cache.devices() if ecodes.KEY_RIGHTCTRL in d.keys]
+        ['/dev/input/event3']
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        input_dir: str = INPUT_DIR,
+        sysfs_dir: str = SYSFS_INPUT_DIR,
+    ):
+        """
+        Initialize device cache.
+
+        Args:
+            path: Cache file (default: $XDG_CACHE_HOME/speech-to-text/input-devices.json)
+            input_dir: Directory holding the event nodes
+            sysfs_dir: sysfs input class directory
+        """
+        self.path = Path(path).expanduser() if path else default_cache_path()
+        self.input_dir = input_dir
+        self.sysfs_dir = sysfs_dir
+        self._entries: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        """Read cache entries from disk (empty if missing or stale)."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable device cache {self.path}: {e}")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("devices", {})
+
+    def _save(self, entries: Dict[str, dict]):
+        """Write cache entries atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": CACHE_VERSION, "devices": entries}, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write device cache {self.path}: {e}")
+
+    def _by_id_names(self) -> Dict[str, str]:
+        """Map event node names to their /dev/input/by-id names."""
+        names: Dict[str, str] = {}
+        by_id = os.path.join(self.input_dir, "by-id")
+        try:
+            links = os.listdir(by_id)
+        except OSError:
+            return names
+        for link in sorted(links):
+            try:
+                target = os.path.basename(os.readlink(os.path.join(by_id, link)))
+            except OSError:
+                continue
+            names.setdefault(target, link)
+        return names
+
+    def _sysfs_attrs(self, node: str) -> Optional[Dict[str, str]]:
+        """Read the fingerprinted sysfs attributes of an event node (None if unavailable)."""
+        base = os.path.join(self.sysfs_dir, node, "device")
+        attrs = {}
+        for attr in FINGERPRINT_ATTRS:
+            try:
+                with open(os.path.join(base, attr)) as f:
+                    attrs[attr] = f.read().strip()
+            except FileNotFoundError:
+                attrs[attr] = ""
+            except OSError:
+                return None
+        if not attrs["name"] and not attrs["capabilities/ev"]:
+            return None  # No sysfs (e.g. containers)
+        return attrs
+
+    @staticmethod
+    def _fingerprint(attrs: Dict[str, str]) -> str:
+        """Short hash of a device's sysfs identity and capabilities."""
+        blob = "\n".join(f"{attr}={attrs[attr]}" for attr in FINGERPRINT_ATTRS)
+        return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _stable_id(node: str, attrs: Dict[str, str], by_id: Dict[str, str]) -> str:
+        """Cache key: the by-id name, or the sysfs identity for devices without one."""
+        if node in by_id:
+            return f"by-id:{by_id[node]}"
+        return (
+            f"sysfs:{attrs['id/bustype']}:{attrs['id/vendor']}:{attrs['id/product']}:"
+            f"{attrs['name']}:{attrs['phys']}"
+        )
+
+    @staticmethod
+    def _probe(path: str) -> Optional[dict]:
+        """Open a device node and read its name and key codes."""
+        from evdev import InputDevice, ecodes
+
+        try:
+            device = InputDevice(path)
+        except (PermissionError, OSError) as e:
+            logger.debug(f"Cannot access {path}: {e}")
+            return None
+        try:
+            return {
+                "name": device.name,
+                "phys": device.phys or "",
+                "keys": sorted(device.capabilities().get(ecodes.EV_KEY, [])),
+            }
+        except OSError as e:
+            logger.debug(f"Cannot query {path}: {e}")
+            return None
+        finally:
+            device.close()
+
+    def devices(self) -> List[InputDeviceInfo]:
+        """
+        List input devices with their key codes.
+
+        Unchanged devices come from the cache; new or changed ones are
+        probed and the cache file is updated.
+
+        Returns:
+            One entry per accessible /dev/input/event* node, in node order
+        """
+        from evdev import list_devices
+
+        started = time.perf_counter()
+        if self._entries is None:
+            self._entries = self._load()
+        entries = self._entries
+        by_id = self._by_id_names()
+
+        result: List[InputDeviceInfo] = []
+        current: Dict[str, dict] = {}
+        probed = cached = 0
+        for path in sorted(list_devices(self.input_dir), key=_node_order):
+            node = os.path.basename(path)
+            attrs = self._sysfs_attrs(node)
+            if attrs is None:
+                # No sysfs identity to validate against: always probe
+                info = self._probe(path)
+                probed += 1
+                if info is not None:
+                    result.append(InputDeviceInfo(path, info["name"], info["phys"], frozenset(info["keys"]), node))
+                continue
+
+            stable_id = self._stable_id(node, attrs, by_id)
+            if stable_id in current:
+                stable_id = f"{stable_id}@{node}"  # Identical twins (no by-id, same phys)
+            fingerprint = self._fingerprint(attrs)
+
+            entry = entries.get(stable_id)
+            if entry is None or entry.get("fingerprint") != fingerprint:
+                info = self._probe(path)
+                probed += 1
+                if info is None:
+                    continue
+                entry = dict(info, fingerprint=fingerprint)
+            else:
+                cached += 1
+            current[stable_id] = entry
+            result.append(InputDeviceInfo(path, entry["name"], entry["phys"], frozenset(entry["keys"]), stable_id))
+
+        if current != entries:
+            self._entries = current
+            self._save(current)
+
+        logger.debug(
+            f"Input devices: {len(result)} found, {cached} from cache, {probed} probed "
+            f"({(time.perf_counter() - started) * 1000:.1f} ms)"
+        )
+        return result
+
+    def invalidate(self):
+        """Forget all entries (the next devices() probes every node)."""
+        self._entries = {}
+
+
+def _node_order(path: str) -> tuple:
+    """Sort event nodes numerically (event2 before event10)."""
+    name = os.path.basename(path)
+    digits = name[len("event"):]
+    return (0, int(digits), name) if digits.isdigit() else (1, 0, name)
+
+
+# Global singleton instance
+_cache: Optional[DeviceCache] = None
+
+
+def get_device_cache() -> DeviceCache:
+    """Get or create the global DeviceCache instance.
+
+    Returns:
+        DeviceCache: Singleton instance.
+    """
+    global _cache
+    if _cache is None:
+        _cache = DeviceCache()
+    return _cache
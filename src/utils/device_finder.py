@@ -4,9 +4,28 @@ import logging
 from pathlib import Path
 from typing import Optional, List, Dict
 
+from .device_cache import get_device_cache
+
 logger = logging.getLogger(__name__)
 
 
+def is_keyboard(keys) -> bool:
+    """
+    Check if a set of EV_KEY capabilities looks like a keyboard.
+
+    Args:
+        keys: Key codes the device reports
+
+    Returns:
+        True if the device has letter keys (A-Z) and a Ctrl key
+    """
+    from evdev import ecodes
+
+    has_letters = ecodes.KEY_A in keys and ecodes.KEY_Z in keys
+    has_ctrl = ecodes.KEY_LEFTCTRL in keys or ecodes.KEY_RIGHTCTRL in keys
+    return has_letters and has_ctrl
+
+
 def find_keyboard_device(preferred_path: Optional[str] = None) -> Optional[str]:
     """
     Find a suitable keyboard device for hotkey detection.
@@ -18,7 +37,7 @@ def find_keyboard_device(preferred_path: Optional[str] = None) -> Optional[str]:
         Path to keyboard device or None if not found
     """
     try:
-        from evdev import InputDevice, ecodes, list_devices
+        from evdev import InputDevice
     except ImportError:
         logger.error("evdev not installed. Run: pip install evdev")
         return None
@@ -36,37 +55,18 @@ def find_keyboard_device(preferred_path: Optional[str] = None) -> Optional[str]:
         else:
             logger.warning(f"Configured device not found: {preferred_path}")
 
-    # Auto-detect keyboard
+    # Auto-detect keyboard (capabilities come from the device cache)
     logger.info("Auto-detecting keyboard device...")
 
     keyboards = []
-    for path in list_devices():
-        try:
-            dev = InputDevice(path)
-            caps = dev.capabilities()
-
-            # Check if device has key capabilities
-            if ecodes.EV_KEY not in caps:
-                dev.close()
-                continue
-
-            keys = caps[ecodes.EV_KEY]
-
-            # Check for typical keyboard keys (A-Z and control keys)
-            has_letters = ecodes.KEY_A in keys and ecodes.KEY_Z in keys
-            has_ctrl = ecodes.KEY_LEFTCTRL in keys or ecodes.KEY_RIGHTCTRL in keys
-
-            if has_letters and has_ctrl:
-                keyboards.append({
-                    "path": path,
-                    "name": dev.name,
-                    "phys": dev.phys or "",
-                })
-                logger.debug(f"Found keyboard: {path} - {dev.name}")
-
-            dev.close()
-        except Exception as e:
-            logger.debug(f"Could not check {path}: {e}")
+    for device in get_device_cache().devices():
+        if is_keyboard(device.keys):
+            keyboards.append({
+                "path": device.path,
+                "name": device.name,
+                "phys": device.phys,
+            })
+            logger.debug(f"Found keyboard: {device.path} - {device.name}")
 
     if not keyboards:
         logger.error("No keyboard device found")
@@ -93,33 +93,16 @@ def list_keyboard_devices() -> List[Dict[str, str]]:
         List of dictionaries with device info
     """
     try:
-        from evdev import InputDevice, ecodes, list_devices
+        import evdev  # noqa: F401
     except ImportError:
         logger.error("evdev not installed")
         return []
 
-    keyboards = []
-    for path in list_devices():
-        try:
-            dev = InputDevice(path)
-            caps = dev.capabilities()
-
-            if ecodes.EV_KEY in caps:
-                keys = caps[ecodes.EV_KEY]
-                has_letters = ecodes.KEY_A in keys and ecodes.KEY_Z in keys
-                has_ctrl = ecodes.KEY_LEFTCTRL in keys or ecodes.KEY_RIGHTCTRL in keys
-
-                if has_letters and has_ctrl:
-                    keyboards.append({
-                        "path": path,
-                        "name": dev.name,
-                        "phys": dev.phys or "N/A",
-                    })
-            dev.close()
-        except Exception:
-            pass
-
-    return keyboards
+    return [
+        {"path": device.path, "name": device.name, "phys": device.phys or "N/A"}
+        for device in get_device_cache().devices()
+        if is_keyboard(device.keys)
+    ]
 
 
 def get_key_code(key_name: str) -> Optional[int]:
@@ -9,6 +9,8 @@ to Linux kernel keycodes and modifiers. Supports:
 - Ukrainian Cyrillic characters (і, ї, є, ю, а, б, в, г, etc.)
 
 Layout detection uses GNOME gsettings when available, falls back to "us" layout.
+get_layout() answers from the process-wide LayoutService (see layout_service),
+which re-detects only when the layout changes.
 
 IMPORTANT: For non-English text typing to work correctly, the system keyboard layout
 must be set to the appropriate language (e.g., Ukrainian for Cyrillic text). The
@@ -221,6 +223,8 @@ class KeyboardLayoutMapper:
         """Initialize keyboard layout mapper with predefined mappings."""
         self._current_layout: Optional[str] = None
         self._layout_cache_valid = False
+        # Where detect_current_layout() found the layout: "gsettings", "ibus" or "fallback"
+        self.layout_source: Optional[str] = None
 
         # Define character mappings for different layouts
         # Format: {layout: {char: (keycode, [modifier_keycodes])}}
@@ -498,6 +502,7 @@ class KeyboardLayoutMapper:
 
                 if selected_layout:
                     logger.debug(f"Detected keyboard layout via gsettings: {selected_layout}")
+                    self.layout_source = "gsettings"
                     return selected_layout
 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, ValueError, IndexError) as e:
@@ -522,6 +527,7 @@ class KeyboardLayoutMapper:
                     if len(parts) >= 2:
                         layout = parts[1]
                         logger.debug(f"Detected keyboard layout via ibus: {layout} (engine: {engine})")
+                        self.layout_source = "ibus"
                         return layout
 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
@@ -531,23 +537,39 @@ class KeyboardLayoutMapper:
 
         # Fallback to US layout
         logger.debug("Using fallback layout: us")
+        self.layout_source = "fallback"
         return "us"
 
     def get_layout(self) -> str:
-        """Get current cached layout or detect it.
+        """Get current layout from the process-wide layout service.
 
         Returns:
             str: Current keyboard layout code.
         """
-        if not self._layout_cache_valid or self._current_layout is None:
-            self._current_layout = self.detect_current_layout()
-            self._layout_cache_valid = True
-
+        from .layout_service import get_layout_service
+        self._current_layout = get_layout_service().get_layout()
+        self._layout_cache_valid = True
         return self._current_layout
 
     def invalidate_layout_cache(self):
         """Force re-detection of keyboard layout on next access."""
+        from .layout_service import get_layout_service
         self._layout_cache_valid = False
+        get_layout_service().invalidate()
+
+    def layout_table(self, layout: str) -> Dict[str, Tuple[int, List[int]]]:
+        """Character mapping table used for a layout.
+
+        Args:
+            layout: Layout code (e.g., "us", "ua").
+
+        Returns:
+            Dict of char -> (keycode, [modifier_keycodes]). Layouts without
+            their own table use the US table.
+        """
+        if layout.startswith('uk') or layout.startswith('ua'):
+            return self._uk_layout
+        return self._us_layout
 
     def get_keycode_for_char(self, char: str, layout: Optional[str] = None) -> Tuple[int, List[int]]:
         """Get Linux keycode and modifiers for a character.
@@ -571,11 +593,7 @@ class KeyboardLayoutMapper:
         if layout is None:
             layout = self.get_layout()
 
-        # Select appropriate mapping table
-        if layout.startswith('uk') or layout.startswith('ua'):
-            mapping = self._uk_layout
-        else:
-            mapping = self._us_layout
+        mapping = self.layout_table(layout)
 
         # Look up character in mapping
         if char in mapping:
@@ -590,6 +608,24 @@ class KeyboardLayoutMapper:
         logger.warning(f"Character '{char}' (U+{ord(char):04X}) not mappable in layout '{layout}', using space")
         return (ecodes.KEY_SPACE, [])
 
+    def can_type(self, text: str, layout: Optional[str] = None) -> bool:
+        """Check if every character of text has a keycode in the layout.
+
+        Unlike get_keycode_for_char(), the US fallback is not accepted: a US
+        keycode typed under another layout produces a different character.
+
+        Args:
+            text: Text to check.
+            layout: Layout code. If None, uses detected layout.
+
+        Returns:
+            True if the text can be typed correctly with keycodes.
+        """
+        if layout is None:
+            layout = self.get_layout()
+        mapping = self.layout_table(layout)
+        return all(char in mapping for char in text)
+
     def get_available_layouts(self) -> List[str]:
         """Get list of available keyboard layouts from GNOME settings.
 
@@ -695,7 +731,7 @@ class KeyboardLayoutMapper:
         if success:
             logger.info(f"Switched keyboard layout to '{layout}'")
             self._current_layout = layout
-            self._layout_cache_valid = True
+            self.invalidate_layout_cache()
             return True
         else:
             logger.error(f"Failed to switch layout to '{layout}'")
@@ -0,0 +1,222 @@
+"""Process-wide keyboard layout cache driven by a change watcher.
+
+Detecting the layout costs three `gsettings` calls (plus `ibus engine` as a
+fallback), far too slow for the hotkey press path. LayoutService detects it
+once, then keeps it current by watching `gsettings monitor
+org.gnome.desktop.input-sources` in a background thread; get_layout() is a
+plain attribute read. The watcher only covers layouts read from those GNOME
+keys: when the layout came from the ibus fallback (or no watcher can run:
+not GNOME, gsettings missing, the monitor exits), cached values expire after
+a TTL and are re-detected on the next get_layout().
+"""
+
+import logging
+import select
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Layout cache lifetime when no watcher is running
+DEFAULT_TTL_SEC = 2.0
+
+# Monitor output arrives as one line per changed key; wait this long for
+# the rest of a burst (sources, current, mru-sources) before re-detecting
+DEBOUNCE_SEC = 0.05
+
+# Schema whose changes mean the input source changed
+INPUT_SOURCES_SCHEMA = "org.gnome.desktop.input-sources"
+
+# Detection source the watcher covers (see KeyboardLayoutMapper.layout_source)
+WATCHED_SOURCE = "gsettings"
+
+# Map GNOME layout codes to Whisper language codes
+LAYOUT_TO_LANGUAGE: Dict[str, str] = {
+    'us': 'en',
+    'uk': 'uk',
+    'ua': 'uk',  # GNOME uses 'ua' for Ukrainian, Whisper uses 'uk'
+}
+
+
+def language_for_layout(layout: str) -> str:
+    """Whisper language code for a keyboard layout code."""
+    return LAYOUT_TO_LANGUAGE.get(layout, layout)
+
+
+class LayoutService:
+    """
+    Keyboard layout answered from memory, refreshed on change.
+
+    Example:
+        >>> service = get_layout_service()
+        >>> service.start()          # detect once, start the watcher
+        >>> service.get_layout()     # no subprocesses
+        'ua'
+        >>> service.stop()
+    """
+
+    def __init__(
+        self,
+        detector: Optional[Callable[[], str]] = None,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        source: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        """
+        Initialize layout service.
+
+        Args:
+            detector: Callable returning the current layout code
+                (default: KeyboardLayoutMapper.detect_current_layout)
+            ttl_sec: Cache lifetime while no watcher is running
+            source: Callable returning where the last detection read the
+                layout from; only "gsettings" results are trusted to the
+                watcher (default: the mapper's layout_source with the
+                default detector, else always TTL)
+        """
+        self._detector = detector
+        self._source = source
+        self.ttl_sec = ttl_sec
+        self._layout: Optional[str] = None
+        self._detected_at = 0.0
+        self._watched = False  # The cached layout came from the watched GNOME keys
+        self._lock = threading.Lock()
+        self._monitor: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def watching(self) -> bool:
+        """Check if the change watcher is running."""
+        return self._monitor is not None and self._monitor.poll() is None
+
+    @property
+    def cache_watched(self) -> bool:
+        """Check if the cached layout is kept current by the watcher (no TTL)."""
+        return self._watched and self.watching
+
+    def _detect(self) -> str:
+        """Run the (slow) layout detection and cache the result."""
+        if self._detector is None:
+            from .keyboard_layout import get_keyboard_mapper
+            mapper = get_keyboard_mapper()
+            self._detector = mapper.detect_current_layout
+            if self._source is None:
+                self._source = lambda: mapper.layout_source
+
+        started = time.perf_counter()
+        layout = self._detector() or "us"
+        watched = self._source is not None and self._source() == WATCHED_SOURCE
+        with self._lock:
+            changed = layout != self._layout
+            self._layout = layout
+            self._watched = watched
+            self._detected_at = time.monotonic()
+        if changed:
+            logger.info(
+                f"Keyboard layout: {layout} "
+                f"(detected in {(time.perf_counter() - started) * 1000:.0f} ms)"
+            )
+        return layout
+
+    def get_layout(self) -> str:
+        """
+        Get the current layout.
+
+        Returns:
+            Layout code (e.g., "us", "ua"). Answered from memory while the
+            watcher covers it; re-detected when the TTL expired otherwise.
+        """
+        layout = self._layout
+        if layout is not None and (self.cache_watched or time.monotonic() - self._detected_at < self.ttl_sec):
+            return layout
+        return self._detect()
+
+    def get_language(self) -> str:
+        """Whisper language code for the current layout."""
+        return language_for_layout(self.get_layout())
+
+    def invalidate(self):
+        """Force re-detection on the next get_layout() (e.g., after switching layouts)."""
+        with self._lock:
+            self._layout = None
+
+    def start(self):
+        """Detect the layout and start watching for changes (idempotent)."""
+        if self._layout is None:
+            self._detect()
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        if shutil.which("gsettings") is None:
+            logger.debug(f"gsettings not found; re-detecting layout every {self.ttl_sec:.0f} s")
+            return
+
+        try:
+            self._monitor = subprocess.Popen(
+                ["gsettings", "monitor", INPUT_SOURCES_SCHEMA],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,  # Unbuffered, so select() sees every pending line
+            )
+        except OSError as e:
+            logger.debug(f"Cannot start layout watcher: {e}")
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(target=self._watch, name="layout-watcher", daemon=True)
+        self._thread.start()
+        logger.debug(f"Watching {INPUT_SOURCES_SCHEMA} for layout changes")
+
+    def _watch(self):
+        """Re-detect the layout whenever the monitor reports a change."""
+        monitor = self._monitor
+        stdout = monitor.stdout
+        try:
+            while not self._stopping:
+                line = stdout.readline()
+                if not line:
+                    break  # Monitor exited
+                # Collapse the burst of keys GNOME writes on one switch
+                while select.select([stdout], [], [], DEBOUNCE_SEC)[0]:
+                    if not stdout.readline():
+                        break
+                logger.debug(f"Input sources changed: {line.decode(errors='replace').strip()}")
+                self._detect()
+        except (OSError, ValueError) as e:
+            logger.debug(f"Layout watcher error: {e}")
+
+        if not self._stopping:
+            logger.info(f"Layout watcher stopped; re-detecting layout every {self.ttl_sec:.0f} s")
+
+    def stop(self):
+        """Stop the watcher."""
+        self._stopping = True
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None and monitor.poll() is None:
+            monitor.terminate()
+            try:
+                monitor.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                monitor.kill()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+# Global singleton instance
+_service: Optional[LayoutService] = None
+
+
+def get_layout_service() -> LayoutService:
+    """Get or create the global LayoutService instance.
+
+    Returns:
+        LayoutService: Singleton instance.
+    """
+    global _service
+    if _service is None:
+        _service = LayoutService()
+    return _service
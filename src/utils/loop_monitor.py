@@ -0,0 +1,219 @@
+"""Event loop lag sampling and stall attribution.
+
+The daemon reads hotkey events, drives the pipeline and times keystrokes on
+one asyncio loop, so any blocking call on it (a subprocess.run, a
+time.sleep, a slow layout query) delays every other handler. LoopLagMonitor
+schedules a wake-up every interval and records how late it actually runs;
+the lateness is the time the loop spent busy elsewhere.
+
+In debug mode a watchdog thread also checks the loop's heartbeat. When the
+loop has not woken up for longer than the stall threshold, the watchdog
+samples the loop thread's stack, so the stall is reported together with the
+call that was blocking it.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default sampling interval and stall threshold (ms)
+DEFAULT_INTERVAL_MS = 100
+DEFAULT_STALL_THRESHOLD_MS = 50
+
+# Don't log more than one stall warning per this many seconds (counting continues)
+STALL_LOG_INTERVAL_SEC = 5.0
+
+# Frames from these files are event loop machinery, not the stalling code
+_MACHINERY = (
+    os.path.dirname(asyncio.__file__),
+    os.path.dirname(threading.__file__) + os.sep + "selectors.py",
+    __file__,
+)
+
+# Project root, used to shorten paths in callsite names
+_ROOT = Path(__file__).resolve().parents[2]
+
+_STDLIB = os.path.dirname(os.__file__)
+
+
+def _is_stdlib(filename: str) -> bool:
+    """Check if a frame belongs to the standard library."""
+    return filename.startswith(_STDLIB) and "-packages" not in filename
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the project root (unchanged for outside files)."""
+    try:
+        return str(Path(filename).resolve().relative_to(_ROOT))
+    except ValueError:
+        return filename
+
+
+def describe_stack(frame) -> str:
+    """
+    Name the callsite a stack is blocked in.
+
+    Args:
+        frame: Innermost frame of the blocked thread
+
+    Returns:
+        "path:line in func" of the innermost project frame (or, outside
+        the project, the innermost non-stdlib frame), followed by the
+        outermost such frame it was called from and the library call it is
+        blocked in
+    """
+    stack = [
+        entry for entry in traceback.extract_stack(frame)
+        if not entry.filename.startswith(_MACHINERY)
+    ]
+    if not stack:
+        return "event loop internals"
+
+    own = [entry for entry in stack if entry.filename.startswith(str(_ROOT))]
+    if not own:
+        own = [entry for entry in stack if not _is_stdlib(entry.filename)]
+    inner = own[-1] if own else stack[-1]
+    site = f"{_short_path(inner.filename)}:{inner.lineno} in {inner.name}"
+    if own and own[0] is not inner:
+        site += f" (from {own[0].name})"
+    if inner is not stack[-1]:
+        # Blocked inside a library call; name it too (e.g. subprocess.run -> wait)
+        site += f" -> {stack[-1].name}"
+    return site
+
+
+class LoopLagMonitor:
+    """
+    Sample event loop lag into metrics; optionally name the stalling callsite.
+
+    Example:
+        >>> monitor = LoopLagMonitor(metrics, stall_threshold_ms=50, debug=True)
+        >>> monitor.start()      # from inside the running loop
+        >>> ...
+        >>> await monitor.stop()
+    """
+
+    def __init__(
+        self,
+        metrics=None,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        stall_threshold_ms: float = DEFAULT_STALL_THRESHOLD_MS,
+        debug: bool = False,
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            metrics: MetricsRegistry receiving loop_lag_ms samples and stall
+                counts (None: only log)
+            interval_ms: Time between wake-ups
+            stall_threshold_ms: Lag reported as a stall
+            debug: Sample the loop thread's stack during stalls
+        """
+        self.metrics = metrics
+        self.interval = interval_ms / 1000.0
+        self.stall_threshold_ms = stall_threshold_ms
+        self.debug = debug
+
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self.stall_sites: Dict[str, int] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._beat = 0.0  # monotonic() of the last wake-up
+        self._suspect: Optional[str] = None  # Callsite seen by the watchdog during a stall
+        self._last_log = 0.0
+
+        if metrics is not None:
+            metrics.describe("loop_lag_ms", "Event loop wake-up lateness (blocking work on the loop)")
+
+    def start(self):
+        """Start sampling (call from the running loop)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._sample())
+
+        if self.debug:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+        logger.debug(
+            f"Loop lag monitor: every {self.interval * 1000:.0f} ms, "
+            f"stalls over {self.stall_threshold_ms:.0f} ms"
+            + (" (callsite debug)" if self.debug else "")
+        )
+
+    async def _sample(self):
+        """Sleep for the interval and record how late the wake-up was."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            self._beat = time.monotonic()
+            self._record(lag_ms)
+
+    def _record(self, lag_ms: float):
+        """Fold one sample into the statistics."""
+        suspect, self._suspect = self._suspect, None
+        if lag_ms > self.max_lag_ms:
+            self.max_lag_ms = lag_ms
+        if self.metrics is not None:
+            self.metrics.observe("loop_lag_ms", lag_ms)
+            self.metrics.set_gauge("loop_lag_max_ms", round(self.max_lag_ms, 1))
+
+        if lag_ms < self.stall_threshold_ms:
+            return
+
+        self.stalls += 1
+        if self.metrics is not None:
+            self.metrics.inc("loop_stalls_total")
+        if suspect is not None:
+            self.stall_sites[suspect] = self.stall_sites.get(suspect, 0) + 1
+            if self.metrics is not None:
+                self.metrics.record_stall(suspect, lag_ms)
+
+        now = time.monotonic()
+        if now - self._last_log >= STALL_LOG_INTERVAL_SEC:
+            self._last_log = now
+            where = f" in {suspect}" if suspect else ""
+            logger.warning(f"Event loop stalled {lag_ms:.0f} ms{where} ({self.stalls} stalls so far)")
+
+    def _watch(self):
+        """Sample the loop thread's stack whenever its heartbeat is overdue."""
+        overdue = self.interval + self.stall_threshold_ms / 1000.0
+        poll = max(0.005, self.stall_threshold_ms / 2000.0)
+        reported_beat = None
+        while not self._stopping.wait(poll):
+            beat = self._beat
+            if beat == reported_beat or time.monotonic() - beat < overdue:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._suspect = describe_stack(frame)
+            reported_beat = beat
+
+    async def stop(self):
+        """Stop sampling."""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
@@ -0,0 +1,422 @@
+"""Latency metrics for the dictation pipeline.
+
+Every utterance carries an UtteranceTiming record that collects the time
+spent in each stage between key press and typed text. Finished records are
+folded into in-memory histograms (p50/p95/p99 per stage) held by a
+MetricsRegistry, which can export them as a Prometheus textfile and as a JSON
+snapshot. `python -m src.main --stats` prints the latest snapshot.
+
+The daemon exports with schedule_export(): the snapshot is rendered on the
+event loop (the registry is not thread-safe) and the files are written in a
+worker thread, at most one write at a time, so bursts of finished utterances
+coalesce into one write instead of blocking the loop once per utterance.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Metric name prefix for Prometheus export
+METRIC_PREFIX = "speech_to_text"
+
+# Histogram bucket growth factor (four buckets per doubling, ~9% resolution)
+BUCKET_FACTOR = 2 ** 0.25
+# Smallest bucket upper bound (ms); smaller values land in the first bucket
+BUCKET_MIN_MS = 0.5
+
+# Number of recent utterance records kept for the snapshot
+RECENT_RECORDS = 20
+
+# Event loop stall callsites listed by --stats
+MAX_STALL_SITES_SHOWN = 10
+
+# Per-utterance stages, in pipeline order, with a description for exports
+STAGES = {
+    "press_to_capture_ms": "Key press event to capture started",
+    "press_to_first_frame_ms": "Key press event to first audio frame captured",
+    "release_to_capture_stop_ms": "Key release event to captured audio available",
+    "segment_endpoint_ms": "End of speech to hands-free utterance queued (pause detection)",
+    "stop_sound_ms": "Playing the stop sound",
+    "vad_ms": "Finding speech in the recording (silence trimming)",
+    "queue_wait_ms": "Waiting for the transcription stage",
+    "transcribe_ms": "Model transcription (total)",
+    "model_prepare_ms": "VAD, feature extraction and language detection",
+    "model_decode_ms": "Encoder and decoder passes",
+    "first_segment_ms": "Model start to first segment decoded",
+    "postprocess_ms": "Text cleanup and voice command parsing",
+    "typing_queue_ms": "Waiting for the typing stage",
+    "typing_ms": "Typing or pasting the text",
+    "typing_pacing_error_ms": "Worst keystroke burst lateness vs. its deadline (uinput typing)",
+    "release_to_first_typed_ms": "Key release event to first text typed",
+    "speech_end_to_first_typed_ms": "End of speech to first text typed (hands-free)",
+    "release_to_typed_ms": "Key release event to text typed (end to end)",
+    "speech_end_to_typed_ms": "End of speech to text typed (hands-free, end to end)",
+}
+
+
+def default_metrics_dir() -> Path:
+    """Directory for metrics exports ($XDG_STATE_HOME/speech-to-text)."""
+    state_home = os.environ.get("XDG_STATE_HOME") or str(Path.home() / ".local" / "state")
+    return Path(state_home) / "speech-to-text"
+
+
+@dataclass
+class UtteranceTiming:
+    """Stage timings of one utterance (milliseconds)."""
+    utterance_id: int = 0
+    started_at: float = field(default_factory=time.time)
+    stages: Dict[str, float] = field(default_factory=dict)
+    audio_sec: Optional[float] = None
+    speech_sec: Optional[float] = None  # Audio left after VAD
+    outcome: str = "pending"  # typed, no_speech, discarded, error
+
+    def add(self, stage: str, ms: float):
+        """Record the duration of a stage."""
+        self.stages[stage] = ms
+
+    def since(self, stage: str, start: float, now: Optional[float] = None):
+        """Record a stage that started at a time.perf_counter() value."""
+        now = time.perf_counter() if now is None else now
+        self.stages[stage] = (now - start) * 1000
+
+    def since_event(self, stage: str, event_time: float):
+        """Record a stage that started at a wall-clock (kernel event) timestamp."""
+        self.stages[stage] = max(0.0, (time.time() - event_time) * 1000)
+
+    def summary(self) -> str:
+        """One-line summary for logging."""
+        parts = [f"{name.removesuffix('_ms')}={ms:.0f}" for name, ms in self.stages.items()]
+        return f"#{self.utterance_id} {self.outcome}: " + " ".join(parts) + " (ms)"
+
+
+class Histogram:
+    """Log-bucketed histogram with percentile estimates.
+
+    Memory use is fixed regardless of how many values are observed.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @staticmethod
+    def _bucket(value: float) -> int:
+        """Index of the bucket whose upper bound is the first >= value."""
+        if value <= BUCKET_MIN_MS:
+            return 0
+        return math.ceil(math.log(value / BUCKET_MIN_MS, BUCKET_FACTOR))
+
+    @staticmethod
+    def _upper_bound(index: int) -> float:
+        """Upper bound of a bucket."""
+        return BUCKET_MIN_MS * BUCKET_FACTOR ** index
+
+    def observe(self, value: float):
+        """Add a value."""
+        index = self._bucket(value)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Estimated value (interpolated within its bucket), or None if empty
+        """
+        if self.count == 0:
+            return None
+
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            in_bucket = self._buckets[index]
+            if seen + in_bucket >= rank:
+                lower = self._upper_bound(index - 1) if index > 0 else 0.0
+                upper = self._upper_bound(index)
+                fraction = (rank - seen) / in_bucket
+                estimate = lower + (upper - lower) * fraction
+                return min(max(estimate, self.min), self.max)
+            seen += in_bucket
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """Summary statistics for export."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-memory latency histograms, counters and gauges.
+
+    Example:
+        >>> metrics = MetricsRegistry()
+        >>> timing = UtteranceTiming(utterance_id=1)
+        >>> timing.add("transcribe_ms", 840.0)
+        >>> metrics.record_utterance(timing)
+        >>> metrics.export()  # metrics.json + metrics.prom
+        >>> metrics.schedule_export()  # same, off the event loop
+    """
+
+    def __init__(self, export_dir: Optional[Path] = None, textfile: Optional[Path] = None):
+        """
+        Initialize registry.
+
+        Args:
+            export_dir: Directory for metrics.json and metrics.prom
+                (default: $XDG_STATE_HOME/speech-to-text)
+            textfile: Extra Prometheus textfile path, e.g. inside a
+                node_exporter textfile collector directory
+        """
+        self.export_dir = Path(export_dir).expanduser() if export_dir else default_metrics_dir()
+        self.textfile = Path(textfile).expanduser() if textfile else None
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.descriptions: Dict[str, str] = dict(STAGES)
+        self.recent: Deque[UtteranceTiming] = deque(maxlen=RECENT_RECORDS)
+        self.stalls: Dict[str, Dict[str, float]] = {}  # Event loop stalls by callsite
+        self.started_at = time.time()
+        self._export_task: Optional[asyncio.Task] = None
+        self._export_pending = False  # Changes since the running export rendered its snapshot
+
+    def describe(self, name: str, description: str):
+        """Set the help text of a metric."""
+        self.descriptions[name] = description
+
+    def observe(self, name: str, value: float):
+        """Add a value to a histogram."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1):
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge."""
+        self.gauges[name] = value
+
+    def record_stall(self, site: str, ms: float):
+        """Count an event loop stall attributed to a callsite."""
+        stall = self.stalls.setdefault(site, {"count": 0, "max_ms": 0.0})
+        stall["count"] += 1
+        stall["max_ms"] = max(stall["max_ms"], round(ms, 1))
+
+    def record_utterance(self, timing: UtteranceTiming):
+        """Fold a finished utterance into the histograms."""
+        for stage, ms in timing.stages.items():
+            self.observe(stage, ms)
+        if timing.audio_sec is not None:
+            self.inc("audio_seconds_total", timing.audio_sec)
+        self.inc(f"utterances_{timing.outcome}_total")
+        self.recent.append(timing)
+        logger.info(f"Latency {timing.summary()}")
+
+    def snapshot(self) -> dict:
+        """All metrics as a JSON-serializable dict."""
+        return {
+            "generated_at": time.time(),
+            "started_at": self.started_at,
+            "histograms": {name: h.snapshot() for name, h in self.histograms.items()},
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "descriptions": dict(self.descriptions),
+            "stalls": {site: dict(stall) for site, stall in self.stalls.items()},
+            "recent": [asdict(t) for t in self.recent],
+        }
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {self.descriptions.get(name, name)}")
+            lines.append(f"# TYPE {metric} summary")
+            for q in (0.5, 0.95, 0.99):
+                value = histogram.percentile(q * 100)
+                if value is not None:
+                    lines.append(f'{metric}{{quantile="{q}"}} {value:.3f}')
+            lines.append(f"{metric}_sum {histogram.sum:.3f}")
+            lines.append(f"{metric}_count {histogram.count}")
+
+        for name, value in sorted(self.counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:g}")
+
+        for name, value in sorted(self.gauges.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            if name in self.descriptions:
+                lines.append(f"# HELP {metric} {self.descriptions[name]}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def _render(self) -> Dict[Path, str]:
+        """Contents of every export file."""
+        prometheus = self.to_prometheus()
+        files = {
+            self.export_dir / "metrics.json": json.dumps(self.snapshot(), indent=2),
+            self.export_dir / "metrics.prom": prometheus,
+        }
+        if self.textfile:
+            files[self.textfile] = prometheus
+        return files
+
+    @staticmethod
+    def _write(files: Dict[Path, str]):
+        """Write rendered export files (atomically)."""
+        try:
+            for path, content in files.items():
+                _write_atomic(path, content)
+        except OSError as e:
+            logger.warning(f"Failed to export metrics: {e}")
+
+    def export(self):
+        """Write metrics.json, metrics.prom and the optional textfile (atomically)."""
+        self._write(self._render())
+
+    def schedule_export(self):
+        """Export in the background; calls during a running export coalesce into one more write."""
+        if self._export_task is not None and not self._export_task.done():
+            self._export_pending = True
+            return
+        self._export_task = asyncio.get_running_loop().create_task(self._export_loop())
+
+    async def _export_loop(self):
+        """Write exports until no changes are left."""
+        while True:
+            self._export_pending = False
+            await asyncio.to_thread(self._write, self._render())
+            if not self._export_pending:
+                return
+
+    async def flush(self):
+        """Wait for a background export, then write the final state."""
+        if self._export_task is not None:
+            await asyncio.gather(self._export_task, return_exceptions=True)
+            self._export_task = None
+        await asyncio.to_thread(self._write, self._render())
+
+
+def _write_atomic(path: Path, content: str):
+    """Write a file via rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_snapshot(export_dir: Optional[Path] = None) -> Optional[dict]:
+    """
+    Load the latest JSON snapshot written by the daemon.
+
+    Returns:
+        The snapshot, or None if none was written yet
+
+    Raises:
+        ValueError: If the file is not a readable snapshot (e.g. truncated)
+    """
+    path = (Path(export_dir).expanduser() if export_dir else default_metrics_dir()) / "metrics.json"
+    try:
+        snapshot = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:  # Invalid JSON or text encoding
+        raise ValueError(f"{path} is not a valid metrics snapshot: {e}") from e
+    if not isinstance(snapshot, dict):
+        raise ValueError(f"{path} is not a valid metrics snapshot: expected a JSON object")
+    return snapshot
+
+
+def format_snapshot(snapshot: dict) -> str:
+    """Render a snapshot as a human-readable latency table."""
+    lines = []
+    generated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.get("generated_at", 0)))
+    lines.append(f"Metrics snapshot from {generated}")
+    lines.append("")
+
+    histograms = snapshot.get("histograms", {})
+    order = [name for name in STAGES if name in histograms]
+    order += sorted(name for name in histograms if name not in STAGES)
+
+    lines.append(f"{'Stage':<28} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    lines.append("-" * 74)
+    for name in order:
+        stats = histograms[name]
+        if not stats.get("count"):
+            continue
+        lines.append(
+            f"{name.removesuffix('_ms'):<28} {stats['count']:>6} "
+            f"{stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>9.1f}"
+        )
+    lines.append("(milliseconds)")
+
+    counters = snapshot.get("counters", {})
+    gauges = snapshot.get("gauges", {})
+    if counters or gauges:
+        lines.append("")
+        for name, value in sorted({**counters, **gauges}.items()):
+            lines.append(f"{name:<40} {value:g}")
+
+    trimmed_input = counters.get("vad_input_seconds_total", 0)
+    if trimmed_input:
+        trimmed = counters.get("vad_trimmed_seconds_total", 0)
+        lines.append("")
+        lines.append(
+            f"Silence trimming saved {trimmed:.1f} s of {trimmed_input:.1f} s audio "
+            f"({trimmed / trimmed_input * 100:.0f}%) and "
+            f"{counters.get('vad_skipped_model_calls_total', 0):g} model calls"
+        )
+
+    stalls = snapshot.get("stalls", {})
+    if stalls:
+        lines.append("")
+        lines.append("Event loop stalls by callsite (count, max ms):")
+        ranked = sorted(stalls.items(), key=lambda item: (-item[1]["count"], -item[1]["max_ms"]))
+        for site, stall in ranked[:MAX_STALL_SITES_SHOWN]:
+            lines.append(f"  {stall['count']:>5g} {stall['max_ms']:>9.1f}  {site}")
+
+    return "\n".join(lines)